@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used);
+"""
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class AnalysisCache:
+    """Persistent provider-response cache keyed on what the model actually saw."""
+
+    def __init__(self, path, max_entries: int = 20000, max_age_seconds: float = 30 * 24 * 3600,
+                 enabled: bool = True, table: str = "analyses"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA.replace("analyses", table))
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(_normalize(str(part)).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, *keys):
+        # Several keys may describe the same request (one per provider in the
+        # fallback chain); the first live entry wins and counts as one lookup.
+        if not self.enabled or not keys:
+            return None
+
+        now = time.time()
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in keys)
+        found = {
+            key: (value, created_at)
+            for key, value, created_at in conn.execute(
+                f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({placeholders})", keys
+            )
+        }
+
+        hit_key = None
+        for key in keys:
+            if key not in found:
+                continue
+            if now - found[key][1] > self.max_age_seconds:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                continue
+            hit_key = key
+            break
+
+        with self._lock:
+            if hit_key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        conn.execute(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", (now, hit_key))
+        return json.loads(found[hit_key][0])
+
+    def put(self, key: str, value):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now),
+        )
+        with self._lock:
+            self.writes += 1
+            should_evict = self.writes % max(1, min(100, self.max_entries // 10)) == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        conn = self._connect()
+        removed = conn.execute(
+            f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+        ).rowcount
+        overflow = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+def analysis_cache_from_env(default_path) -> AnalysisCache:
+    return AnalysisCache(
+        os.getenv("ANALYSIS_CACHE_PATH") or default_path,
+        max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES") or 20000),
+        max_age_seconds=float(os.getenv("ANALYSIS_CACHE_MAX_AGE_DAYS") or 30) * 24 * 3600,
+        enabled=(os.getenv("ANALYSIS_CACHE_ENABLED") or "1").strip().lower() not in ("0", "false", "no"),
+    )
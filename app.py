@@ -1,18 +1,22 @@
+import json
 import os
+import time
 from pathlib import Path
-from flask import Flask, render_template_string, request, jsonify, send_file
-from pypdf import PdfReader
+from flask import Flask, Response, render_template_string, request, jsonify, send_file, stream_with_context
 from openai import OpenAI, AuthenticationError, BadRequestError, APIStatusError
 from dotenv import load_dotenv
 from datetime import datetime
 from io import BytesIO
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
+import metrics
+from analysis_cache import analysis_cache_from_env
+from pdf_report import iter_pdf
+from prompt_budget import JD_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, compact_text
+from provider_dispatch import EmptyResponseError, ProviderUnavailableError, dispatcher_from_env
+from report_export import EXCEL_AVAILABLE, iter_xlsx
+from result_store import result_store_from_env
+from static_assets import AssetCache
+from text_extraction import text_extractor_from_env
 
 try:
     from docx import Document
@@ -25,14 +29,8 @@ BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(dotenv_path=BASE_DIR / ".env", override=True)
 
 app = Flask(__name__)
-
-# Store last analysis result for export
-last_analysis = {
-    "resume_text": "",
-    "job_description": "",
-    "analysis": "",
-    "timestamp": None,
-}
+pages = AssetCache(BASE_DIR)
+pages.preload("index.html")
 
 def _clean_env_key(value: str) -> str:
     return (value or "").strip().strip('"').strip("'")
@@ -57,39 +55,188 @@ def _is_real_api_key(value: str) -> bool:
 pplx_api_key = _clean_env_key(os.getenv("PPLX_API_KEY"))
 openai_api_key = _clean_env_key(os.getenv("OPENAI_API_KEY"))
 
+pplx_base_url = os.getenv("PPLX_BASE_URL") or "https://api.perplexity.ai"
+
 def _build_clients():
+    # Retries are owned by the provider dispatcher, not the SDK.
     available = []
     if _is_real_api_key(pplx_api_key):
-        available.append(("perplexity", OpenAI(api_key=pplx_api_key, base_url="https://api.perplexity.ai")))
+        available.append(("perplexity", OpenAI(api_key=pplx_api_key, base_url=pplx_base_url, max_retries=0)))
     if _is_real_api_key(openai_api_key):
-        available.append(("openai", OpenAI(api_key=openai_api_key)))
+        available.append(("openai", OpenAI(api_key=openai_api_key, max_retries=0)))
     return available
 
 
 clients = _build_clients()
+dispatcher = dispatcher_from_env()
 provider = clients[0][0] if clients else None
 client = clients[0][1] if clients else None
 
-def extract_resume_text(file_storage):
-    filename = (file_storage.filename or "").lower()
-    if filename.endswith(".pdf"):
-        reader = PdfReader(file_storage)
-        text = []
-        for page in reader.pages:
-            text.append(page.extract_text() or "")
-        return "\n".join(text).strip()
-    elif filename.endswith(".txt"):
-        return file_storage.read().decode("utf-8", errors="ignore").strip()
+PROVIDER_MODELS = {"perplexity": "sonar-pro", "openai": "gpt-4.1-mini"}
+SCAN_PROMPT_VERSION = "scan-v1"
+analysis_cache = analysis_cache_from_env(BASE_DIR / "data" / "analysis_cache.sqlite3")
+text_extractor = text_extractor_from_env(BASE_DIR / "data" / "extraction_cache.sqlite3")
+
+# Analyses for export are kept per scan ID in a store shared by all workers.
+result_store = result_store_from_env(BASE_DIR / "data" / "results.sqlite3")
+SCAN_ID_COOKIE = "scan_id"
+SCAN_STREAM_FORMATS = {"sse": "text/event-stream", "text": "text/plain"}
+
+def _request_analysis(active_provider, active_client, prompt):
+    if active_provider == "perplexity":
+        with metrics.provider_call(active_provider):
+            response = active_client.chat.completions.create(
+                model=PROVIDER_MODELS["perplexity"],
+                messages=[
+                    {"role": "system", "content": "You are an AI resume coach and hiring expert. Provide human-like, actionable guidance."},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+        analysis_text = (response.choices[0].message.content or "").strip()
     else:
-        return ""
+        with metrics.provider_call(active_provider):
+            response = active_client.responses.create(
+                model=PROVIDER_MODELS["openai"],
+                input=prompt
+            )
+        analysis_text = (response.output_text or "").strip()
+    metrics.record_usage(active_provider, response)
+
+    if not analysis_text:
+        raise EmptyResponseError(f"{active_provider} returned an empty response.")
+    return analysis_text
+
+def _chat_stream_text(active_provider, stream):
+    # Closing the generator (a lost hedge, a client that disconnected) closes
+    # the provider response too, so it stops generating billed tokens.
+    usage_chunk = None
+    try:
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+    finally:
+        stream.close()
+    if usage_chunk is not None:
+        metrics.record_usage(active_provider, usage_chunk)
+
+def _responses_stream_text(active_provider, stream):
+    try:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta or ""
+            elif event.type == "response.completed":
+                metrics.record_usage(active_provider, event.response)
+            elif event.type in ("response.failed", "response.incomplete", "error"):
+                raise RuntimeError(f"{active_provider} stream ended with {event.type}.")
+    finally:
+        stream.close()
+
+def _open_analysis_stream(active_provider, active_client, prompt):
+    # Reads up to the first non-empty chunk before returning, so a provider
+    # that fails before emitting anything is still retried or skipped by the
+    # dispatcher. Returns (first_text, remaining_chunks).
+    started = time.perf_counter()
+    with metrics.provider_call(active_provider):
+        if active_provider == "perplexity":
+            stream = active_client.chat.completions.create(
+                model=PROVIDER_MODELS["perplexity"],
+                messages=[
+                    {"role": "system", "content": "You are an AI resume coach and hiring expert. Provide human-like, actionable guidance."},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            chunks = _chat_stream_text(active_provider, stream)
+        else:
+            stream = active_client.responses.create(
+                model=PROVIDER_MODELS["openai"],
+                input=prompt,
+                stream=True,
+            )
+            chunks = _responses_stream_text(active_provider, stream)
+
+        try:
+            for text in chunks:
+                if text.strip():
+                    metrics.registry.observe(
+                        "provider_first_token_seconds", time.perf_counter() - started, provider=active_provider
+                    )
+                    return text, chunks
+        except Exception:
+            stream.close()
+            raise
+        stream.close()
+        raise EmptyResponseError(f"{active_provider} returned an empty response.")
+
+def _scan_frame(stream_format, event, payload):
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    # Plain text carries only the analysis, plus a trailing line on failure.
+    if event == "token":
+        return payload["text"]
+    if event == "error":
+        return f"\n\n[error] {payload['error']}\n"
+    return ""
+
+def _stream_scan(stream_format, prompt, cache_keys, cached, record, done, timings=False):
+    # record is saved to the result store once the whole analysis has
+    # arrived; done is the payload of the final event.
+    try:
+        if cached:
+            analysis_text = cached
+            yield _scan_frame(stream_format, "token", {"text": cached})
+        else:
+            with metrics.stage("provider"):
+                active_provider, (first_text, chunks) = dispatcher.call(
+                    clients,
+                    lambda active_provider, active_client: _open_analysis_stream(active_provider, active_client, prompt),
+                    len(prompt) // 4,
+                    discard=lambda result: result[1].close(),
+                )
+            parts = [first_text]
+            try:
+                yield _scan_frame(stream_format, "token", {"text": first_text})
+                for text in metrics.timed_iter(chunks, "stream"):
+                    if text:
+                        parts.append(text)
+                        yield _scan_frame(stream_format, "token", {"text": text})
+            finally:
+                chunks.close()
+            analysis_text = "".join(parts).strip()
+            analysis_cache.put(cache_keys[active_provider], analysis_text)
+
+        with metrics.stage("store"):
+            result_store.save(done["scan_id"], "analysis", dict(record, analysis=analysis_text))
+        if timings:
+            done["timings"] = metrics.current_timings().as_dict()
+        yield _scan_frame(stream_format, "done", done)
+    except AuthenticationError:
+        yield _scan_frame(stream_format, "error", {
+            "error": "Invalid API key (401). Update PPLX_API_KEY or OPENAI_API_KEY in .env and restart the app."
+        })
+    except EmptyResponseError:
+        yield _scan_frame(stream_format, "error", {"error": "Model returned an empty response. Please try again."})
+    except APIStatusError as e:
+        yield _scan_frame(stream_format, "error", {"error": f"OpenAI API status error ({e.status_code}): {e}"})
+    except Exception as e:
+        yield _scan_frame(stream_format, "error", {"error": str(e)})
+
+def extract_resume_text(file_storage):
+    return text_extractor.extract(file_storage.filename or "", file_storage.read())
+
+metrics.registry.add_collector("dispatcher", metrics.dispatcher_collector(dispatcher))
+metrics.registry.add_collector("analysis_cache", metrics.cache_collector("analysis_cache", analysis_cache))
+metrics.registry.add_collector("extraction_cache", metrics.cache_collector("extraction_cache", text_extractor.cache))
+
+@app.before_request
+def _start_request_timings():
+    metrics.start_request()
 
 @app.route("/", methods=["GET"])
 def home():
-    html_path = BASE_DIR / "index.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as f:
-            return f.read()
-    return "<h1>AI Resume Scanner</h1><p>index.html not found.</p>", 404
+    return pages.response("index.html", "<h1>AI Resume Scanner</h1><p>index.html not found.</p>")
 
 @app.route("/favicon.ico", methods=["GET"])
 def favicon():
@@ -103,17 +250,26 @@ def scan():
                 "error": "API key not configured. Add a valid PPLX_API_KEY or OPENAI_API_KEY in .env (same folder as app.py), then fully restart the app."
             }), 500
 
-        resume_file = request.files.get("resume")
-        job_description = (request.form.get("job_description") or "").strip()
+        with metrics.stage("multipart"):
+            resume_file = request.files.get("resume")
+            job_description = (request.form.get("job_description") or "").strip()
 
         if not resume_file or not job_description:
             return jsonify({"error": "Resume file and job description are required."}), 400
 
-        resume_text = extract_resume_text(resume_file)
+        with metrics.stage("extract"):
+            resume_text = extract_resume_text(resume_file)
         if not resume_text:
-            return jsonify({"error": "Could not extract resume text. Use a readable PDF or TXT."}), 400
+            return jsonify({"error": "Could not extract resume text. Use a readable PDF, DOCX or TXT."}), 400
 
-        prompt = f"""
+        # Page headers, repeated lines and extraction noise are dropped, and
+        # long documents are trimmed to their token budgets.
+        with metrics.stage("compact"):
+            jd = compact_text(job_description, JD_TOKEN_BUDGET)
+            resume = compact_text(resume_text, RESUME_TOKEN_BUDGET, jd.text)
+
+        with metrics.stage("prompt"):
+            prompt = f"""
 You are an AI resume coach and hiring expert. Provide human-like, actionable guidance.
 
 Compare this resume with the job description and return:
@@ -126,57 +282,91 @@ Compare this resume with the job description and return:
 7) Rewritten professional summary (3-4 lines)
 
 Resume:
-{resume_text}
+{resume.text}
 
 Job Description:
-{job_description}
+{jd.text}
 """
 
-        analysis_text = ""
-        auth_failures = 0
-
-        for active_provider, active_client in clients:
+        cache_keys = {
+            active_provider: analysis_cache.make_key(
+                SCAN_PROMPT_VERSION, active_provider, PROVIDER_MODELS.get(active_provider, ""),
+                resume.text, jd.text,
+            )
+            for active_provider, _ in clients
+        }
+        bypass_cache = (request.form.get("bypass_cache") or "").strip().lower() in ("1", "true", "yes", "on")
+        with metrics.stage("cache"):
+            cached = None if bypass_cache else analysis_cache.get(*cache_keys.values())
+
+        prompt_tokens = {
+            "resume": resume.as_dict(),
+            "job_description": jd.as_dict(),
+            "saved": resume.saved + jd.saved,
+        }
+        if not cached:
+            metrics.record_prompt_tokens(resume.original_tokens + jd.original_tokens, resume.tokens + jd.tokens)
+
+        stream_format = (request.values.get("stream") or "").strip().lower()
+        if stream_format in SCAN_STREAM_FORMATS:
+            # Tokens are forwarded as they arrive; the scan ID is known up
+            # front so the cookie and header can go out with the first byte.
+            scan_id = result_store.new_id()
+            done = {"scan_id": scan_id, "cached": bool(cached), "prompt_tokens": prompt_tokens}
+            timings = (request.values.get("timings") or "").strip().lower() in ("1", "true", "yes", "on")
+            record = {
+                "resume_text": resume_text,
+                "job_description": job_description,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            response = Response(
+                stream_with_context(_stream_scan(stream_format, prompt, cache_keys, cached, record, done, timings)),
+                mimetype=SCAN_STREAM_FORMATS[stream_format],
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Scan-Id": scan_id},
+            )
+            response.set_cookie(SCAN_ID_COOKIE, scan_id, max_age=int(result_store.ttl_seconds), httponly=True, samesite="Lax")
+            return response
+
+        analysis_text = cached or ""
+
+        if not cached:
             try:
-                if active_provider == "perplexity":
-                    response = active_client.chat.completions.create(
-                        model="sonar-pro",
-                        messages=[
-                            {"role": "system", "content": "You are an AI resume coach and hiring expert. Provide human-like, actionable guidance."},
-                            {"role": "user", "content": prompt},
-                        ],
-                    )
-                    analysis_text = (response.choices[0].message.content or "").strip()
-                else:
-                    response = active_client.responses.create(
-                        model="gpt-4.1-mini",
-                        input=prompt
+                with metrics.stage("provider"):
+                    active_provider, analysis_text = dispatcher.call(
+                        clients,
+                        lambda active_provider, active_client: _request_analysis(active_provider, active_client, prompt),
+                        len(prompt) // 4,
                     )
-                    analysis_text = (response.output_text or "").strip()
-
-                if analysis_text:
-                    break
             except AuthenticationError:
-                auth_failures += 1
-                continue
-
-        if auth_failures == len(clients):
-            return jsonify({
-                "error": "Invalid API key (401). Update PPLX_API_KEY or OPENAI_API_KEY in .env and restart the app."
-            }), 401
-
-        if not analysis_text:
-            return jsonify({"error": "Model returned an empty response. Please try again."}), 502
+                return jsonify({
+                    "error": "Invalid API key (401). Update PPLX_API_KEY or OPENAI_API_KEY in .env and restart the app."
+                }), 401
+            except EmptyResponseError:
+                return jsonify({"error": "Model returned an empty response. Please try again."}), 502
+            except ProviderUnavailableError as e:
+                return jsonify({"error": str(e)}), 503
+            analysis_cache.put(cache_keys[active_provider], analysis_text)
 
         # Store results for export
-        global last_analysis
-        last_analysis = {
-            "resume_text": resume_text,
-            "job_description": job_description,
+        with metrics.stage("store"):
+            scan_id = result_store.save(result_store.new_id(), "analysis", {
+                "resume_text": resume_text,
+                "job_description": job_description,
+                "analysis": analysis_text,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            })
+
+        payload = {
             "analysis": analysis_text,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "cached": bool(cached),
+            "scan_id": scan_id,
+            "prompt_tokens": prompt_tokens,
         }
-
-        return jsonify({"analysis": analysis_text})
+        if (request.values.get("timings") or "").strip().lower() in ("1", "true", "yes", "on"):
+            payload["timings"] = metrics.current_timings().as_dict()
+        response = jsonify(payload)
+        response.set_cookie(SCAN_ID_COOKIE, scan_id, max_age=int(result_store.ttl_seconds), httponly=True, samesite="Lax")
+        return response
 
     except BadRequestError as e:
         return jsonify({"error": f"OpenAI request error: {e}"}), 400
@@ -186,118 +376,82 @@ Job Description:
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/provider-stats", methods=["GET"])
+def provider_stats():
+    return jsonify(dispatcher.stats())
+
+@app.route("/analysis-cache", methods=["GET"])
+def analysis_cache_stats():
+    return jsonify(analysis_cache.stats())
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    return metrics.render_response()
+
+def _requested_analysis() -> dict:
+    scan_id = request.args.get("scan_id") or request.cookies.get(SCAN_ID_COOKIE)
+    return result_store.load(scan_id, "analysis") or {}
+
 @app.route("/export-excel", methods=["GET"])
 def export_excel():
-    if not last_analysis.get("analysis"):
+    if not EXCEL_AVAILABLE:
+        return jsonify({"error": "Excel export not available. Install openpyxl: pip install openpyxl"}), 500
+
+    saved_analysis = _requested_analysis()
+    if not saved_analysis.get("analysis"):
         return jsonify({"error": "No analysis to export. Run a scan first."}), 400
 
-    try:
-        def _pdf_escape(text):
-            return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-
-        def _build_pdf(text_lines):
-            lines_per_page = 45
-            page_height = 792
-            top_margin = 760
-            line_height = 15
-
-            pages = [text_lines[i:i + lines_per_page] for i in range(0, len(text_lines), lines_per_page)]
-            if not pages:
-                pages = [["AI Resume Scanner - Analysis Report"]]
-
-            objects = []
-            object_ids = {}
-            next_id = 1
-
-            def new_object(content):
-                nonlocal next_id
-                object_ids[next_id] = content
-                next_id += 1
-                return next_id - 1
-
-            font_id = new_object("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
-            page_ids = []
-            content_ids = []
-
-            pages_root_id = next_id
-            object_ids[pages_root_id] = ""
-            next_id += 1
-
-            for page_lines in pages:
-                stream_lines = ["BT", "/F1 11 Tf"]
-                y = top_margin
-                for line in page_lines:
-                    safe = _pdf_escape(line)
-                    stream_lines.append(f"1 0 0 1 40 {y} Tm ({safe}) Tj")
-                    y -= line_height
-                stream_lines.append("ET")
-                stream_data = "\n".join(stream_lines).encode("latin-1", errors="replace")
-                content_id = new_object(f"<< /Length {len(stream_data)} >>\nstream\n" + stream_data.decode("latin-1") + "\nendstream")
-                content_ids.append(content_id)
-
-                page_id = new_object(f"<< /Type /Page /Parent {pages_root_id} 0 R /MediaBox [0 0 612 {page_height}] /Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>")
-                page_ids.append(page_id)
-
-            object_ids[pages_root_id] = f"<< /Type /Pages /Count {len(page_ids)} /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] >>"
-            catalog_id = new_object(f"<< /Type /Catalog /Pages {pages_root_id} 0 R >>")
-
-            pdf = BytesIO()
-            pdf.write(b"%PDF-1.4\n")
-
-            offsets = {}
-            for obj_id in sorted(object_ids.keys()):
-                offsets[obj_id] = pdf.tell()
-                pdf.write(f"{obj_id} 0 obj\n".encode("ascii"))
-                pdf.write((object_ids[obj_id] + "\n").encode("latin-1", errors="replace"))
-                pdf.write(b"endobj\n")
-
-            xref_start = pdf.tell()
-            total_objects = max(object_ids.keys())
-            pdf.write(f"xref\n0 {total_objects + 1}\n".encode("ascii"))
-            pdf.write(b"0000000000 65535 f \n")
-            for obj_id in range(1, total_objects + 1):
-                offset = offsets.get(obj_id, 0)
-                pdf.write(f"{offset:010} 00000 n \n".encode("ascii"))
-
-            pdf.write(f"trailer\n<< /Size {total_objects + 1} /Root {catalog_id} 0 R >>\nstartxref\n{xref_start}\n%%EOF".encode("ascii"))
-            pdf.seek(0)
-            return pdf
-
-        report_lines = [
-            "AI Resume Scanner - Analysis Report",
-            f"Generated: {last_analysis.get('timestamp', 'N/A')}",
-            "",
-            "Resume Text",
-            *last_analysis.get("resume_text", "").split("\n"),
-            "",
-            "Job Description",
-            *last_analysis.get("job_description", "").split("\n"),
-            "",
-            "AI Analysis & Recommendations",
-            *last_analysis.get("analysis", "").split("\n"),
-        ]
-
-        output = _build_pdf(report_lines)
-
-        timestamp = last_analysis.get("timestamp", "").replace(" ", "_").replace(":", "-")
-        filename = f"resume_analysis_{timestamp}.pdf"
+    def _report_rows():
+        yield ["AI Resume Scanner - Analysis Report"]
+        yield ["Generated", saved_analysis.get("timestamp", "N/A")]
+        for heading, key in (
+            ("Resume Text", "resume_text"),
+            ("Job Description", "job_description"),
+            ("AI Analysis & Recommendations", "analysis"),
+        ):
+            yield []
+            yield [heading]
+            for line in saved_analysis.get(key, "").split("\n"):
+                yield [line]
+
+    timestamp = saved_analysis.get("timestamp", "").replace(" ", "_").replace(":", "-")
+    return Response(
+        stream_with_context(iter_xlsx("Analysis", _report_rows(), bold_rows=(0,))),
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename=resume_analysis_{timestamp}.xlsx"},
+    )
 
-        return send_file(
-            output,
-            mimetype="application/pdf",
-            as_attachment=True,
-            download_name=filename
-        )
+@app.route("/export-pdf", methods=["GET"])
+def export_pdf():
+    saved_analysis = _requested_analysis()
+    if not saved_analysis.get("analysis"):
+        return jsonify({"error": "No analysis to export. Run a scan first."}), 400
 
-    except Exception as e:
-        return jsonify({"error": f"Export failed: {str(e)}"}), 500
+    blocks = [
+        ("heading", "AI Resume Scanner - Analysis Report"),
+        ("paragraph", f"Generated: {saved_analysis.get('timestamp', 'N/A')}"),
+        ("subheading", "Resume Text"),
+        ("paragraph", saved_analysis.get("resume_text", "")),
+        ("subheading", "Job Description"),
+        ("paragraph", saved_analysis.get("job_description", "")),
+        ("subheading", "AI Analysis & Recommendations"),
+        ("paragraph", saved_analysis.get("analysis", "")),
+    ]
+
+    timestamp = saved_analysis.get("timestamp", "").replace(" ", "_").replace(":", "-")
+    return Response(
+        stream_with_context(iter_pdf(blocks, title="AI Resume Scanner - Analysis Report")),
+        mimetype="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename=resume_analysis_{timestamp}.pdf"},
+    )
 
 @app.route("/export-docx", methods=["GET"])
 def export_docx():
     if not DOCX_AVAILABLE:
         return jsonify({"error": "DOCX export not available. Install python-docx: pip install python-docx"}), 500
 
-    if not last_analysis.get("analysis"):
+    saved_analysis = _requested_analysis()
+    if not saved_analysis.get("analysis"):
         return jsonify({"error": "No analysis to export. Run a scan first."}), 400
 
     try:
@@ -306,22 +460,22 @@ def export_docx():
         for run in title.runs:
             run.font.size = Pt(16)
 
-        doc.add_paragraph(f"Generated: {last_analysis.get('timestamp', 'N/A')}")
+        doc.add_paragraph(f"Generated: {saved_analysis.get('timestamp', 'N/A')}")
 
         doc.add_heading("Resume Text", level=2)
-        doc.add_paragraph(last_analysis.get("resume_text", ""))
+        doc.add_paragraph(saved_analysis.get("resume_text", ""))
 
         doc.add_heading("Job Description", level=2)
-        doc.add_paragraph(last_analysis.get("job_description", ""))
+        doc.add_paragraph(saved_analysis.get("job_description", ""))
 
         doc.add_heading("AI Analysis & Recommendations", level=2)
-        doc.add_paragraph(last_analysis.get("analysis", ""))
+        doc.add_paragraph(saved_analysis.get("analysis", ""))
 
         output = BytesIO()
         doc.save(output)
         output.seek(0)
 
-        timestamp = last_analysis.get("timestamp", "").replace(" ", "_").replace(":", "-")
+        timestamp = saved_analysis.get("timestamp", "").replace(" ", "_").replace(":", "-")
         filename = f"resume_analysis_{timestamp}.docx"
 
         return send_file(
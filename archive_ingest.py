@@ -0,0 +1,96 @@
+import tarfile
+import zipfile
+from pathlib import PurePosixPath
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx", ".txt")
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def is_archive(filename: str) -> bool:
+    return (filename or "").lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def _is_noise(member_name: str) -> bool:
+    # Folder entries and OS metadata (macOS resource forks, Thumbs.db, dotfiles).
+    parts = PurePosixPath(member_name).parts
+    return not parts or parts[0] == "__MACOSX" or parts[-1].startswith(".") or parts[-1].lower() == "thumbs.db"
+
+
+def _skip_reason(member_name: str, size: int, max_member_bytes: int):
+    if not member_name.lower().endswith(SUPPORTED_SUFFIXES):
+        return "unsupported file type (supported: PDF/TXT/DOCX)"
+    if max_member_bytes is not None and size > max_member_bytes:
+        return f"larger than the {max_member_bytes // (1024 * 1024)} MB per-file limit"
+    return None
+
+
+def _read_capped(stream, max_member_bytes: int):
+    # Archive headers can lie about sizes, so the cap is enforced on the bytes
+    # actually decompressed, not just the declared size.
+    if max_member_bytes is None:
+        return stream.read()
+    data = stream.read(max_member_bytes + 1)
+    return None if len(data) > max_member_bytes else data
+
+
+def iter_archive_members(fileobj, filename: str, max_member_bytes: int = None):
+    """Yields (member_name, data, skip_reason) for each file in a ZIP or tar archive.
+
+    Members are decompressed one at a time straight from the archive stream,
+    so at most one member is held in memory and nothing is written to disk.
+    data is None whenever skip_reason is set.
+    """
+    lowered = (filename or "").lower()
+
+    if lowered.endswith(ZIP_SUFFIXES):
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except zipfile.BadZipFile as exc:
+            raise ArchiveError(str(exc))
+        with archive:
+            for info in archive.infolist():
+                if info.is_dir() or _is_noise(info.filename):
+                    continue
+                reason = _skip_reason(info.filename, info.file_size, max_member_bytes)
+                if reason:
+                    yield info.filename, None, reason
+                    continue
+                if info.flag_bits & 0x1:
+                    yield info.filename, None, "encrypted archive member"
+                    continue
+                with archive.open(info) as stream:
+                    data = _read_capped(stream, max_member_bytes)
+                if data is None:
+                    yield info.filename, None, _skip_reason(info.filename, max_member_bytes + 1, max_member_bytes)
+                    continue
+                yield info.filename, data, None
+        return
+
+    if lowered.endswith(TAR_SUFFIXES):
+        try:
+            # Stream mode reads members sequentially without seeking.
+            archive = tarfile.open(fileobj=fileobj, mode="r|*")
+        except tarfile.TarError as exc:
+            raise ArchiveError(str(exc))
+        with archive:
+            for member in archive:
+                if not member.isfile() or _is_noise(member.name):
+                    continue
+                reason = _skip_reason(member.name, member.size, max_member_bytes)
+                if reason:
+                    yield member.name, None, reason
+                    continue
+                stream = archive.extractfile(member)
+                data = _read_capped(stream, max_member_bytes) if stream is not None else None
+                if data is None:
+                    yield member.name, None, "could not be read from the archive"
+                    continue
+                yield member.name, data, None
+        return
+
+    raise ArchiveError(f"Unsupported archive type: {filename}")
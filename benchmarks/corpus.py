@@ -0,0 +1,171 @@
+"""Synthetic resume/JD corpus for the benchmarks.
+
+    python benchmarks/corpus.py out_dir --count 100 --formats pdf docx txt
+
+Resumes rotate through the requested formats and are generated from a
+seeded vocabulary, so the same arguments always produce the same files.
+PDFs come from pdf_report; DOCX needs python-docx and is replaced by TXT
+when it is missing.
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_report import build_pdf  # noqa: E402
+
+try:
+    from docx import Document
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+SKILLS = (
+    "Python", "Flask", "Django", "FastAPI", "SQL", "PostgreSQL", "MySQL", "Redis", "Docker", "Kubernetes",
+    "AWS", "GCP", "Azure", "Terraform", "React", "TypeScript", "JavaScript", "Node.js", "Java", "Spring",
+    "Go", "Kafka", "Spark", "Airflow", "Pandas", "NumPy", "scikit-learn", "PyTorch", "TensorFlow", "Tableau",
+    "CI/CD", "GitHub Actions", "Linux", "REST APIs", "GraphQL", "Microservices", "Agile", "Scrum",
+)
+TITLES = (
+    "Software Engineer", "Backend Developer", "Data Engineer", "Data Scientist", "DevOps Engineer",
+    "Full Stack Developer", "Machine Learning Engineer", "Platform Engineer", "QA Engineer", "Product Analyst",
+)
+VERBS = ("Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Shipped", "Scaled", "Refactored")
+OBJECTS = (
+    "a payments API", "the data warehouse", "an ML scoring service", "internal dashboards", "the CI pipeline",
+    "a customer onboarding flow", "event ingestion", "the search backend", "a recommendation engine",
+)
+OUTCOMES = (
+    "cutting latency by {n}%", "saving {n} engineering hours a month", "serving {n}k daily users",
+    "reducing cloud spend by {n}%", "raising test coverage to {n}%", "lowering error rates by {n}%",
+)
+FIRST_NAMES = ("Asha", "Ben", "Chen", "Divya", "Elena", "Farid", "Grace", "Hiro", "Isha", "Jonas", "Kofi", "Lena")
+LAST_NAMES = ("Rao", "Smith", "Wang", "Iyer", "Garcia", "Khan", "Lee", "Sato", "Patel", "Muller", "Mensah", "Novak")
+
+
+def job_description(seed: int = 0) -> str:
+    rng = random.Random(seed)
+    title = rng.choice(TITLES)
+    required = rng.sample(SKILLS, 8)
+    preferred = rng.sample([skill for skill in SKILLS if skill not in required], 5)
+    return "\n".join([
+        f"Senior {title}",
+        "",
+        f"We are hiring a {title} to build and run production services for a fast-growing product team.",
+        "",
+        "Requirements:",
+        *(f"- {skill} in production" for skill in required),
+        "",
+        "Nice to have:",
+        *(f"- {skill}" for skill in preferred),
+    ])
+
+
+def resume_sections(rng: random.Random, index: int) -> list:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+    experience = []
+    for job in range(rng.randint(2, 4)):
+        bullets = [
+            f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, "
+            + rng.choice(OUTCOMES).format(n=rng.randint(10, 90)) + "."
+            for _ in range(rng.randint(3, 6))
+        ]
+        experience.append((f"{rng.choice(TITLES)}, Company {index}-{job} ({2024 - 3 * job - 2}-{2024 - 3 * job})", bullets))
+    return [
+        ("name", f"{name} - Candidate {index:05d}"),
+        ("paragraph", f"{title} | {name.lower().replace(' ', '.')}@example.com"),
+        ("heading", "Summary"),
+        ("paragraph", f"{title} with {rng.randint(2, 15)} years of experience shipping {rng.choice(OBJECTS)}."),
+        ("heading", "Skills"),
+        ("paragraph", ", ".join(skills)),
+        ("heading", "Experience"),
+        *(("job", job) for job in experience),
+        ("heading", "Education"),
+        ("paragraph", f"B.Tech in Computer Science, {2024 - rng.randint(4, 18)}"),
+    ]
+
+
+def _as_text(sections: list) -> str:
+    lines = []
+    for kind, value in sections:
+        if kind == "job":
+            lines.append(value[0])
+            lines.extend(f"- {bullet}" for bullet in value[1])
+        elif kind == "heading":
+            lines.extend(["", value.upper()])
+        else:
+            lines.append(value)
+    return "\n".join(lines) + "\n"
+
+
+def _pdf_blocks(sections: list):
+    for kind, value in sections:
+        if kind == "name":
+            yield "heading", value
+        elif kind == "heading":
+            yield "subheading", value
+        elif kind == "job":
+            yield "paragraph", value[0]
+            yield "paragraph", "\n".join(f"- {bullet}" for bullet in value[1])
+        else:
+            yield "paragraph", value
+
+
+def _write_docx(sections: list, path: Path):
+    document = Document()
+    for kind, value in sections:
+        if kind == "name":
+            document.add_heading(value, level=1)
+        elif kind == "heading":
+            document.add_heading(value, level=2)
+        elif kind == "job":
+            document.add_paragraph(value[0])
+            for bullet in value[1]:
+                document.add_paragraph(bullet, style="List Bullet")
+        else:
+            document.add_paragraph(value)
+    document.save(str(path))
+
+
+def generate_corpus(directory, count: int, formats=("pdf", "docx", "txt"), seed: int = 0) -> list:
+    """Writes count resumes plus job_description.txt into directory and returns the resume paths."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "job_description.txt").write_text(job_description(seed), encoding="utf-8")
+
+    rng = random.Random(seed)
+    paths = []
+    for index in range(1, count + 1):
+        sections = resume_sections(rng, index)
+        kind = formats[(index - 1) % len(formats)]
+        if kind == "docx" and not DOCX_AVAILABLE:
+            kind = "txt"
+        path = directory / f"resume_{index:05d}.{kind}"
+        if kind == "pdf":
+            path.write_bytes(build_pdf(_pdf_blocks(sections), title=path.stem))
+        elif kind == "docx":
+            _write_docx(sections, path)
+        else:
+            path.write_text(_as_text(sections), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx", "txt"], choices=["pdf", "docx", "txt"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.directory, args.count, tuple(args.formats), args.seed)
+    print(f"Wrote {len(paths)} resumes and job_description.txt to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
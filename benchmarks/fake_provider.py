@@ -0,0 +1,274 @@
+"""Local stand-in for the Perplexity/OpenAI APIs used by the benchmarks.
+
+    python benchmarks/fake_provider.py --port 8900 --latency-ms 400 --jitter-ms 150 \\
+        --error-rate 0.02 --rate-limit-rate 0.05
+
+Serves POST /chat/completions and POST /responses (with or without a /v1
+prefix), streamed as server-sent events when the request sets "stream".
+Answers are canned JSON analyses with a score derived from the prompt, so
+runs are repeatable. Batch prompts ("=== Resume N ===" sections) get one
+array entry per resume. The first stdout line is the bound port.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_MARKER = re.compile(r"=== Resume (\d+) ===")
+STREAM_CHUNK_CHARS = 16
+
+
+class ProviderBehavior:
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: float = 0.2, tokens_per_second: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        # Adds output-length dependent latency, like a real decoder.
+        self.tokens_per_second = tokens_per_second
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0}
+
+    def roll(self):
+        with self.lock:
+            self.counts["requests"] += 1
+            draw = self.random.random()
+            delay = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+        if draw < self.rate_limit_rate:
+            return "rate_limited", 0.0
+        if draw < self.rate_limit_rate + self.error_rate:
+            return "error", delay / 2
+        return "ok", delay
+
+    def count(self, outcome: str):
+        with self.lock:
+            self.counts[outcome] += 1
+
+
+def _score(text: str) -> int:
+    return 20 + int(hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest(), 16) % 80
+
+
+def _analysis(resume_text: str, resume_id=None) -> dict:
+    analysis = {
+        "match_score": _score(resume_text),
+        "strengths": ["Relevant hands-on experience", "Clear project impact", "Matching core stack"],
+        "missing_keywords": ["kubernetes", "terraform", "graphql"],
+        "improvement_suggestions": ["Quantify achievements", "Mirror JD keywords", "Tighten the summary"],
+        "summary": "Solid candidate with a good overlap on the required skills and a few gaps.",
+    }
+    if resume_id is not None:
+        analysis = {"resume_id": resume_id, **analysis}
+    return analysis
+
+
+def answer(prompt: str) -> str:
+    sections = BATCH_MARKER.split(prompt)
+    if len(sections) > 1:
+        # ["preamble", "1", text1, "2", text2, ...]
+        items = [_analysis(sections[position + 1], int(sections[position])) for position in range(1, len(sections), 2)]
+        return json.dumps(items)
+    return json.dumps(_analysis(prompt))
+
+
+def _prompt_text(payload: dict) -> str:
+    if "messages" in payload:
+        return "\n".join(str(message.get("content", "")) for message in payload["messages"])
+    prompt = payload.get("input", "")
+    return prompt if isinstance(prompt, str) else json.dumps(prompt)
+
+
+def _responses_body(model: str, text: str, input_tokens: int, output_tokens: int) -> dict:
+    return {
+        "id": "resp_fake", "object": "response", "created_at": int(time.time()), "model": model,
+        "status": "completed", "parallel_tool_calls": False, "tool_choice": "auto", "tools": [],
+        "output": [{
+            "type": "message", "id": "msg_fake", "status": "completed", "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "usage": {
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behavior = ProviderBehavior()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            payload = {}
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if not path.endswith(("/chat/completions", "/responses")):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        behavior = self.behavior
+        outcome, delay = behavior.roll()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            behavior.count("rate_limited")
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                            {"Retry-After": str(behavior.retry_after)})
+            return
+        if outcome == "error":
+            behavior.count("errors")
+            self._send_json(500, {"error": {"message": "Upstream error", "type": "server_error"}})
+            return
+
+        prompt = _prompt_text(payload)
+        text = answer(prompt)
+        input_tokens = len(prompt) // 4 + 1
+        output_tokens = len(text) // 4 + 1
+        model = payload.get("model", "fake-model")
+        responses_api = path.endswith("/responses")
+        if payload.get("stream"):
+            self._send_stream(responses_api, model, text, input_tokens, output_tokens)
+            behavior.count("ok")
+            return
+
+        if behavior.tokens_per_second > 0:
+            time.sleep(output_tokens / behavior.tokens_per_second)
+        behavior.count("ok")
+        if responses_api:
+            body = _responses_body(model, text, input_tokens, output_tokens)
+        else:
+            body = {
+                "id": "chatcmpl_fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+                "usage": {
+                    "prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                },
+            }
+        self._send_json(200, body)
+
+    def _send_stream(self, responses_api: bool, model: str, text: str, input_tokens: int, output_tokens: int):
+        # No Content-Length, so the connection ends the stream.
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(data: dict, event: str = None):
+            frame = f"event: {event}\n" if event else ""
+            self.wfile.write(f"{frame}data: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        pieces = [text[start:start + STREAM_CHUNK_CHARS] for start in range(0, len(text), STREAM_CHUNK_CHARS)]
+        created = int(time.time())
+        if responses_api:
+            started = dict(_responses_body(model, "", 0, 0), status="in_progress", output=[], usage=None)
+            send({"type": "response.created", "sequence_number": 0, "response": started}, "response.created")
+        for number, piece in enumerate(pieces, start=1):
+            if self.behavior.tokens_per_second > 0:
+                time.sleep(len(piece) / 4 / self.behavior.tokens_per_second)
+            if responses_api:
+                send({
+                    "type": "response.output_text.delta", "sequence_number": number, "item_id": "msg_fake",
+                    "output_index": 0, "content_index": 0, "delta": piece, "logprobs": [],
+                }, "response.output_text.delta")
+            else:
+                send({
+                    "id": "chatcmpl_fake", "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                })
+
+        if responses_api:
+            send({
+                "type": "response.completed", "sequence_number": len(pieces) + 1,
+                "response": _responses_body(model, text, input_tokens, output_tokens),
+            }, "response.completed")
+            return
+        send({
+            "id": "chatcmpl_fake", "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        })
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with self.behavior.lock:
+                self._send_json(200, dict(self.behavior.counts))
+            return
+        self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+
+def start(behavior: ProviderBehavior, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    handler = type("BoundFakeProviderHandler", (FakeProviderHandler,), {"behavior": behavior})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=300, help="mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="extra decode delay, 0 = none")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def behavior_from_args(args) -> ProviderBehavior:
+    return ProviderBehavior(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        tokens_per_second=args.tokens_per_second, seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8900, help="0 picks a free port")
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    server = start(behavior_from_args(args), args.port)
+    print(server.server_address[1], flush=True)
+    print(f"Fake provider listening on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
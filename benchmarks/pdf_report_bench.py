@@ -0,0 +1,82 @@
+"""Times the streaming PDF report engine on synthetic bulk runs.
+
+    python benchmarks/pdf_report_bench.py --candidates 100 1000 5000
+
+Each candidate gets a summary, strengths and suggestions similar in length
+to a real analysis, so 5000 candidates produce a few thousand pages.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_report import iter_pdf  # noqa: E402
+
+WORDS = (
+    "python flask django api rest sql postgres docker kubernetes aws cloud data pipeline "
+    "machine learning model analytics leadership communication agile testing ci cd "
+    "microservices react typescript performance scalability security design mentoring"
+).split()
+
+
+def _sentence(rng, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _blocks(candidates: int, seed: int = 7):
+    rng = random.Random(seed)
+    yield "heading", "Company Bulk Resume Scan - Candidate Report"
+    yield "subheading", "Job Description"
+    yield "paragraph", " ".join(_sentence(rng, 18) for _ in range(12))
+    for rank in range(1, candidates + 1):
+        yield "subheading", f"#{rank} candidate_{rank:05d}.pdf - Match Score {rng.randint(20, 98)}"
+        yield "paragraph", " ".join(_sentence(rng, 16) for _ in range(3))
+        yield "paragraph", "Strengths: " + "; ".join(_sentence(rng, 5) for _ in range(4))
+        yield "paragraph", "Missing Keywords: " + "; ".join(rng.choice(WORDS) for _ in range(6))
+        yield "paragraph", "Improvement Suggestions: " + "; ".join(_sentence(rng, 8) for _ in range(3))
+
+
+class _CountingSink:
+    def __init__(self):
+        self.size = 0
+        self.chunks = 0
+        self.first_chunk_at = None
+
+
+def run(candidates: int) -> dict:
+    sink = _CountingSink()
+    started = time.perf_counter()
+    for chunk in iter_pdf(_blocks(candidates), title="benchmark"):
+        if sink.first_chunk_at is None:
+            sink.first_chunk_at = time.perf_counter() - started
+        sink.size += len(chunk)
+        sink.chunks += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "candidates": candidates,
+        "seconds": elapsed,
+        "first_chunk_ms": sink.first_chunk_at * 1000,
+        "bytes": sink.size,
+        "chunks": sink.chunks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'candidates':>10} {'seconds':>9} {'cand/s':>9} {'first ms':>9} {'size KB':>9} {'chunks':>7}")
+    for candidates in args.candidates:
+        result = run(candidates)
+        print(
+            f"{result['candidates']:>10} {result['seconds']:>9.2f} {candidates / result['seconds']:>9.0f} "
+            f"{result['first_chunk_ms']:>9.1f} {result['bytes'] / 1024:>9.0f} {result['chunks']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Offline throughput benchmark for /scan (app.py) and /bulk-scan (company_bulk_app.py).
+
+    python benchmarks/run_bench.py --apps bulk scan --sizes 10 100 1000 --latency-ms 300 \\
+        --rate-limit-rate 0.05 --json results.json --baseline previous.json
+
+Every (app, size) pair runs in a fresh subprocess against the fake provider
+in benchmarks/fake_provider.py. A new process gives a clean peak RSS and
+cold caches. The analysis and extraction caches are disabled unless --cache
+is passed, and all state lives in a temporary directory. With --baseline,
+the exit code is 1 when throughput drops or p95 latency grows by more than
+--tolerance.
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_provider import add_behavior_arguments  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+APP_MODULES = {"scan": "app", "bulk": "company_bulk_app"}
+
+
+def percentile(values: list, fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / scale, 1)
+
+
+class StageTimer:
+    """Wall time per stage, summed across threads."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, owner, name: str, stage: str):
+        original = getattr(owner, name, None)
+        if original is None:
+            return
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.seconds[stage] = self.seconds.get(stage, 0.0) + elapsed
+                    self.calls[stage] = self.calls.get(stage, 0) + 1
+
+        setattr(owner, name, timed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {stage: {"seconds": round(seconds, 3), "calls": self.calls[stage]}
+                    for stage, seconds in sorted(self.seconds.items())}
+
+
+def _start_provider(args):
+    command = [
+        sys.executable, str(Path(__file__).resolve().parent / "fake_provider.py"), "--port", "0",
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+        "--retry-after", str(args.retry_after), "--tokens-per-second", str(args.tokens_per_second),
+        "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}"
+
+
+def _prepare_environment(workdir: Path, use_cache: bool):
+    os.environ.update({
+        "ANALYSIS_CACHE_PATH": str(workdir / "analysis_cache.sqlite3"),
+        "EXTRACTION_CACHE_PATH": str(workdir / "extraction_cache.sqlite3"),
+        "RESULT_STORE_PATH": str(workdir / "results.sqlite3"),
+        "BULK_JOBS_DIR": str(workdir / "bulk_jobs"),
+        "CANDIDATE_INDEX_PATH": str(workdir / "candidates.sqlite3"),
+        "UPLOAD_SPOOL_DIR": str(workdir),
+    })
+    if not use_cache:
+        os.environ["ANALYSIS_CACHE_ENABLED"] = "0"
+        os.environ["EXTRACTION_CACHE_ENABLED"] = "0"
+
+
+def _point_at_provider(module, base_url: str, provider: str):
+    from openai import OpenAI
+
+    # Replace whatever .env configured so no real provider is ever called.
+    client = OpenAI(api_key="benchmark-key", base_url=base_url, max_retries=0, timeout=60)
+    module.clients = [(provider, client)]
+    if hasattr(module, "client"):
+        module.client = client
+    if hasattr(module, "active_provider"):
+        module.active_provider = provider
+
+
+def _instrument(module, timer: StageTimer):
+    timer.wrap(module.text_extractor, "extract", "extract")
+    timer.wrap(module.text_extractor, "extract_many", "extract")
+    timer.wrap(module.dispatcher, "call", "provider")
+    timer.wrap(module.analysis_cache, "get", "cache")
+    timer.wrap(module.analysis_cache, "put", "cache")
+    timer.wrap(module.result_store, "save", "result_store")
+    if hasattr(module, "score_resumes"):
+        timer.wrap(module, "score_resumes", "prescreen")
+
+
+def _run_bulk(module, files: list, job_description: str, args) -> dict:
+    data = {
+        "job_description": job_description,
+        "stream": "ndjson",
+        "resumes": [(io.BytesIO(path.read_bytes()), path.name) for path in files],
+    }
+    if args.batch_size:
+        data["batch_size"] = str(args.batch_size)
+    if args.concurrency:
+        data["max_concurrency"] = str(args.concurrency)
+
+    client = module.app.test_client()
+    started = time.perf_counter()
+    response = client.post("/bulk-scan", data=data, content_type="multipart/form-data", buffered=False)
+    if response.status_code != 200:
+        raise RuntimeError(f"/bulk-scan returned {response.status_code}: {response.get_data(as_text=True)[:300]}")
+
+    latencies = []
+    failed = 0
+    buffered = b""
+    for chunk in response.response:
+        now = time.perf_counter()
+        buffered += chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
+        *lines, buffered = buffered.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            frame = json.loads(line)
+            if frame["type"] == "result":
+                latencies.append(now - started)
+            elif frame["type"] == "failure":
+                failed += 1
+            elif frame["type"] == "error":
+                raise RuntimeError(f"/bulk-scan stream error: {frame.get('error')}")
+    response.close()
+    return {"seconds": time.perf_counter() - started, "latencies": latencies, "failed": failed}
+
+
+def _run_scan(module, files: list, job_description: str, args) -> dict:
+    app = module.app
+    payloads = [(path.name, path.read_bytes()) for path in files]
+
+    def scan_one(payload):
+        name, data = payload
+        began = time.perf_counter()
+        response = app.test_client().post(
+            "/scan",
+            data={"job_description": job_description, "resume": (io.BytesIO(data), name)},
+            content_type="multipart/form-data",
+        )
+        return response.status_code == 200, time.perf_counter() - began
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency or 8) as executor:
+        outcomes = list(executor.map(scan_one, payloads))
+    return {
+        "seconds": time.perf_counter() - started,
+        "latencies": [latency for ok, latency in outcomes if ok],
+        "failed": sum(1 for ok, _ in outcomes if not ok),
+    }
+
+
+def run_worker(args) -> dict:
+    from corpus import generate_corpus
+
+    workdir = Path(tempfile.mkdtemp(prefix="resume-bench-"))
+    _prepare_environment(workdir, args.cache)
+    files = generate_corpus(workdir / "corpus", args.size, tuple(args.formats), args.seed)
+    job_description = (workdir / "corpus" / "job_description.txt").read_text(encoding="utf-8")
+
+    provider_process, base_url = _start_provider(args)
+    try:
+        module = importlib.import_module(APP_MODULES[args.app])
+        _point_at_provider(module, base_url, args.provider)
+        timer = StageTimer()
+        _instrument(module, timer)
+
+        run = (_run_bulk if args.app == "bulk" else _run_scan)(module, files, job_description, args)
+        with urllib.request.urlopen(f"{base_url}/stats") as stats:
+            provider_stats = json.load(stats)
+    finally:
+        provider_process.terminate()
+        provider_process.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = run["latencies"]
+    return {
+        "app": args.app,
+        "files": args.size,
+        "seconds": round(run["seconds"], 3),
+        "resumes_per_sec": round(len(latencies) / run["seconds"], 2) if run["seconds"] else None,
+        "processed": len(latencies),
+        "failed": run["failed"],
+        "p50_ms": _ms(percentile(latencies, 0.50)),
+        "p95_ms": _ms(percentile(latencies, 0.95)),
+        "p99_ms": _ms(percentile(latencies, 0.99)),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.snapshot(),
+        "provider": provider_stats,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _worker_command(args, app: str, size: int) -> list:
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--worker", "--app", app, "--size", str(size),
+        "--provider", args.provider, "--formats", *args.formats, "--seed", str(args.seed),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+        "--retry-after", str(args.retry_after), "--tokens-per-second", str(args.tokens_per_second),
+        "--batch-size", str(args.batch_size), "--concurrency", str(args.concurrency),
+    ]
+    if args.cache:
+        command.append("--cache")
+    return command
+
+
+def _regressions(results: list, baseline: list, tolerance: float) -> list:
+    previous = {(row["app"], row["files"]): row for row in baseline}
+    problems = []
+    for row in results:
+        before = previous.get((row["app"], row["files"]))
+        if not before:
+            continue
+        label = f"{row['app']}/{row['files']}"
+        if before.get("resumes_per_sec") and row["resumes_per_sec"] is not None:
+            if row["resumes_per_sec"] < before["resumes_per_sec"] * (1 - tolerance):
+                problems.append(f"{label}: throughput {before['resumes_per_sec']} -> {row['resumes_per_sec']} resumes/s")
+        if before.get("p95_ms") and row["p95_ms"] is not None:
+            if row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                problems.append(f"{label}: p95 {before['p95_ms']} -> {row['p95_ms']} ms")
+    return problems
+
+
+def _print_table(results: list):
+    print(f"\n{'app':<5} {'files':>6} {'sec':>8} {'res/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'failed':>7} {'RSS MB':>7}  stages (s)")
+    for row in results:
+        stages = ", ".join(f"{stage}={value['seconds']}" for stage, value in row["stages"].items())
+        print(
+            f"{row['app']:<5} {row['files']:>6} {row['seconds']:>8} {row['resumes_per_sec']!s:>8} "
+            f"{row['p50_ms']!s:>9} {row['p95_ms']!s:>9} {row['p99_ms']!s:>9} {row['failed']:>7} "
+            f"{row['peak_rss_mb']!s:>7}  {stages}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", default=["bulk", "scan"], choices=sorted(APP_MODULES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--provider", default="perplexity", choices=["perplexity", "openai"],
+                        help="perplexity exercises chat.completions, openai exercises responses")
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx", "txt"], choices=["pdf", "docx", "txt"])
+    parser.add_argument("--batch-size", type=int, default=0, help="bulk only; 0 keeps the app default")
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="bulk max_concurrency / parallel /scan requests; 0 keeps the default")
+    parser.add_argument("--cache", action="store_true", help="leave the analysis and extraction caches on")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--app", choices=sorted(APP_MODULES), help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = []
+    for app in args.apps:
+        for size in args.sizes:
+            print(f"Running {app} with {size} files...", file=sys.stderr)
+            completed = subprocess.run(_worker_command(args, app, size), cwd=str(ROOT), capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(completed.stderr[-2000:], file=sys.stderr)
+                sys.exit(f"Benchmark {app}/{size} failed.")
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    _print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        problems = _regressions(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    options TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    path TEXT,
+    status TEXT NOT NULL,
+    claimed_at REAL,
+    claimed_by TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    match_score INTEGER,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS job_items_status ON job_items (job_id, status);
+CREATE TABLE IF NOT EXISTS job_fingerprints (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    fingerprint BLOB NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+# Columns added after the first release, for databases created before them.
+MIGRATIONS = {
+    "claimed_by": "ALTER TABLE job_items ADD COLUMN claimed_by TEXT",
+    "attempts": "ALTER TABLE job_items ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+}
+MAX_ATTEMPTS = 3
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class BulkJobStore:
+    """File-backed bulk-scan queue: one SQLite row per resume, checkpointed as it finishes."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "jobs.sqlite3"
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(job_items)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(statement)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create_job(self, job_description: str, uploads, options=None) -> str:
+        job_id = uuid.uuid4().hex
+        job_dir = self.root / job_id
+        job_dir.mkdir()
+
+        items = []
+        for idx, (file_name, stream) in enumerate(uploads, start=1):
+            path = job_dir / f"{idx:05d}"
+            with open(path, "wb") as target:
+                shutil.copyfileobj(stream, target)
+            items.append((job_id, idx, file_name, str(path), "pending"))
+
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO jobs (id, status, job_description, options, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "queued", job_description, json.dumps(options or {}), len(items), _now()),
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, file_name, path, status) VALUES (?, ?, ?, ?, ?)",
+                items,
+            )
+        return job_id
+
+    def has_unfinished_jobs(self) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM jobs WHERE status IN ('queued', 'running') LIMIT 1"
+        ).fetchone()
+        return row is not None
+
+    def _release(self, condition: str, params: tuple, max_attempts: int) -> set:
+        # Hands matching running items back to the queue, except those that
+        # have already been tried max_attempts times, which fail instead.
+        # Returns the IDs of jobs that had items failed.
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            exhausted = conn.execute(
+                f"SELECT DISTINCT job_id FROM job_items WHERE status = 'running' AND {condition} AND attempts >= ?",
+                params + (max_attempts,),
+            ).fetchall()
+            conn.execute(
+                f"UPDATE job_items SET status = 'failed', error = ?, path = NULL "
+                f"WHERE status = 'running' AND {condition} AND attempts >= ?",
+                (f"Gave up after {max_attempts} attempts.",) + params + (max_attempts,),
+            )
+            conn.execute(
+                f"UPDATE job_items SET status = 'pending', claimed_at = NULL, claimed_by = NULL "
+                f"WHERE status = 'running' AND {condition}",
+                params,
+            )
+        return {row["job_id"] for row in exhausted}
+
+    def release_stale(self, lease_seconds: float, max_attempts: int = MAX_ATTEMPTS) -> set:
+        # Items claimed by a worker that died are handed back to the queue.
+        return self._release("claimed_at < ?", (time.time() - lease_seconds,), max_attempts)
+
+    def release_abandoned(self, host: str, is_alive, max_attempts: int = MAX_ATTEMPTS) -> set:
+        """Releases items claimed on this host by processes that no longer
+        exist, without waiting for their lease to run out."""
+        owners = self._connect().execute(
+            "SELECT DISTINCT claimed_by FROM job_items WHERE status = 'running' AND claimed_by LIKE ?",
+            (f"{host}:%",),
+        ).fetchall()
+        failed_jobs = set()
+        for (owner,) in owners:
+            pid = owner.rsplit(":", 1)[1]
+            if pid.isdigit() and not is_alive(int(pid)):
+                failed_jobs |= self._release("claimed_by = ?", (owner,), max_attempts)
+        return failed_jobs
+
+    def claim_items(self, limit: int, owner: str = None):
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT job_id FROM job_items WHERE status = 'pending' ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None, []
+
+            job_id = row["job_id"]
+            items = conn.execute(
+                "SELECT idx, file_name, path FROM job_items WHERE job_id = ? AND status = 'pending' ORDER BY idx LIMIT ?",
+                (job_id, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE job_items SET status = 'running', claimed_at = ?, claimed_by = ?, attempts = attempts + 1 "
+                "WHERE job_id = ? AND idx = ?",
+                [(time.time(), owner, job_id, item["idx"]) for item in items],
+            )
+            conn.execute("UPDATE jobs SET status = 'running' WHERE id = ? AND status = 'queued'", (job_id,))
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        return self._job_dict(job), [dict(item) for item in items]
+
+    def record_item(self, job_id: str, idx: int, row=None, error=None):
+        conn = self._connect()
+        if error is None:
+            conn.execute(
+                "UPDATE job_items SET status = 'processed', match_score = ?, result = ?, path = NULL WHERE job_id = ? AND idx = ?",
+                (row.get("match_score", 0), json.dumps(row), job_id, idx),
+            )
+        else:
+            conn.execute(
+                "UPDATE job_items SET status = 'failed', error = ?, path = NULL WHERE job_id = ? AND idx = ?",
+                (error, job_id, idx),
+            )
+        spooled = self.root / job_id / f"{idx:05d}"
+        if spooled.exists():
+            spooled.unlink()
+
+    def get_items(self, job_id: str, idxs) -> dict:
+        """{idx: {"status", "result", "error"}} for the given items."""
+        idxs = list(idxs)
+        items = {}
+        conn = self._connect()
+        for start in range(0, len(idxs), 500):
+            chunk = idxs[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for item in conn.execute(
+                f"SELECT idx, status, result, error FROM job_items WHERE job_id = ? AND idx IN ({placeholders})",
+                [job_id] + chunk,
+            ):
+                items[item["idx"]] = {
+                    "status": item["status"],
+                    "result": json.loads(item["result"]) if item["result"] else None,
+                    "error": item["error"],
+                }
+        return items
+
+    def save_fingerprints(self, job_id: str, fingerprints):
+        # Per-item blobs a handler needs across claims, e.g. the shingles of
+        # each near-duplicate representative seen so far.
+        self._connect().executemany(
+            "INSERT OR REPLACE INTO job_fingerprints (job_id, idx, fingerprint) VALUES (?, ?, ?)",
+            [(job_id, idx, fingerprint) for idx, fingerprint in fingerprints],
+        )
+
+    def load_fingerprints(self, job_id: str) -> list:
+        return [
+            (row["idx"], row["fingerprint"])
+            for row in self._connect().execute(
+                "SELECT idx, fingerprint FROM job_fingerprints WHERE job_id = ? ORDER BY idx", (job_id,)
+            )
+        ]
+
+    def finish_if_done(self, job_id: str) -> bool:
+        conn = self._connect()
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN ('pending', 'running')",
+            (job_id,),
+        ).fetchone()[0]
+        if remaining:
+            return False
+
+        updated = conn.execute(
+            "UPDATE jobs SET status = 'completed', finished_at = ? WHERE id = ? AND status != 'completed'",
+            (_now(), job_id),
+        ).rowcount
+        conn.execute("DELETE FROM job_fingerprints WHERE job_id = ?", (job_id,))
+        shutil.rmtree(self.root / job_id, ignore_errors=True)
+        return updated > 0
+
+    def get_job(self, job_id: str):
+        conn = self._connect()
+        job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None:
+            return None
+
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status",
+            (job_id,),
+        ).fetchall())
+        results = [
+            json.loads(item["result"])
+            for item in conn.execute(
+                "SELECT result FROM job_items WHERE job_id = ? AND status = 'processed' ORDER BY match_score DESC, idx",
+                (job_id,),
+            )
+        ]
+        failures = [
+            {"file_name": item["file_name"], "error": item["error"]}
+            for item in conn.execute(
+                "SELECT file_name, error FROM job_items WHERE job_id = ? AND status = 'failed' ORDER BY idx",
+                (job_id,),
+            )
+        ]
+
+        details = self._job_dict(job)
+        details.update({
+            "processed": counts.get("processed", 0),
+            "failed": counts.get("failed", 0),
+            "pending": counts.get("pending", 0) + counts.get("running", 0),
+            "results": results,
+            "failures": failures,
+        })
+        return details
+
+    @staticmethod
+    def _job_dict(job) -> dict:
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "job_description": job["job_description"],
+            "options": json.loads(job["options"]),
+            "total_uploaded": job["total"],
+            "created_at": job["created_at"],
+            "finished_at": job["finished_at"],
+        }
+
+
+class BulkJobRunner:
+    """Background thread that drains BulkJobStore, a batch of items at a time."""
+
+    def __init__(self, store: BulkJobStore, handler, on_complete=None, batch_size: int = 32,
+                 poll_interval: float = 2.0, lease_seconds: float = 900):
+        # handler(job, items) yields (idx, row, error) as each item finishes.
+        self.store = store
+        self.handler = handler
+        self.on_complete = on_complete
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bulk-job-runner", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # The process exists but belongs to another user.
+            pass
+        return True
+
+    def _finish(self, job_id: str):
+        if self.store.finish_if_done(job_id) and self.on_complete:
+            self.on_complete(self.store.get_job(job_id))
+
+    def _release_abandoned(self):
+        # Items left running by an earlier process on this host (a restart or
+        # a crashed worker) go back to the queue straight away.
+        try:
+            # This process has not claimed anything yet, so items under its own
+            # PID were left by an earlier process that had the same PID.
+            def is_alive(pid):
+                return pid != os.getpid() and self._pid_alive(pid)
+
+            for job_id in self.store.release_abandoned(socket.gethostname(), is_alive):
+                self._finish(job_id)
+        except Exception:
+            logger.exception("Could not release abandoned bulk job items; they wait for their lease to expire")
+
+    def _run(self):
+        self._release_abandoned()
+        while True:
+            self._wake.clear()
+            try:
+                worked = self.run_once()
+            except Exception:
+                worked = False
+            if not worked:
+                self._wake.wait(self.poll_interval)
+
+    def run_once(self) -> bool:
+        for job_id in self.store.release_stale(self.lease_seconds):
+            self._finish(job_id)
+        job, items = self.store.claim_items(self.batch_size, self.owner)
+        if job is None:
+            return False
+
+        # A handler that fails partway fails the rest of its batch instead of
+        # leaving it to be claimed again forever.
+        unrecorded = {item["idx"] for item in items}
+        try:
+            for idx, row, error in self.handler(job, items):
+                self.store.record_item(job["job_id"], idx, row=row, error=error)
+                unrecorded.discard(idx)
+        except Exception as exc:
+            for idx in sorted(unrecorded):
+                self.store.record_item(job["job_id"], idx, error=f"Could not process this resume: {exc}")
+
+        self._finish(job["job_id"])
+        return True
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from prescreen import score_resumes, tokenize
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    candidate_id INTEGER PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    file_name TEXT NOT NULL,
+    resume_text BLOB NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    times_seen INTEGER NOT NULL DEFAULT 1,
+    last_analysis TEXT
+);
+CREATE INDEX IF NOT EXISTS candidates_last_seen ON candidates (last_seen);
+"""
+# Contentless: the text already lives (compressed) in candidates, so the FTS
+# table only keeps its inverted index.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts USING fts5(
+    resume_text, content='', tokenize='porter unicode61'
+);
+"""
+MAX_QUERY_TERMS = 40
+WHITESPACE = re.compile(r"\s+")
+
+
+def _text_hash(resume_text: str) -> str:
+    normalized = WHITESPACE.sub(" ", resume_text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _phrase(term: str) -> str:
+    return '"' + term.replace('"', "") + '"'
+
+
+def job_title(job_description: str) -> str:
+    for line in (job_description or "").splitlines():
+        if line.strip():
+            return line.strip()[:120]
+    return ""
+
+
+class CandidateIndex:
+    """Every resume seen by a bulk scan, searchable across runs.
+
+    Resumes are keyed by a hash of their whitespace-normalized text, so an
+    applicant uploaded again updates their existing entry. Search narrows the
+    index with an FTS5 BM25 query built from the JD's terms and re-ranks that
+    pool with the same TF-IDF score the bulk prescreen uses.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to scanning the
+            # most recently seen candidates.
+            self.full_text = False
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add_many(self, entries) -> list:
+        """Indexes (file_name, resume_text) pairs in one transaction and
+        returns their candidate IDs."""
+        conn = self._connect()
+        now = time.time()
+        candidate_ids = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for file_name, resume_text in entries:
+                text_hash = _text_hash(resume_text)
+                row = conn.execute("SELECT candidate_id FROM candidates WHERE text_hash = ?", (text_hash,)).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE candidates SET file_name = ?, last_seen = ?, times_seen = times_seen + 1 "
+                        "WHERE candidate_id = ?",
+                        (file_name, now, row[0]),
+                    )
+                    candidate_ids.append(row[0])
+                    continue
+
+                candidate_id = conn.execute(
+                    "INSERT INTO candidates (text_hash, file_name, resume_text, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (text_hash, file_name, zlib.compress(resume_text.encode("utf-8"), 6), now, now),
+                ).lastrowid
+                if self.full_text:
+                    conn.execute("INSERT INTO candidate_fts (rowid, resume_text) VALUES (?, ?)", (candidate_id, resume_text))
+                candidate_ids.append(candidate_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return candidate_ids
+
+    def record_analyses(self, scan_id: str, job_description: str, rows, timestamp: str = None):
+        # Keeps the latest AI analysis of each candidate for search results.
+        updates = [
+            (json.dumps({
+                "scan_id": scan_id,
+                "job_title": job_title(job_description),
+                "match_score": row.get("match_score", 0),
+                "summary": row.get("summary", ""),
+                "analyzed_at": timestamp,
+            }), row["candidate_id"])
+            for row in rows
+            if row.get("candidate_id") is not None and row.get("status") == "processed"
+        ]
+        if updates:
+            self._connect().executemany("UPDATE candidates SET last_analysis = ? WHERE candidate_id = ?", updates)
+
+    def delete(self, candidate_id: int) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT resume_text FROM candidates WHERE candidate_id = ?", (candidate_id,)).fetchone()
+            if row is not None:
+                if self.full_text:
+                    conn.execute(
+                        "INSERT INTO candidate_fts (candidate_fts, rowid, resume_text) VALUES ('delete', ?, ?)",
+                        (candidate_id, zlib.decompress(row[0]).decode("utf-8")),
+                    )
+                conn.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def texts(self, candidate_ids) -> dict:
+        """{candidate_id: resume_text} for the IDs still in the index."""
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        texts = {}
+        conn = self._connect()
+        # Stays under SQLite's bound-parameter limit.
+        for start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for candidate_id, resume_text in conn.execute(
+                f"SELECT candidate_id, resume_text FROM candidates WHERE candidate_id IN ({placeholders})", chunk
+            ):
+                texts[candidate_id] = zlib.decompress(resume_text).decode("utf-8")
+        return texts
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def _match_expression(self, job_description: str, query: str) -> str:
+        # Every keyword in query must match; any of the JD's most frequent
+        # terms may.
+        clauses = []
+        keywords = list(dict.fromkeys(tokenize(query)))
+        if keywords:
+            clauses.append(" AND ".join(_phrase(term) for term in keywords))
+        jd_terms = [term for term, _ in Counter(tokenize(job_description)).most_common(MAX_QUERY_TERMS)]
+        if jd_terms:
+            clauses.append(" OR ".join(_phrase(term) for term in jd_terms))
+        return " AND ".join(f"({clause})" for clause in clauses)
+
+    def _pool(self, job_description: str, query: str, pool_size: int):
+        conn = self._connect()
+        columns = "candidate_id, file_name, resume_text, times_seen, last_seen, last_analysis"
+        if not self.full_text:
+            rows = conn.execute(
+                f"SELECT {columns} FROM candidates ORDER BY last_seen DESC LIMIT ?", (pool_size,)
+            ).fetchall()
+            keywords = set(tokenize(query))
+            matched = [
+                row for row in rows
+                if keywords.issubset(tokenize(zlib.decompress(row[2]).decode("utf-8")))
+            ]
+            return matched, len(matched)
+
+        expression = self._match_expression(job_description, query)
+        if not expression:
+            return [], 0
+        ranked = conn.execute(
+            "SELECT rowid FROM candidate_fts WHERE candidate_fts MATCH ? ORDER BY bm25(candidate_fts) LIMIT ?",
+            (expression, pool_size),
+        ).fetchall()
+        matched = conn.execute(
+            "SELECT COUNT(*) FROM candidate_fts WHERE candidate_fts MATCH ?", (expression,)
+        ).fetchone()[0]
+        order = {candidate_id: rank for rank, (candidate_id,) in enumerate(ranked)}
+        if not order:
+            return [], matched
+        placeholders = ",".join("?" * len(order))
+        rows = conn.execute(
+            f"SELECT {columns} FROM candidates WHERE candidate_id IN ({placeholders})", list(order)
+        ).fetchall()
+        rows.sort(key=lambda row: order[row[0]])
+        return rows, matched
+
+    def search(self, job_description: str = "", query: str = "", limit: int = 20, pool_size: int = 200) -> dict:
+        """Best matches for a JD and/or keyword query.
+
+        Returns {"matched", "results"}; each result carries the candidate's
+        resume_text so callers can send it on for AI analysis.
+        """
+        rows, matched = self._pool(job_description, query, max(limit, pool_size))
+        texts = [zlib.decompress(row[2]).decode("utf-8") for row in rows]
+        scores = score_resumes(job_description, texts) if job_description.strip() else [None] * len(rows)
+
+        results = []
+        for bm25_rank, (row, resume_text, score) in enumerate(zip(rows, texts, scores)):
+            results.append({
+                "candidate_id": row[0],
+                "file_name": row[1],
+                "resume_text": resume_text,
+                "local_score": score,
+                "bm25_rank": bm25_rank + 1,
+                "times_seen": row[3],
+                "last_seen": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row[4])),
+                "last_analysis": json.loads(row[5]) if row[5] else None,
+            })
+        if job_description.strip():
+            results.sort(key=lambda item: (-item["local_score"], item["bm25_rank"]))
+        return {"matched": matched, "results": results[:limit]}
+
+
+def candidate_index_from_env(default_path) -> CandidateIndex:
+    return CandidateIndex(os.getenv("CANDIDATE_INDEX_PATH") or default_path)
@@ -1,31 +1,41 @@
 import os
-import csv
+import heapq
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
 from pathlib import Path
-from io import BytesIO, StringIO
+from queue import Queue
 from datetime import datetime
 
-from flask import Flask, request, jsonify, send_file
-from pypdf import PdfReader
+from flask import Flask, Response, request, jsonify, stream_with_context, url_for
 from openai import OpenAI, AuthenticationError, BadRequestError, APIStatusError
 from dotenv import load_dotenv
 
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+from analysis_cache import analysis_cache_from_env
+import metrics
+from archive_ingest import is_archive, iter_archive_members
+from bulk_jobs import BulkJobStore, BulkJobRunner
+from candidate_index import candidate_index_from_env, job_title
+from near_duplicates import NearDuplicateIndex, find_near_duplicates, pack_shingles, shingles, unpack_shingles
+from pdf_report import iter_pdf
+from prescreen import score_matrix, score_resumes, shortlist, tokenize
+from ranking import TopK, rank_key
+from prompt_budget import JD_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, compact_text
+from provider_dispatch import EmptyResponseError, dispatcher_from_env
+from report_export import EXCEL_AVAILABLE, iter_csv, iter_xlsx
+from result_store import result_store_from_env
+from static_assets import AssetCache
+from text_extraction import text_extractor_from_env
+from upload_spool import UploadError, iter_spooled_parts
 
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(dotenv_path=BASE_DIR / ".env", override=True)
 
 app = Flask(__name__)
-
-last_bulk_analysis = {
-    "timestamp": None,
-    "job_description": "",
-    "results": [],
-}
+pages = AssetCache(BASE_DIR)
+pages.preload("company_index.html")
 
 
 def _clean_env_key(value: str) -> str:
@@ -52,37 +62,70 @@ pplx_api_key = _clean_env_key(os.getenv("PPLX_API_KEY"))
 openai_api_key = _clean_env_key(os.getenv("OPENAI_API_KEY"))
 
 
+pplx_base_url = os.getenv("PPLX_BASE_URL") or "https://api.perplexity.ai"
+
+
 def _build_clients():
+    # Retries are owned by the provider dispatcher, not the SDK.
     available = []
     if _is_real_api_key(pplx_api_key):
-        available.append(("perplexity", OpenAI(api_key=pplx_api_key, base_url="https://api.perplexity.ai")))
+        available.append(("perplexity", OpenAI(api_key=pplx_api_key, base_url=pplx_base_url, max_retries=0)))
     if _is_real_api_key(openai_api_key):
-        available.append(("openai", OpenAI(api_key=openai_api_key)))
+        available.append(("openai", OpenAI(api_key=openai_api_key, max_retries=0)))
     return available
 
 
 clients = _build_clients()
+dispatcher = dispatcher_from_env()
 
+PROVIDER_MODELS = {"perplexity": "sonar-pro", "openai": "gpt-4.1-mini"}
+ANALYSIS_PROMPT_VERSION = "bulk-v1"
+BATCH_PROMPT_VERSION = "bulk-batch-v1"
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET") or 12000)
+BATCH_SIZE_LIMIT = 20
+analysis_cache = analysis_cache_from_env(BASE_DIR / "data" / "analysis_cache.sqlite3")
+text_extractor = text_extractor_from_env(BASE_DIR / "data" / "extraction_cache.sqlite3")
 
-def extract_resume_text(file_storage):
-    filename = (file_storage.filename or "").lower()
+# Finished runs live in a shared store keyed by scan ID, so exports work from
+# any worker process and concurrent users never see each other's results.
+result_store = result_store_from_env(BASE_DIR / "data" / "results.sqlite3")
+SCAN_ID_COOKIE = "bulk_scan_id"
+
+# Every scanned resume is also kept in a persistent candidate index, so a new
+# JD can be matched against past applicants without uploading them again.
+candidate_index = candidate_index_from_env(BASE_DIR / "data" / "candidates.sqlite3")
+CANDIDATE_SEARCH_LIMIT = 200
 
-    if filename.endswith(".pdf"):
-        reader = PdfReader(file_storage)
-        text = []
-        for page in reader.pages:
-            text.append(page.extract_text() or "")
-        return "\n".join(text).strip()
+# A re-scan after a JD edit only re-analyzes resumes whose estimated score
+# lands within RESCAN_MARGIN points of the top-K cutoff.
+RESCAN_TOP_K = int(os.getenv("RESCAN_TOP_K") or 10)
+RESCAN_MARGIN = float(os.getenv("RESCAN_MARGIN") or 10)
+JD_DIFF_TERMS = 50
 
-    if filename.endswith(".txt"):
-        return file_storage.read().decode("utf-8", errors="ignore").strip()
+# Matrix mode scores one uploaded pool against many roles at once.
+MAX_MATRIX_ROLES = 50
+MATRIX_TOP_K = int(os.getenv("MATRIX_TOP_K") or 10)
 
-    if filename.endswith(".docx") and DOCX_AVAILABLE:
-        file_storage.stream.seek(0)
-        doc = Document(file_storage.stream)
-        return "\n".join([p.text for p in doc.paragraphs]).strip()
+BULK_MAX_CONCURRENCY = int(os.getenv("BULK_MAX_CONCURRENCY") or 8)
+BULK_CONCURRENCY_LIMIT = 32
+MAX_BULK_RESUMES = 1000
+EXTRACTION_CHUNK_SIZE = 64
+SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+SPOOL_QUEUE_SIZE = int(os.getenv("UPLOAD_SPOOL_QUEUE_SIZE") or 16)
+MAX_UPLOAD_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_MB") or 20) * 1024 * 1024
+BULK_STREAM_FORMATS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+# Streamed result frames carry their rank among the best STREAM_TOP_K rows
+# so far; stored runs are read back a page at a time.
+STREAM_TOP_K = int(os.getenv("STREAM_TOP_K") or 50)
+RESULTS_PAGE_SIZE = 50
+MAX_RESULTS_PAGE_SIZE = 200
+RESULT_SORT_FIELDS = ("rank", "match_score", "local_score", "file_name")
+BULK_JOBS_DIR = Path(os.getenv("BULK_JOBS_DIR") or BASE_DIR / "data" / "bulk_jobs")
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD") or 0.8)
 
-    return ""
+
+def extract_resume_text(file_storage):
+    return text_extractor.extract(file_storage.filename or "", file_storage.read())
 
 
 def _safe_json_parse(text: str):
@@ -99,8 +142,127 @@ def _safe_json_parse(text: str):
         return None
 
 
-def analyze_resume(resume_text: str, job_description: str):
-    prompt = f"""
+def _normalize_parsed(parsed: dict, output_text: str) -> dict:
+    score = parsed.get("match_score", 0)
+    try:
+        score = int(score)
+    except Exception:
+        score = 0
+
+    return {
+        "match_score": max(0, min(score, 100)),
+        "strengths": parsed.get("strengths", []) if isinstance(parsed.get("strengths", []), list) else [],
+        "missing_keywords": parsed.get("missing_keywords", []) if isinstance(parsed.get("missing_keywords", []), list) else [],
+        "improvement_suggestions": parsed.get("improvement_suggestions", []) if isinstance(parsed.get("improvement_suggestions", []), list) else [],
+        "summary": str(parsed.get("summary", "")).strip(),
+        "raw_analysis": output_text,
+    }
+
+
+def _normalize_analysis(output_text: str):
+    parsed = _safe_json_parse(output_text)
+    if parsed:
+        return _normalize_parsed(parsed, output_text), True
+
+    return {
+        "match_score": 0,
+        "strengths": [],
+        "missing_keywords": [],
+        "improvement_suggestions": [],
+        "summary": output_text[:500],
+        "raw_analysis": output_text,
+    }, False
+
+
+def _safe_json_array_parse(text: str):
+    try:
+        parsed = json.loads(text)
+    except Exception:
+        start = text.find("[")
+        end = text.rfind("]")
+        if start == -1 or end <= start:
+            return None
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except Exception:
+            return None
+    if isinstance(parsed, dict):
+        parsed = parsed.get("results")
+    return parsed if isinstance(parsed, list) else None
+
+
+def _cache_keys(prompt_version: str, resume_text: str, job_description: str) -> dict:
+    return {
+        active_provider: analysis_cache.make_key(
+            prompt_version, active_provider, PROVIDER_MODELS.get(active_provider, ""),
+            resume_text, job_description,
+        )
+        for active_provider, _ in clients
+    }
+
+
+def _request_completion(active_provider: str, active_client, prompt: str) -> str:
+    if active_provider == "perplexity":
+        with metrics.provider_call(active_provider):
+            response = active_client.chat.completions.create(
+                model=PROVIDER_MODELS["perplexity"],
+                messages=[
+                    {"role": "system", "content": "You are an ATS and recruiting assistant."},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+        output_text = (response.choices[0].message.content or "").strip()
+    else:
+        with metrics.provider_call(active_provider):
+            response = active_client.responses.create(
+                model=PROVIDER_MODELS["openai"],
+                input=prompt,
+            )
+        output_text = (response.output_text or "").strip()
+    metrics.record_usage(active_provider, response)
+
+    # Raising lets the dispatcher fall back (or a hedge keep waiting) instead
+    # of an empty answer counting as a result.
+    if not output_text:
+        raise EmptyResponseError(f"{active_provider} returned an empty response.")
+    return output_text
+
+
+def _complete(prompt: str):
+    # Sends the prompt down the provider fallback chain and returns
+    # (provider, output_text).
+    with metrics.stage("provider"):
+        return dispatcher.call(
+            clients,
+            lambda active_provider, active_client: _request_completion(active_provider, active_client, prompt),
+            _estimate_tokens(prompt),
+        )
+
+
+@lru_cache(maxsize=32)
+def _compact_job_description(job_description: str):
+    return compact_text(job_description, JD_TOKEN_BUDGET)
+
+
+def _compact_inputs(resume_text: str, job_description: str):
+    # Cleans both documents and trims them to their token budgets; the JD is
+    # compacted once per run, not once per resume.
+    with metrics.stage("compact"):
+        jd = _compact_job_description(job_description)
+        return compact_text(resume_text, RESUME_TOKEN_BUDGET, jd.text), jd
+
+
+def analyze_resume(resume_text: str, job_description: str, use_cache: bool = True):
+    resume, jd = _compact_inputs(resume_text, job_description)
+    cache_keys = _cache_keys(ANALYSIS_PROMPT_VERSION, resume.text, jd.text)
+    if use_cache:
+        with metrics.stage("cache"):
+            cached = analysis_cache.get(*cache_keys.values())
+        if cached is not None:
+            return cached
+
+    with metrics.stage("prompt"):
+        prompt = f"""
 Compare this resume against the job description.
 Return ONLY valid JSON with keys:
 - match_score (integer 0-100)
@@ -110,81 +272,780 @@ Return ONLY valid JSON with keys:
 - summary (2-3 lines)
 
 Resume:
-{resume_text}
+{resume.text}
+
+Job Description:
+{jd.text}
+"""
+
+    metrics.record_prompt_tokens(resume.original_tokens + jd.original_tokens, resume.tokens + jd.tokens)
+    active_provider, output_text = _complete(prompt)
+    with metrics.stage("parse"):
+        analysis, parsed = _normalize_analysis(output_text)
+    if parsed:
+        analysis_cache.put(cache_keys[active_provider], analysis)
+    return analysis
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text or "") // 4 + 1
+
+
+def analyze_resume_batch(items: list, job_description: str, use_cache: bool = True) -> list:
+    # items: [(key, resume_text)]. Packs every uncached resume into a single
+    # prompt that shares one copy of the JD; any resume the model leaves out
+    # or answers malformed falls back to its own analyze_resume call.
+    outcomes = {}
+    cache_keys = {}
+    compacted = {}
+    uncached = []
+    for key, resume_text in items:
+        compacted[key], jd = _compact_inputs(resume_text, job_description)
+        cache_keys[key] = _cache_keys(BATCH_PROMPT_VERSION, compacted[key].text, jd.text)
+        if use_cache:
+            single_keys = _cache_keys(ANALYSIS_PROMPT_VERSION, compacted[key].text, jd.text)
+            with metrics.stage("cache"):
+                cached = analysis_cache.get(*single_keys.values(), *cache_keys[key].values())
+            if cached is not None:
+                outcomes[key] = (cached, None)
+                continue
+        uncached.append((key, resume_text))
+
+    if len(uncached) > 1:
+        with metrics.stage("prompt"):
+            sections = "\n\n".join(
+                f"=== Resume {position} ===\n{compacted[key].text}"
+                for position, (key, _) in enumerate(uncached, start=1)
+            )
+            prompt = f"""
+Compare each resume below against the job description.
+Return ONLY a valid JSON array with one object per resume, each with keys:
+- resume_id (the integer after "Resume")
+- match_score (integer 0-100)
+- strengths (array of 3 short bullet strings)
+- missing_keywords (array of up to 8 strings)
+- improvement_suggestions (array of 3 short bullet strings)
+- summary (2-3 lines)
 
 Job Description:
-{job_description}
+{jd.text}
+
+{sections}
 """
+        metrics.record_prompt_tokens(
+            jd.original_tokens + sum(compacted[key].original_tokens for key, _ in uncached),
+            jd.tokens + sum(compacted[key].tokens for key, _ in uncached),
+        )
+        try:
+            active_provider, output_text = _complete(prompt)
+            with metrics.stage("parse"):
+                parsed_items = _safe_json_array_parse(output_text) or []
+        except Exception:
+            parsed_items = []
 
-    auth_failures = 0
-    last_error = None
+        for parsed in parsed_items:
+            if not isinstance(parsed, dict):
+                continue
+            try:
+                position = int(parsed.get("resume_id"))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= position <= len(uncached) or "match_score" not in parsed:
+                continue
+            key = uncached[position - 1][0]
+            analysis = _normalize_parsed(parsed, json.dumps(parsed))
+            analysis_cache.put(cache_keys[key][active_provider], analysis)
+            outcomes[key] = (analysis, None)
 
-    for active_provider, active_client in clients:
+    for key, resume_text in uncached:
+        if key in outcomes:
+            continue
         try:
-            if active_provider == "perplexity":
-                response = active_client.chat.completions.create(
-                    model="sonar-pro",
-                    messages=[
-                        {"role": "system", "content": "You are an ATS and recruiting assistant."},
-                        {"role": "user", "content": prompt},
-                    ],
-                )
-                output_text = (response.choices[0].message.content or "").strip()
-            else:
-                response = active_client.responses.create(
-                    model="gpt-4.1-mini",
-                    input=prompt,
-                )
-                output_text = (response.output_text or "").strip()
-
-            parsed = _safe_json_parse(output_text)
-            if parsed:
-                score = parsed.get("match_score", 0)
-                try:
-                    score = int(score)
-                except Exception:
-                    score = 0
-
-                return {
-                    "match_score": max(0, min(score, 100)),
-                    "strengths": parsed.get("strengths", []) if isinstance(parsed.get("strengths", []), list) else [],
-                    "missing_keywords": parsed.get("missing_keywords", []) if isinstance(parsed.get("missing_keywords", []), list) else [],
-                    "improvement_suggestions": parsed.get("improvement_suggestions", []) if isinstance(parsed.get("improvement_suggestions", []), list) else [],
-                    "summary": str(parsed.get("summary", "")).strip(),
-                    "raw_analysis": output_text,
-                }
-
-            return {
-                "match_score": 0,
-                "strengths": [],
-                "missing_keywords": [],
-                "improvement_suggestions": [],
-                "summary": output_text[:500],
-                "raw_analysis": output_text,
-            }
-        except AuthenticationError:
-            auth_failures += 1
+            outcomes[key] = (analyze_resume(resume_text, job_description, use_cache), None)
+        except Exception as exc:
+            outcomes[key] = (None, str(exc))
+
+    return [(key, *outcomes[key]) for key, _ in items]
+
+
+def _pack_batches(pending, batch_size: int, token_budget: int):
+    # Greedily groups (key, resume_text) pairs into batches of at most
+    # batch_size resumes whose combined size stays under token_budget.
+    batch = []
+    batch_tokens = 0
+    for key, resume_text in pending:
+        tokens = _estimate_tokens(resume_text)
+        if RESUME_TOKEN_BUDGET > 0:
+            tokens = min(tokens, RESUME_TOKEN_BUDGET)
+        if batch and (len(batch) >= batch_size or batch_tokens + tokens > token_budget):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append((key, resume_text))
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _is_truthy(value) -> bool:
+    return str(value or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _max_concurrency(value):
+    try:
+        requested = int(value)
+    except (TypeError, ValueError):
+        requested = BULK_MAX_CONCURRENCY
+    return max(1, min(requested, BULK_CONCURRENCY_LIMIT))
+
+
+def _batch_size(value) -> int:
+    try:
+        requested = int(value)
+    except (TypeError, ValueError):
+        requested = 1
+    return max(1, min(requested, BATCH_SIZE_LIMIT))
+
+
+def _optional_number(value, cast):
+    try:
+        return cast(value) if str(value or "").strip() else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _duplicate_threshold(form):
+    # None (dedupe=0) analyzes every upload, near duplicates included.
+    if not _is_truthy(form.get("dedupe", "1")):
+        return None
+    threshold = _optional_number(form.get("dedupe_threshold"), float)
+    return NEAR_DUPLICATE_THRESHOLD if threshold is None else min(max(threshold, 0.1), 1.0)
+
+
+def _scan_options(form) -> dict:
+    return {
+        "max_concurrency": _max_concurrency(form.get("max_concurrency")),
+        "bypass_cache": _is_truthy(form.get("bypass_cache")),
+        "prescreen_top_n": _optional_number(form.get("prescreen_top_n"), int),
+        "prescreen_min_score": _optional_number(form.get("prescreen_min_score"), float),
+        "local_only": _is_truthy(form.get("local_only")),
+        "batch_size": _batch_size(form.get("batch_size")),
+        "timings": _is_truthy(form.get("timings")),
+        "dedupe_threshold": _duplicate_threshold(form),
+    }
+
+
+def _result_row(file_name: str, analysis: dict, local_score=None) -> dict:
+    row = {
+        "file_name": file_name,
+        "match_score": analysis.get("match_score", 0),
+        "summary": analysis.get("summary", ""),
+        "strengths": analysis.get("strengths", []),
+        "missing_keywords": analysis.get("missing_keywords", []),
+        "improvement_suggestions": analysis.get("improvement_suggestions", []),
+        "status": "processed",
+    }
+    if local_score is not None:
+        row["local_score"] = local_score
+    return row
+
+
+def _local_row(file_name: str, local_score: float, status: str) -> dict:
+    if status == "local":
+        summary = "Scored locally by keyword relevance; no AI analysis requested."
+        match_score = int(round(local_score))
+    else:
+        summary = "Not sent for AI analysis: local relevance score is below the shortlist cutoff."
+        match_score = 0
+    row = _result_row(file_name, {"match_score": match_score, "summary": summary}, local_score)
+    row["status"] = status
+    return row
+
+
+def _duplicate_row(row: dict, file_name: str, local_score=None, candidate_id=None) -> dict:
+    # A near duplicate is reported with its representative's result.
+    duplicate = dict(row, file_name=file_name, duplicate_of=row["file_name"], candidate_id=candidate_id)
+    if local_score is not None:
+        duplicate["local_score"] = local_score
+    return duplicate
+
+
+def _near_duplicates(pending: list, threshold) -> list:
+    # Representative position for every pending resume; with detection off
+    # each resume represents itself.
+    if threshold is None:
+        return list(range(len(pending)))
+    with metrics.stage("dedupe"):
+        return find_near_duplicates([resume_text for _, resume_text in pending], threshold)
+
+
+def _clusters(representatives: list) -> dict:
+    # representative position -> positions of its near duplicates
+    clusters = {}
+    for position, representative in enumerate(representatives):
+        if representative != position:
+            clusters.setdefault(representative, []).append(position)
+    return clusters
+
+
+def _analyze_group(group: list, job_description: str, use_cache: bool) -> list:
+    if len(group) > 1:
+        return analyze_resume_batch(group, job_description, use_cache)
+
+    key, resume_text = group[0]
+    try:
+        return [(key, analyze_resume(resume_text, job_description, use_cache), None)]
+    except Exception as exc:
+        return [(key, None, str(exc))]
+
+
+def _iter_analyses(pending, job_description: str, max_workers: int, use_cache: bool = True, batch_size: int = 1):
+    # Yields (key, analysis, error) in completion order while keeping at most
+    # max_workers provider calls in flight, each covering up to batch_size
+    # resumes.
+    groups = _pack_batches(pending, max(1, batch_size), BATCH_TOKEN_BUDGET)
+    in_flight = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit_next():
+            for group in groups:
+                in_flight.add(executor.submit(metrics.in_context(_analyze_group), group, job_description, use_cache))
+                return True
+            return False
+
+        while len(in_flight) < max_workers and submit_next():
+            pass
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                yield from future.result()
+                submit_next()
+
+
+def _extract_chunk(chunk: list):
+    with metrics.stage("extract"):
+        outcomes = text_extractor.extract_many([(file_name, data) for _, file_name, data in chunk])
+    for (key, file_name, _), (resume_text, error) in zip(chunk, outcomes):
+        if error is not None:
+            yield key, file_name, None, str(error)
+        elif not resume_text:
+            yield key, file_name, None, "Could not extract text (supported: PDF/TXT/DOCX)."
+        else:
+            yield key, file_name, resume_text, None
+
+
+def _extract_texts(uploads):
+    # uploads yields (key, file_name, data); text comes back as
+    # (key, file_name, resume_text, error), parsed a chunk at a time in the
+    # extraction process pool.
+    chunk = []
+    for upload in uploads:
+        chunk.append(upload)
+        if len(chunk) >= EXTRACTION_CHUNK_SIZE:
+            yield from _extract_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from _extract_chunk(chunk)
+
+
+def _read_uploads(resumes, failed: list):
+    # ZIP/tar uploads are expanded member by member straight from the upload
+    # stream; skipped members are recorded in failed with the reason.
+    index = 0
+    for position, resume_file in enumerate(resumes, start=1):
+        file_name = resume_file.filename or f"resume_{position}"
+        if not is_archive(file_name):
+            index += 1
+            yield (index, file_name), file_name, resume_file.read()
             continue
+
+        try:
+            for member_name, data, skip_reason in iter_archive_members(resume_file.stream, file_name, MAX_UPLOAD_FILE_BYTES):
+                entry_name = f"{file_name}/{member_name}"
+                if skip_reason is None and index >= MAX_BULK_RESUMES:
+                    skip_reason = f"run limit of {MAX_BULK_RESUMES} resumes reached"
+                if skip_reason is not None:
+                    failed.append({"file_name": entry_name, "error": f"Skipped: {skip_reason}."})
+                    continue
+                index += 1
+                yield (index, entry_name), entry_name, data
         except Exception as exc:
-            last_error = str(exc)
+            failed.append({"file_name": file_name, "error": f"Could not read archive: {exc}"})
+
+
+def _extract_uploads(resumes, failed: list):
+    # Yields ((index, file_name), resume_text); unreadable files are appended
+    # to failed.
+    for key, file_name, resume_text, error in _extract_texts(_read_uploads(resumes, failed)):
+        if error is not None:
+            failed.append({"file_name": file_name, "error": error})
+            continue
+        yield key, resume_text
+
+
+def _rank_results(results: list) -> list:
+    with metrics.stage("rank"):
+        results.sort(key=lambda item: rank_key(*item))
+        return [row for _, row in results]
+
+
+def _scan_events(pending: list, failed: list, job_description: str, options: dict, results: list):
+    # Yields ("result", row) or ("failure", failure) as each resume settles and
+    # collects (index, row) pairs into results for the final ranking.
+    for failure in failed:
+        yield "failure", failure
+
+    # Only one representative per near-duplicate cluster is shortlisted and
+    # analyzed; the others get a copy of its row when it settles.
+    representatives = _near_duplicates(pending, options["dedupe_threshold"])
+    clusters = _clusters(representatives)
+    cluster_ids = {representative: number for number, representative in enumerate(sorted(clusters), start=1)}
+    unique = [position for position, representative in enumerate(representatives) if representative == position]
+
+    with metrics.stage("index"):
+        candidate_ids = candidate_index.add_many([(file_name, resume_text) for (_, file_name), resume_text in pending])
+
+    with metrics.stage("prescreen"):
+        local_scores = score_resumes(job_description, [resume_text for _, resume_text in pending])
+    if options["prescreen_top_n"] is None and options["prescreen_min_score"] is None:
+        keep = set(unique)
+    else:
+        picked = shortlist([local_scores[position] for position in unique],
+                           options["prescreen_top_n"], options["prescreen_min_score"])
+        keep = {unique[rank] for rank in picked}
+
+    def settle(position, row):
+        row["candidate_id"] = candidate_ids[position]
+        if position in cluster_ids:
+            row["cluster_id"] = cluster_ids[position]
+        rows = [(pending[position][0][0], row)]
+        for duplicate in clusters.get(position, ()):
+            (index, file_name), _ = pending[duplicate]
+            rows.append((index, _duplicate_row(row, file_name, local_scores[duplicate], candidate_ids[duplicate])))
+        results.extend(rows)
+        return [("result", row) for _, row in rows]
+
+    to_analyze = []
+    for position in unique:
+        (index, file_name), resume_text = pending[position]
+        local_score = local_scores[position]
+        if options["local_only"] or position not in keep:
+            status = "local" if options["local_only"] else "screened_out"
+            yield from settle(position, _local_row(file_name, local_score, status))
+        else:
+            to_analyze.append(((position, file_name, local_score), resume_text))
+
+    analyses = _iter_analyses(
+        to_analyze, job_description, options["max_concurrency"], not options["bypass_cache"], options["batch_size"]
+    )
+    for (position, file_name, local_score), analysis, error in analyses:
+        if error is None:
+            yield from settle(position, _result_row(file_name, analysis, local_score))
+            continue
+        for member in [position] + clusters.get(position, []):
+            failure = {"file_name": pending[member][0][1], "error": error}
+            failed.append(failure)
+            yield "failure", failure
+
+
+def _duplicate_clusters(results_sorted: list) -> list:
+    clusters = {}
+    for row in results_sorted:
+        if "cluster_id" not in row:
+            continue
+        cluster = clusters.setdefault(row["cluster_id"], {"cluster_id": row["cluster_id"], "duplicates": []})
+        if row.get("duplicate_of"):
+            cluster["duplicates"].append(row["file_name"])
+        else:
+            cluster["representative"] = row["file_name"]
+            cluster["match_score"] = row.get("match_score", 0)
+    return [clusters[cluster_id] for cluster_id in sorted(clusters)]
+
+
+def _bulk_summary(scan_id: str, timestamp: str, total_files: int, results_sorted: list, failed: list) -> dict:
+    screened_out = sum(1 for row in results_sorted if row.get("status") == "screened_out")
+    timings = metrics.current_timings()
+    return {
+        "scan_id": scan_id,
+        "timestamp": timestamp,
+        "total_uploaded": total_files,
+        "processed": len(results_sorted) - screened_out,
+        "screened_out": screened_out,
+        "duplicates": sum(1 for row in results_sorted if row.get("duplicate_of")),
+        "failed": len(failed),
+        "top_candidates": results_sorted[:10],
+        "duplicate_clusters": _duplicate_clusters(results_sorted),
+        "prompt_tokens": timings.prompt_token_report() if timings is not None else None,
+    }
+
+
+def _remember_bulk_run(scan_id: str, job_description: str, results_sorted: list, timestamp=None) -> str:
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with metrics.stage("store"):
+        result_store.save(scan_id, "bulk", {
+            "timestamp": timestamp,
+            "job_description": job_description,
+            "results": results_sorted,
+        })
+    with metrics.stage("index"):
+        candidate_index.record_analyses(scan_id, job_description, results_sorted, timestamp)
+    return timestamp
+
+
+def _jd_diff(previous: str, current: str) -> dict:
+    previous_terms, current_terms = set(tokenize(previous)), set(tokenize(current))
+    return {
+        "added_terms": sorted(current_terms - previous_terms)[:JD_DIFF_TERMS],
+        "removed_terms": sorted(previous_terms - current_terms)[:JD_DIFF_TERMS],
+    }
+
+
+def _score_calibration(pairs: list):
+    # Least-squares fit of the previous run's AI scores on its local scores,
+    # so a change in local score can be read as a change in AI score.
+    # Returns (intercept, slope).
+    if len(pairs) < 3:
+        return 0.0, 1.0
+    mean_local = sum(local for local, _ in pairs) / len(pairs)
+    mean_match = sum(match for _, match in pairs) / len(pairs)
+    variance = sum((local - mean_local) ** 2 for local, _ in pairs)
+    if variance < 1e-9:
+        return mean_match - mean_local, 1.0
+    covariance = sum((local - mean_local) * (match - mean_match) for local, match in pairs)
+    slope = min(max(covariance / variance, 0.0), 5.0)
+    return mean_match - slope * mean_local, slope
+
+
+def _rescan(previous: dict, texts: dict, job_description: str, options: dict, top_k: int, margin: float,
+            results: list, failed: list) -> dict:
+    # Re-ranks a stored run against an edited JD, collecting (index, row)
+    # pairs into results like _scan_events. Returns the rescan plan.
+    rows = []
+    for row in previous["results"]:
+        if texts.get(row.get("candidate_id")) is None:
+            failed.append({"file_name": row["file_name"], "error": "Resume text is no longer in the candidate index."})
+        else:
+            rows.append(row)
+
+    # Near duplicates follow their representative. One whose representative
+    # is gone stands on its own, keeping the analysis it was copied.
+    clustered = {row["cluster_id"] for row in rows if "cluster_id" in row and not row.get("duplicate_of")}
+    for position, row in enumerate(rows):
+        if row.get("duplicate_of") and row.get("cluster_id") not in clustered:
+            rows[position] = {key: value for key, value in row.items() if key not in ("duplicate_of", "cluster_id")}
+    duplicates = [row for row in rows if row.get("duplicate_of")]
+    unique = [row for row in rows if not row.get("duplicate_of")]
+
+    with metrics.stage("prescreen"):
+        previous_scores, local_scores = score_matrix(
+            [previous["job_description"], job_description], [texts[row["candidate_id"]] for row in rows]
+        )
+    position_of = {id(row): position for position, row in enumerate(rows)}
+
+    def analyzed(row):
+        return row.get("status") == "processed" and not row.get("duplicate_of")
+
+    intercept, slope = _score_calibration([
+        (previous_scores[position_of[id(row)]], row.get("match_score", 0)) for row in unique if analyzed(row)
+    ])
+    estimates = []
+    for row in unique:
+        position = position_of[id(row)]
+        if analyzed(row):
+            estimate = row.get("match_score", 0) + slope * (local_scores[position] - previous_scores[position])
+        else:
+            estimate = intercept + slope * local_scores[position]
+        estimates.append(min(100.0, max(0.0, estimate)))
+
+    ranked = sorted(estimates, reverse=True)
+    cutoff = ranked[min(top_k, len(ranked)) - 1] if ranked else 0.0
+    unchanged = " ".join(previous["job_description"].split()) == " ".join(job_description.split())
+    to_analyze = []
+    if not unchanged and not options["local_only"]:
+        # Resumes well clear of the cutoff keep their place; a resume that
+        # could move into the top K without an AI analysis gets one.
+        to_analyze = [
+            position for position, (row, estimate) in enumerate(zip(unique, estimates))
+            if estimate >= cutoff - margin and (estimate <= cutoff + margin or not analyzed(row))
+        ]
+
+    def settle(position, row, rescan):
+        previous_row = unique[position]
+        row.update(candidate_id=previous_row["candidate_id"], rescan=rescan,
+                   previous_match_score=previous_row.get("match_score", 0))
+        if "cluster_id" in previous_row:
+            row["cluster_id"] = previous_row["cluster_id"]
+        results.append((position, row))
+        for duplicate in duplicates:
+            if duplicate["cluster_id"] == row.get("cluster_id"):
+                results.append((position, _duplicate_row(
+                    row, duplicate["file_name"], local_scores[position_of[id(duplicate)]], duplicate["candidate_id"]
+                )))
+
+    def estimated(position):
+        row, estimate = unique[position], estimates[position]
+        local_score = local_scores[position_of[id(row)]]
+        if row.get("status") in ("local", "screened_out"):
+            return _local_row(row["file_name"], local_score, row["status"])
+        return dict(row, match_score=int(round(estimate)), local_score=local_score)
+
+    selected = set(to_analyze)
+    for position in range(len(unique)):
+        if position not in selected:
+            settle(position, estimated(position), "estimated")
+
+    analyses = _iter_analyses(
+        [((position, unique[position]["file_name"]), texts[unique[position]["candidate_id"]]) for position in to_analyze],
+        job_description, options["max_concurrency"], not options["bypass_cache"], options["batch_size"],
+    )
+    for (position, file_name), analysis, error in analyses:
+        if error is None:
+            local_score = local_scores[position_of[id(unique[position])]]
+            settle(position, _result_row(file_name, analysis, local_score), "reanalyzed")
+            continue
+        # The estimate stands in for a failed re-analysis.
+        failed.append({"file_name": file_name, "error": error})
+        settle(position, estimated(position), "estimated")
+
+    return {
+        "top_k": top_k,
+        "margin": margin,
+        "cutoff": round(cutoff, 1),
+        "reanalyzed": len(to_analyze),
+        "reused": len(rows) - len(to_analyze),
+    }
+
+
+def _with_timings(payload: dict, options: dict) -> dict:
+    timings = metrics.current_timings()
+    if options.get("timings") and timings is not None:
+        payload["timings"] = timings.as_dict()
+    return payload
+
+
+def _with_scan_cookie(response, scan_id: str):
+    response.set_cookie(SCAN_ID_COOKIE, scan_id, max_age=int(result_store.ttl_seconds), httponly=True, samesite="Lax")
+    return response
+
+
+def _requested_bulk_run() -> dict:
+    scan_id = request.args.get("scan_id") or request.cookies.get(SCAN_ID_COOKIE)
+    return result_store.load(scan_id, "bulk") or {}
+
+
+def _matches_query(row: dict, terms: list) -> bool:
+    text = " ".join([
+        row.get("file_name", ""), row.get("summary", ""),
+        *row.get("strengths", []), *row.get("missing_keywords", []),
+    ]).lower()
+    return all(term in text for term in terms)
+
+
+def _results_page(rows: list, offset: int = 0, limit: int = RESULTS_PAGE_SIZE, sort: str = "rank",
+                  min_score=None, query: str = "") -> dict:
+    # rows are a stored run's ranked results. Each returned row keeps its
+    # overall rank; only offset + limit rows are ever put in order.
+    terms = query.lower().split()
+    matched = [
+        dict(row, rank=rank)
+        for rank, row in enumerate(rows, start=1)
+        if (min_score is None or row.get("match_score", 0) >= min_score) and _matches_query(row, terms)
+    ]
+
+    field, descending = sort.lstrip("-"), sort.startswith("-")
+    if field == "rank" and not descending:
+        page = matched[offset:offset + limit]
+    else:
+        def value(row):
+            if field == "file_name":
+                return row.get("file_name", "").lower()
+            return row.get(field) or 0
+
+        # nlargest/nsmallest keep a heap of offset + limit rows instead of
+        # sorting every match; ties keep the overall ranking either way.
+        if descending:
+            selected = heapq.nlargest(offset + limit, matched, key=lambda row: (value(row), -row["rank"]))
+        else:
+            selected = heapq.nsmallest(offset + limit, matched, key=lambda row: (value(row), row["rank"]))
+        page = selected[offset:]
+
+    next_offset = offset + len(page)
+    return {
+        "total": len(rows),
+        "matched": len(matched),
+        "results": page,
+        "next_cursor": str(next_offset) if next_offset < len(matched) else None,
+    }
+
+
+def _stream_frame(stream_format: str, event: str, payload: dict) -> str:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"type": event, **payload}) + "\n"
+
+
+def _stream_bulk_scan(scan_id: str, pending: list, failed: list, total_files: int, job_description: str,
+                      options: dict, stream_format: str, top_k: int = STREAM_TOP_K):
+    # Each result frame carries the row's rank among the best top_k so far
+    # (null when outside them), so a client can keep a live leaderboard
+    # without re-sorting every row it has received.
+    results = []
+    leaders = TopK(top_k)
+    settled = 0
+    try:
+        for event, payload in _scan_events(pending, failed, job_description, options, results):
+            if event == "result":
+                # _scan_events appends (index, row) to results before yielding
+                # the row.
+                index, _ = results[settled]
+                settled += 1
+                payload = dict(payload, rank=leaders.push(index, payload))
+            yield _stream_frame(stream_format, event, payload)
+
+        results_sorted = _rank_results(results)
+        timestamp = _remember_bulk_run(scan_id, job_description, results_sorted)
+        summary = _bulk_summary(scan_id, timestamp, total_files, results_sorted, failed)
+        yield _stream_frame(stream_format, "summary", _with_timings(summary, options))
+    except Exception as exc:
+        yield _stream_frame(stream_format, "error", {"error": str(exc)})
+
+
+def _validate_bulk_upload(resumes, job_description: str):
+    if not job_description:
+        return jsonify({"error": "Job description is required."}), 400
+
+    if not resumes:
+        return jsonify({"error": "Please upload resume files."}), 400
+
+    total_files = len(resumes)
+    if total_files < 1 or total_files > MAX_BULK_RESUMES:
+        return jsonify({"error": "Company bulk mode supports 1 to 1000 resumes per run."}), 400
+
+    return None
+
+
+def _read_job_items(items):
+    for item in items:
+        with open(item["path"], "rb") as stream:
+            yield (item["idx"], item["file_name"]), item["file_name"], stream.read()
+
+
+def _job_duplicates(job, pending: list) -> dict:
+    # {position: representative idx} for pending resumes that duplicate an
+    # earlier resume of the same job, in this claim or an earlier one. The
+    # shingles of every representative are kept in the job store, so
+    # detection spans the whole job rather than one claimed batch. A retried
+    # claim skips its own stored shingles so a representative never matches
+    # itself.
+    threshold = job["options"].get("dedupe_threshold", NEAR_DUPLICATE_THRESHOLD)
+    if threshold is None:
+        return {}
+    claimed = {idx for (idx, _), _ in pending}
+    with metrics.stage("dedupe"):
+        index = NearDuplicateIndex(threshold)
+        for idx, fingerprint in job_store.load_fingerprints(job["job_id"]):
+            if idx not in claimed:
+                index.add_shingles(idx, unpack_shingles(fingerprint))
+
+        duplicates = {}
+        fingerprints = []
+        for position, ((idx, _), resume_text) in enumerate(pending):
+            shingle_set = shingles(resume_text)
+            representative = index.add_shingles(idx, shingle_set)
+            if representative is not None:
+                duplicates[position] = representative
+            elif shingle_set:
+                fingerprints.append((idx, pack_shingles(shingle_set)))
+        job_store.save_fingerprints(job["job_id"], fingerprints)
+    return duplicates
+
+
+def _run_job_items(job, items):
+    pending = []
+    for key, _, resume_text, error in _extract_texts(_read_job_items(items)):
+        if error is not None:
+            yield key[0], None, error
             continue
+        pending.append((key, resume_text))
+
+    with metrics.stage("index"):
+        candidate_ids = candidate_index.add_many([(file_name, resume_text) for (_, file_name), resume_text in pending])
+
+    # Clusters are keyed by the representative's item idx, which is unique
+    # within the job and doubles as the cluster ID.
+    duplicates = _job_duplicates(job, pending)
+    claimed = {key[0] for key, _ in pending}
+    earlier = job_store.get_items(job["job_id"], set(duplicates.values()) - claimed)
+    clusters = {}
+    for position, representative in duplicates.items():
+        if representative not in claimed and earlier.get(representative, {}).get("status") not in ("processed", "failed"):
+            # Its representative is still being analyzed by another worker.
+            continue
+        clusters.setdefault(representative, []).append(position)
+    clustered = {position for members in clusters.values() for position in members}
+
+    def copies(representative, row, error):
+        for position in clusters.get(representative, ()):
+            idx, file_name = pending[position][0]
+            duplicate_row = None if row is None else _duplicate_row(row, file_name, candidate_id=candidate_ids[position])
+            yield idx, duplicate_row, error
+
+    for representative in sorted(set(clusters) - claimed):
+        item = earlier[representative]
+        row = item["result"]
+        if row is not None and "cluster_id" not in row:
+            row["cluster_id"] = representative
+            job_store.record_item(job["job_id"], representative, row=row)
+        yield from copies(representative, row, item["error"])
 
-    if auth_failures == len(clients) and len(clients) > 0:
-        raise AuthenticationError("Invalid API key for all configured providers.")
+    unique = [
+        ((position, file_name), resume_text)
+        for position, ((_, file_name), resume_text) in enumerate(pending)
+        if position not in clustered
+    ]
+    max_workers = _max_concurrency(job["options"].get("max_concurrency"))
+    use_cache = not job["options"].get("bypass_cache")
+    batch_size = _batch_size(job["options"].get("batch_size"))
+    analyses = _iter_analyses(unique, job["job_description"], max_workers, use_cache, batch_size)
+    for (position, file_name), analysis, error in analyses:
+        idx = pending[position][0][0]
+        row = None
+        if error is None:
+            row = _result_row(file_name, analysis)
+            row["candidate_id"] = candidate_ids[position]
+            if idx in clusters:
+                row["cluster_id"] = idx
+        yield idx, row, error
+        yield from copies(idx, row, error)
 
-    if last_error:
-        raise RuntimeError(last_error)
 
-    raise RuntimeError("No AI provider returned a response.")
+def _publish_job(job):
+    _remember_bulk_run(job["job_id"], job["job_description"], job["results"], timestamp=job["finished_at"])
+
+
+job_store = BulkJobStore(BULK_JOBS_DIR)
+job_runner = BulkJobRunner(job_store, _run_job_items, on_complete=_publish_job, batch_size=BULK_CONCURRENCY_LIMIT)
+if job_store.has_unfinished_jobs():
+    job_runner.start()
+
+
+metrics.registry.add_collector("dispatcher", metrics.dispatcher_collector(dispatcher))
+metrics.registry.add_collector("analysis_cache", metrics.cache_collector("analysis_cache", analysis_cache))
+metrics.registry.add_collector("extraction_cache", metrics.cache_collector("extraction_cache", text_extractor.cache))
+
+
+@app.before_request
+def _start_request_timings():
+    metrics.start_request()
 
 
 @app.route("/", methods=["GET"])
 def home():
-    html_path = BASE_DIR / "company_index.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as file:
-            return file.read()
-    return "<h1>Company Bulk Resume Scanner</h1><p>company_index.html not found.</p>", 404
+    return pages.response(
+        "company_index.html", "<h1>Company Bulk Resume Scanner</h1><p>company_index.html not found.</p>"
+    )
 
 
 @app.route("/favicon.ico", methods=["GET"])
@@ -195,67 +1056,421 @@ def favicon():
 @app.route("/bulk-scan", methods=["POST"])
 def bulk_scan():
     try:
-        if not clients:
+        with metrics.stage("multipart"):
+            options = _scan_options(request.form)
+            resumes = request.files.getlist("resumes")
+            job_description = (request.form.get("job_description") or "").strip()
+
+        if not clients and not options["local_only"]:
             return jsonify({
                 "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
             }), 500
 
-        resumes = request.files.getlist("resumes")
-        job_description = (request.form.get("job_description") or "").strip()
+        invalid = _validate_bulk_upload(resumes, job_description)
+        if invalid:
+            return invalid
 
-        if not job_description:
-            return jsonify({"error": "Job description is required."}), 400
+        stream_format = (request.form.get("stream") or request.args.get("stream") or "").lower()
 
-        if not resumes:
-            return jsonify({"error": "Please upload resume files."}), 400
+        # Local scoring needs every resume's text, and Flask closes the uploads
+        # once this view returns, so extraction always finishes up front.
+        failed = []
+        pending = list(_extract_uploads(resumes, failed))
+        total_files = len(pending) + len(failed)
+        scan_id = result_store.new_id()
 
-        total_files = len(resumes)
-        if total_files < 1 or total_files > 1000:
-            return jsonify({"error": "Company bulk mode supports 1 to 1000 resumes per run."}), 400
+        if stream_format in BULK_STREAM_FORMATS:
+            top_k = max(1, _optional_number(request.form.get("top_k"), int) or STREAM_TOP_K)
+            frames = _stream_bulk_scan(
+                scan_id, pending, failed, total_files, job_description, options, stream_format, top_k
+            )
+            return _with_scan_cookie(Response(
+                stream_with_context(frames),
+                mimetype=BULK_STREAM_FORMATS[stream_format],
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            ), scan_id)
 
         results = []
-        failed = []
+        for _ in _scan_events(pending, failed, job_description, options, results):
+            pass
+
+        results_sorted = _rank_results(results)
+        timestamp = _remember_bulk_run(scan_id, job_description, results_sorted)
+
+        response = _bulk_summary(scan_id, timestamp, total_files, results_sorted, failed)
+        response.update({
+            "results": results_sorted,
+            "failures": failed,
+        })
+        # page_size trims results to the first page; the rest is read from
+        # /bulk-results with next_cursor.
+        page_size = _optional_number(request.form.get("page_size"), int)
+        if page_size is not None:
+            page = _results_page(results_sorted, limit=max(1, min(page_size, MAX_RESULTS_PAGE_SIZE)))
+            response.update(results=page["results"], next_cursor=page["next_cursor"])
+        return _with_scan_cookie(jsonify(_with_timings(response, options)), scan_id)
+
+    except AuthenticationError:
+        return jsonify({"error": "Invalid API key (401). Update .env and restart this app."}), 401
+    except BadRequestError as exc:
+        return jsonify({"error": f"OpenAI request error: {exc}"}), 400
+    except APIStatusError as exc:
+        return jsonify({"error": f"OpenAI API status error ({exc.status_code}): {exc}"}), 502
+    except Exception as exc:
+        return jsonify({"error": str(exc)}), 500
+
+
+class _SpooledScan:
+    """Bounded extract -> analyze -> record pipeline fed one spooled upload at a time.
+
+    put() blocks while the upload queue is full, which stops the request
+    thread from reading the socket until the pipeline catches up. Spooled
+    files are deleted as soon as their text is extracted, and the text is
+    dropped once the analysis row is recorded. Near duplicates of an earlier
+    upload are not analyzed; they take its row once it settles.
+    """
+
+    _DONE = object()
+
+    def __init__(self, job_description: str, options: dict):
+        self.job_description = job_description
+        self.options = options
+        self.results = []
+        self.failed = []
+        self.total = 0
+        self.aborted = False
+        self.uploads = Queue(maxsize=SPOOL_QUEUE_SIZE)
+        self.texts = Queue(maxsize=max(2, options["max_concurrency"] * 2))
+        threshold = options["dedupe_threshold"]
+        self.duplicates = NearDuplicateIndex(threshold) if threshold is not None else None
+        self.clusters = {}
+        self.cluster_ids = {}
+        self.settled = {}
+        self.candidate_ids = {}
+        self.unsettled = {}
+        self._texts_done = False
+        self._extractors = [
+            threading.Thread(target=metrics.in_context(self._extract_loop), daemon=True)
+            for _ in range(max(1, text_extractor.max_workers))
+        ]
+        self._recorder = threading.Thread(target=metrics.in_context(self._record_loop), daemon=True)
+        for thread in self._extractors + [self._recorder]:
+            thread.start()
 
-        for index, resume_file in enumerate(resumes, start=1):
-            file_name = resume_file.filename or f"resume_{index}"
+    def put(self, part):
+        self.total += 1
+        self.uploads.put((self.total, part))
+
+    def _extract_loop(self):
+        for index, part in iter(self.uploads.get, self._DONE):
+            file_name = part.filename or f"resume_{index}"
             try:
-                resume_text = extract_resume_text(resume_file)
-                if not resume_text:
-                    failed.append({"file_name": file_name, "error": "Could not extract text (supported: PDF/TXT/DOCX)."})
+                if self.aborted:
                     continue
-
-                analysis = analyze_resume(resume_text, job_description)
-                results.append({
-                    "file_name": file_name,
-                    "match_score": analysis.get("match_score", 0),
-                    "summary": analysis.get("summary", ""),
-                    "strengths": analysis.get("strengths", []),
-                    "missing_keywords": analysis.get("missing_keywords", []),
-                    "improvement_suggestions": analysis.get("improvement_suggestions", []),
-                    "status": "processed",
-                })
+                if part.truncated:
+                    raise ValueError(f"File is larger than the {MAX_UPLOAD_FILE_BYTES // (1024 * 1024)} MB upload limit.")
+                with open(part.path, "rb") as stream, metrics.stage("extract"):
+                    resume_text = text_extractor.extract(file_name, stream.read(), use_pool=True)
             except Exception as exc:
-                failed.append({"file_name": file_name, "error": str(exc)})
+                self.failed.append({"file_name": file_name, "error": str(exc)})
+                continue
+            finally:
+                part.discard()
 
-        results_sorted = sorted(results, key=lambda item: item.get("match_score", 0), reverse=True)
+            if not resume_text:
+                self.failed.append({"file_name": file_name, "error": "Could not extract text (supported: PDF/TXT/DOCX)."})
+                continue
+            self.texts.put(((index, file_name), resume_text))
 
-        global last_bulk_analysis
-        last_bulk_analysis = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "job_description": job_description,
-            "results": results_sorted,
+    def _unique_texts(self):
+        # Runs on the recorder thread (pulled by _iter_analyses), so clusters
+        # and settled need no lock.
+        for key, resume_text in iter(self.texts.get, self._DONE):
+            # A resume the candidate index cannot take is still analyzed,
+            # just without a candidate_id.
+            try:
+                with metrics.stage("index"):
+                    self.candidate_ids[key] = candidate_index.add_many([(key[1], resume_text)])[0]
+            except Exception:
+                app.logger.exception("Could not add %s to the candidate index", key[1])
+            representative = None
+            if self.duplicates is not None:
+                with metrics.stage("dedupe"):
+                    representative = self.duplicates.add(key, resume_text)
+            if representative is None:
+                self.unsettled[key] = None
+                yield key, resume_text
+                continue
+            self.clusters.setdefault(representative, []).append(key)
+            if representative in self.settled:
+                self._settle_duplicate(representative, key)
+        self._texts_done = True
+
+    def _settle_duplicate(self, representative, key):
+        row, error = self.settled[representative]
+        index, file_name = key
+        if error is not None:
+            self.failed.append({"file_name": file_name, "error": error})
+        elif not self.aborted:
+            row["cluster_id"] = self.cluster_ids.setdefault(representative, len(self.cluster_ids) + 1)
+            self.results.append((index, _duplicate_row(row, file_name, candidate_id=self.candidate_ids.get(key))))
+
+    def _record_loop(self):
+        try:
+            self._record_analyses()
+        except Exception as exc:
+            app.logger.exception("Spooled scan recorder failed")
+            error = f"Could not process this resume: {exc}"
+            for key in list(self.unsettled):
+                self.settled[key] = (None, error)
+                self.failed.append({"file_name": key[1], "error": error})
+                for duplicate in self.clusters.get(key, ()):
+                    self._settle_duplicate(key, duplicate)
+            # Keep draining so the extractors never block on a full queue.
+            if not self._texts_done:
+                for (_, file_name), _ in iter(self.texts.get, self._DONE):
+                    self.failed.append({"file_name": file_name, "error": error})
+
+    def _record_analyses(self):
+        analyses = _iter_analyses(
+            self._unique_texts(),
+            self.job_description,
+            self.options["max_concurrency"],
+            not self.options["bypass_cache"],
+            self.options["batch_size"],
+        )
+        for key, analysis, error in analyses:
+            index, file_name = key
+            row = None
+            if error is not None:
+                self.failed.append({"file_name": file_name, "error": error})
+            elif not self.aborted:
+                row = _result_row(file_name, analysis)
+                row["candidate_id"] = self.candidate_ids.get(key)
+                self.results.append((index, row))
+            self.settled[key] = (row, error)
+            self.unsettled.pop(key, None)
+            for duplicate in self.clusters.get(key, ()):
+                self._settle_duplicate(key, duplicate)
+
+    def close(self, abort: bool = False):
+        self.aborted = self.aborted or abort
+        for _ in self._extractors:
+            self.uploads.put(self._DONE)
+        for thread in self._extractors:
+            thread.join()
+        self.texts.put(self._DONE)
+        self._recorder.join()
+
+
+@app.route("/bulk-scan-spooled", methods=["POST"])
+def bulk_scan_spooled():
+    # Form fields must precede the resume files in the multipart body (or be
+    # passed in the query string) because files are processed as they arrive.
+    if not clients:
+        return jsonify({
+            "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
+        }), 500
+
+    fields = request.args.to_dict()
+    scan = None
+    try:
+        parts = iter_spooled_parts(request.stream, request.content_type, SPOOL_DIR, MAX_UPLOAD_FILE_BYTES)
+        for part in metrics.timed_iter(parts, "multipart"):
+            if not part.is_file:
+                fields.setdefault(part.name, part.value)
+                continue
+            if part.name != "resumes":
+                part.discard()
+                continue
+
+            if scan is None:
+                job_description = (fields.get("job_description") or "").strip()
+                if not job_description:
+                    part.discard()
+                    return jsonify({"error": "Job description is required before the resume files."}), 400
+                scan = _SpooledScan(job_description, _scan_options(fields))
+
+            if scan.total >= MAX_BULK_RESUMES:
+                part.discard()
+                scan.close(abort=True)
+                return jsonify({"error": "Company bulk mode supports 1 to 1000 resumes per run."}), 400
+            scan.put(part)
+    except UploadError as exc:
+        if scan is not None:
+            scan.close(abort=True)
+        return jsonify({"error": str(exc)}), 400
+    except Exception as exc:
+        if scan is not None:
+            scan.close(abort=True)
+        return jsonify({"error": f"Upload failed: {exc}"}), 400
+
+    if scan is None:
+        if not (fields.get("job_description") or "").strip():
+            return jsonify({"error": "Job description is required."}), 400
+        return jsonify({"error": "Please upload resume files."}), 400
+
+    scan.close()
+    results_sorted = _rank_results(scan.results)
+    scan_id = result_store.new_id()
+    timestamp = _remember_bulk_run(scan_id, scan.job_description, results_sorted)
+
+    response = _bulk_summary(scan_id, timestamp, scan.total, results_sorted, scan.failed)
+    response.update({
+        "results": results_sorted,
+        "failures": scan.failed,
+    })
+    return _with_scan_cookie(jsonify(_with_timings(response, scan.options)), scan_id)
+
+
+@app.route("/bulk-jobs", methods=["POST"])
+def submit_bulk_job():
+    if not clients:
+        return jsonify({
+            "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
+        }), 500
+
+    resumes = request.files.getlist("resumes")
+    job_description = (request.form.get("job_description") or "").strip()
+
+    invalid = _validate_bulk_upload(resumes, job_description)
+    if invalid:
+        return invalid
+
+    if any(is_archive(resume_file.filename) for resume_file in resumes):
+        return jsonify({"error": "Archives are only supported by /bulk-scan. Upload the individual resume files instead."}), 400
+
+    try:
+        uploads = [
+            (resume_file.filename or f"resume_{index}", resume_file.stream)
+            for index, resume_file in enumerate(resumes, start=1)
+        ]
+        options = {
+            "max_concurrency": _max_concurrency(request.form.get("max_concurrency")),
+            "bypass_cache": _is_truthy(request.form.get("bypass_cache")),
+            "batch_size": _batch_size(request.form.get("batch_size")),
+            "dedupe_threshold": _duplicate_threshold(request.form),
         }
+        job_id = job_store.create_job(job_description, uploads, options)
+    except Exception as exc:
+        return jsonify({"error": f"Could not queue bulk job: {exc}"}), 500
+
+    job_runner.start()
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "total_uploaded": len(uploads),
+        "status_url": url_for("bulk_job_status", job_id=job_id),
+    }), 202
+
 
+@app.route("/bulk-jobs/<job_id>", methods=["GET"])
+def bulk_job_status(job_id):
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Bulk job not found."}), 404
+
+    results = job.pop("results")
+    job.pop("options")
+    job.update({
+        "top_candidates": results[:10],
+        "results": results,
+        "duplicate_clusters": _duplicate_clusters(results),
+    })
+    if job["status"] != "completed":
+        return jsonify(job)
+
+    # A finished job's results are exported with its job ID as the scan ID.
+    job["scan_id"] = job_id
+    return _with_scan_cookie(jsonify(job), job_id)
+
+
+def _role_shortlist(role: int, job_description: str, pending: list, scores: list, candidate_ids: list,
+                    options: dict, top_k: int, analyze: bool, failed: list) -> list:
+    # Ranked rows for one role's top_k resumes; with analyze they get an AI
+    # analysis, otherwise (or when it fails) they keep their local score.
+    picked = sorted(
+        shortlist(scores, top_k, options["prescreen_min_score"]), key=lambda position: (-scores[position], position)
+    )
+    rows = {}
+    if analyze:
+        to_analyze = [((position, pending[position][0][1]), pending[position][1]) for position in picked]
+        analyses = _iter_analyses(
+            to_analyze, job_description, options["max_concurrency"], not options["bypass_cache"], options["batch_size"]
+        )
+        for (position, file_name), analysis, error in analyses:
+            if error is None:
+                rows[position] = _result_row(file_name, analysis, scores[position])
+            else:
+                failed.append({"file_name": file_name, "role": role, "error": error})
+
+    results = []
+    for rank, position in enumerate(picked):
+        row = rows.get(position) or _local_row(pending[position][0][1], scores[position], "local")
+        row["candidate_id"] = candidate_ids[position]
+        results.append((rank, row))
+    return _rank_results(results)
+
+
+@app.route("/bulk-matrix", methods=["POST"])
+def bulk_matrix():
+    # Scores one upload of resumes against several job descriptions (repeat
+    # the job_descriptions field) and returns each role's top_k shortlist.
+    # analyze=1 sends only the shortlisted resumes to the LLM, per role.
+    with metrics.stage("multipart"):
+        options = _scan_options(request.form)
+        resumes = request.files.getlist("resumes")
+        job_descriptions = [text.strip() for text in request.form.getlist("job_descriptions") if text.strip()]
+        analyze = _is_truthy(request.form.get("analyze"))
+        top_k = max(1, _optional_number(request.form.get("top_k"), int) or MATRIX_TOP_K)
+
+    if len(job_descriptions) > MAX_MATRIX_ROLES:
+        return jsonify({"error": f"Matrix mode supports up to {MAX_MATRIX_ROLES} job descriptions per run."}), 400
+    invalid = _validate_bulk_upload(resumes, job_descriptions[0] if job_descriptions else "")
+    if invalid:
+        return invalid
+    if analyze and not clients:
         return jsonify({
-            "timestamp": last_bulk_analysis["timestamp"],
-            "total_uploaded": total_files,
-            "processed": len(results_sorted),
-            "failed": len(failed),
-            "top_candidates": results_sorted[:10],
-            "results": results_sorted,
-            "failures": failed,
-        })
+            "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
+        }), 500
 
+    try:
+        failed = []
+        pending = list(_extract_uploads(resumes, failed))
+        with metrics.stage("index"):
+            candidate_ids = candidate_index.add_many([(file_name, resume_text) for (_, file_name), resume_text in pending])
+        with metrics.stage("prescreen"):
+            matrix = score_matrix(job_descriptions, [resume_text for _, resume_text in pending])
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        roles = []
+        for role, (job_description, scores) in enumerate(zip(job_descriptions, matrix)):
+            results_sorted = _role_shortlist(
+                role, job_description, pending, scores, candidate_ids, options, top_k, analyze, failed
+            )
+            # Each role is stored as its own bulk run, so the usual exports work
+            # with its scan_id.
+            scan_id = result_store.new_id()
+            _remember_bulk_run(scan_id, job_description, results_sorted, timestamp)
+            roles.append({
+                "role": role,
+                "title": job_title(job_description),
+                "scan_id": scan_id,
+                "analyzed": sum(1 for row in results_sorted if row["status"] == "processed"),
+                "shortlist": results_sorted,
+            })
+
+        timings = metrics.current_timings()
+        response = {
+            "timestamp": timestamp,
+            "total_uploaded": len(pending) + len(failed),
+            "roles": roles,
+            "failures": failed,
+            "prompt_tokens": timings.prompt_token_report() if timings is not None else None,
+        }
+        if _is_truthy(request.form.get("include_matrix")):
+            response["matrix"] = {"file_names": [file_name for (_, file_name), _ in pending], "scores": matrix}
+        return jsonify(_with_timings(response, options))
     except AuthenticationError:
         return jsonify({"error": "Invalid API key (401). Update .env and restart this app."}), 401
     except BadRequestError as exc:
@@ -266,52 +1481,272 @@ def bulk_scan():
         return jsonify({"error": str(exc)}), 500
 
 
+@app.route("/bulk-rescan", methods=["POST"])
+def bulk_rescan():
+    # Re-ranks a stored bulk run (scan_id or the bulk run cookie) against an
+    # edited JD, reusing the indexed resume texts instead of new uploads.
+    fields = request.get_json(silent=True) or request.values
+    previous_scan_id = fields.get("scan_id") or request.cookies.get(SCAN_ID_COOKIE)
+    previous = result_store.load(previous_scan_id, "bulk") if previous_scan_id else None
+    if not previous:
+        return jsonify({"error": "No stored bulk run found. Run a bulk scan first or pass a valid scan_id."}), 404
+
+    job_description = (fields.get("job_description") or "").strip()
+    if not job_description:
+        return jsonify({"error": "Job description is required."}), 400
+    options = _scan_options(fields)
+    if not clients and not options["local_only"]:
+        return jsonify({
+            "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
+        }), 500
+    top_k = max(1, _optional_number(fields.get("top_k"), int) or RESCAN_TOP_K)
+    margin = _optional_number(fields.get("margin"), float)
+    margin = RESCAN_MARGIN if margin is None else max(0.0, margin)
+
+    with metrics.stage("load"):
+        texts = candidate_index.texts(
+            [row["candidate_id"] for row in previous["results"] if row.get("candidate_id") is not None]
+        )
+    if not texts:
+        return jsonify({"error": "This run's resumes are not in the candidate index. Upload them again."}), 400
+
+    results = []
+    failed = []
+    plan = _rescan(previous, texts, job_description, options, top_k, margin, results, failed)
+    plan.update(previous_scan_id=previous_scan_id, **_jd_diff(previous["job_description"], job_description))
+
+    results_sorted = _rank_results(results)
+    scan_id = result_store.new_id()
+    timestamp = _remember_bulk_run(scan_id, job_description, results_sorted)
+    response = _bulk_summary(scan_id, timestamp, len(previous["results"]), results_sorted, failed)
+    response.update({
+        "rescan": plan,
+        "results": results_sorted,
+        "failures": failed,
+    })
+    return _with_scan_cookie(jsonify(_with_timings(response, options)), scan_id)
+
+
+@app.route("/candidates/search", methods=["GET", "POST"])
+def search_candidates():
+    # Ranks every indexed resume against a JD and/or keyword query (q) without
+    # uploading them again; analyze_top=N also sends the best N to the LLM.
+    fields = request.get_json(silent=True) or request.values
+    job_description = (fields.get("job_description") or "").strip()
+    query = (fields.get("q") or "").strip()
+    if not job_description and not query:
+        return jsonify({"error": "Provide a job description or a keyword query (q)."}), 400
+
+    limit = max(1, min(_optional_number(fields.get("limit"), int) or 20, CANDIDATE_SEARCH_LIMIT))
+    analyze_top = max(0, min(_optional_number(fields.get("analyze_top"), int) or 0, limit))
+    if analyze_top and not job_description:
+        return jsonify({"error": "Job description is required for AI analysis."}), 400
+    if analyze_top and not clients:
+        return jsonify({
+            "error": "API key not configured. Add valid PPLX_API_KEY or OPENAI_API_KEY in .env and restart this app."
+        }), 500
+
+    started = time.perf_counter()
+    with metrics.stage("search"):
+        found = candidate_index.search(job_description, query, limit)
+    hits = found["results"]
+    response = {
+        "total_indexed": candidate_index.count(),
+        "matched": found["matched"],
+        "took_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    if not analyze_top:
+        for hit in hits:
+            hit.pop("resume_text")
+        response["results"] = hits
+        return jsonify(response)
+
+    options = _scan_options(fields)
+    to_analyze = [
+        ((position, hit["file_name"], hit["local_score"]), hit.pop("resume_text"))
+        for position, hit in enumerate(hits[:analyze_top])
+    ]
+    for hit in hits[analyze_top:]:
+        hit.pop("resume_text")
+
+    results = []
+    failed = []
+    analyses = _iter_analyses(
+        to_analyze, job_description, options["max_concurrency"], not options["bypass_cache"], options["batch_size"]
+    )
+    for (position, file_name, local_score), analysis, error in analyses:
+        if error is not None:
+            failed.append({"file_name": file_name, "error": error})
+            continue
+        row = _result_row(file_name, analysis, local_score)
+        row["candidate_id"] = hits[position]["candidate_id"]
+        hits[position]["analysis"] = row
+        results.append((position, row))
+
+    scan_id = result_store.new_id()
+    timestamp = _remember_bulk_run(scan_id, job_description, _rank_results(results))
+    response.update({
+        "scan_id": scan_id,
+        "timestamp": timestamp,
+        "analyzed": len(results),
+        "prompt_tokens": metrics.current_timings().prompt_token_report(),
+        "results": hits,
+        "failures": failed,
+    })
+    return _with_scan_cookie(jsonify(_with_timings(response, options)), scan_id)
+
+
+@app.route("/candidates/<int:candidate_id>", methods=["DELETE"])
+def delete_candidate(candidate_id):
+    if not candidate_index.delete(candidate_id):
+        return jsonify({"error": "Candidate not found."}), 404
+    return jsonify({"deleted": candidate_id})
+
+
+@app.route("/provider-stats", methods=["GET"])
+def provider_stats():
+    return jsonify(dispatcher.stats())
+
+
+@app.route("/analysis-cache", methods=["GET"])
+def analysis_cache_stats():
+    return jsonify(analysis_cache.stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    return metrics.render_response()
+
+
+@app.route("/bulk-results", methods=["GET"])
+def bulk_results():
+    # Pages through a stored run (scan_id or the bulk run cookie). Supports
+    # sort=rank|match_score|local_score|file_name (prefix "-" for descending),
+    # min_score and a keyword filter q; pass next_cursor back as cursor.
+    bulk_run = _requested_bulk_run()
+    if not bulk_run.get("results"):
+        return jsonify({"error": "No bulk analysis available. Run a bulk scan first."}), 400
+
+    sort = request.args.get("sort") or "rank"
+    if sort.lstrip("-") not in RESULT_SORT_FIELDS:
+        return jsonify({"error": f"sort must be one of: {', '.join(RESULT_SORT_FIELDS)}."}), 400
+    offset = _optional_number(request.args.get("cursor"), int) or 0
+    limit = _optional_number(request.args.get("limit"), int) or RESULTS_PAGE_SIZE
+
+    with metrics.stage("page"):
+        page = _results_page(
+            bulk_run["results"],
+            offset=max(0, offset),
+            limit=max(1, min(limit, MAX_RESULTS_PAGE_SIZE)),
+            sort=sort,
+            min_score=_optional_number(request.args.get("min_score"), float),
+            query=(request.args.get("q") or "").strip(),
+        )
+    page["timestamp"] = bulk_run.get("timestamp")
+    return jsonify(page)
+
+
+BULK_EXPORT_COLUMNS = [
+    "Rank",
+    "File Name",
+    "Match Score",
+    "Local Score",
+    "Status",
+    "Cluster",
+    "Duplicate Of",
+    "Summary",
+    "Strengths",
+    "Missing Keywords",
+    "Improvement Suggestions",
+]
+
+
+def _export_rows(bulk_run: dict):
+    yield ["Generated", bulk_run.get("timestamp", "N/A")]
+    yield []
+    yield BULK_EXPORT_COLUMNS
+    for rank, row in enumerate(bulk_run.get("results", []), start=1):
+        yield [
+            rank,
+            row.get("file_name", ""),
+            row.get("match_score", 0),
+            row.get("local_score", ""),
+            row.get("status", ""),
+            row.get("cluster_id", ""),
+            row.get("duplicate_of", ""),
+            row.get("summary", ""),
+            " | ".join(row.get("strengths", [])),
+            " | ".join(row.get("missing_keywords", [])),
+            " | ".join(row.get("improvement_suggestions", [])),
+        ]
+
+
+def _export_response(chunks, mimetype: str, bulk_run: dict, extension: str):
+    stamp = (bulk_run.get("timestamp") or "report").replace(" ", "_").replace(":", "-")
+    filename = f"bulk_resume_analysis_{stamp}.{extension}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}", "Cache-Control": "no-cache"},
+    )
+
+
 @app.route("/bulk-export-csv", methods=["GET"])
 def bulk_export_csv():
-    if not last_bulk_analysis.get("results"):
+    bulk_run = _requested_bulk_run()
+    if not bulk_run.get("results"):
         return jsonify({"error": "No bulk analysis available. Run a bulk scan first."}), 400
 
-    try:
-        csv_buffer = StringIO()
-        writer = csv.writer(csv_buffer)
-
-        writer.writerow(["Generated", last_bulk_analysis.get("timestamp", "N/A")])
-        writer.writerow([])
-        writer.writerow([
-            "Rank",
-            "File Name",
-            "Match Score",
-            "Summary",
-            "Strengths",
-            "Missing Keywords",
-            "Improvement Suggestions",
-        ])
-
-        for rank, row in enumerate(last_bulk_analysis.get("results", []), start=1):
-            writer.writerow([
-                rank,
-                row.get("file_name", ""),
-                row.get("match_score", 0),
-                row.get("summary", ""),
-                " | ".join(row.get("strengths", [])),
-                " | ".join(row.get("missing_keywords", [])),
-                " | ".join(row.get("improvement_suggestions", [])),
-            ])
-
-        csv_bytes = BytesIO(csv_buffer.getvalue().encode("utf-8-sig"))
-        csv_bytes.seek(0)
-
-        stamp = (last_bulk_analysis.get("timestamp") or "report").replace(" ", "_").replace(":", "-")
-        filename = f"bulk_resume_analysis_{stamp}.csv"
-
-        return send_file(
-            csv_bytes,
-            mimetype="text/csv",
-            as_attachment=True,
-            download_name=filename,
-        )
-    except Exception as exc:
-        return jsonify({"error": f"CSV export failed: {exc}"}), 500
+    return _export_response(iter_csv(_export_rows(bulk_run)), "text/csv", bulk_run, "csv")
+
+
+@app.route("/bulk-export-xlsx", methods=["GET"])
+def bulk_export_xlsx():
+    if not EXCEL_AVAILABLE:
+        return jsonify({"error": "Excel export not available. Install openpyxl: pip install openpyxl"}), 500
+
+    bulk_run = _requested_bulk_run()
+    if not bulk_run.get("results"):
+        return jsonify({"error": "No bulk analysis available. Run a bulk scan first."}), 400
+
+    chunks = iter_xlsx("Bulk Analysis", _export_rows(bulk_run), bold_rows=(2,))
+    return _export_response(
+        chunks, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", bulk_run, "xlsx",
+    )
+
+
+def _pdf_blocks(bulk_run: dict):
+    yield "heading", "Company Bulk Resume Scan - Candidate Report"
+    yield "paragraph", f"Generated: {bulk_run.get('timestamp', 'N/A')}"
+    yield "subheading", "Job Description"
+    yield "paragraph", bulk_run.get("job_description", "")
+
+    for rank, row in enumerate(bulk_run.get("results", []), start=1):
+        score = row.get("match_score", 0)
+        local_score = row.get("local_score")
+        yield "subheading", f"#{rank} {row.get('file_name', '')} - Match Score {score}"
+        if local_score is not None:
+            yield "paragraph", f"Local Score: {local_score}    Status: {row.get('status', '')}"
+        if row.get("duplicate_of"):
+            yield "paragraph", f"Near duplicate of {row['duplicate_of']} (cluster {row.get('cluster_id')}); result copied."
+        yield "paragraph", row.get("summary", "")
+        for label, key in (
+            ("Strengths", "strengths"),
+            ("Missing Keywords", "missing_keywords"),
+            ("Improvement Suggestions", "improvement_suggestions"),
+        ):
+            if row.get(key):
+                yield "paragraph", f"{label}: " + "; ".join(row[key])
+
+
+@app.route("/bulk-export-pdf", methods=["GET"])
+def bulk_export_pdf():
+    bulk_run = _requested_bulk_run()
+    if not bulk_run.get("results"):
+        return jsonify({"error": "No bulk analysis available. Run a bulk scan first."}), 400
+
+    chunks = iter_pdf(_pdf_blocks(bulk_run), title="Company Bulk Resume Scan - Candidate Report")
+    return _export_response(chunks, "application/pdf", bulk_run, "pdf")
 
 
 if __name__ == "__main__":
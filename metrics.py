@@ -0,0 +1,276 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+METRIC_PREFIX = "resume_scanner"
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestTimings:
+    """Stage durations and token usage collected for one HTTP request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.tokens = {}
+        self.prompt_tokens = {"original": 0, "sent": 0}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            total, calls = self.stages.get(stage, (0.0, 0))
+            self.stages[stage] = (total + seconds, calls + 1)
+
+    def add_tokens(self, provider: str, input_tokens: int, output_tokens: int):
+        with self._lock:
+            counts = self.tokens.setdefault(provider, {"input": 0, "output": 0})
+            counts["input"] += input_tokens
+            counts["output"] += output_tokens
+
+    def add_prompt_tokens(self, original_tokens: int, sent_tokens: int):
+        with self._lock:
+            self.prompt_tokens["original"] += original_tokens
+            self.prompt_tokens["sent"] += sent_tokens
+
+    def prompt_token_report(self) -> dict:
+        with self._lock:
+            report = dict(self.prompt_tokens)
+        report["saved"] = max(0, report["original"] - report["sent"])
+        return report
+
+    def as_dict(self) -> dict:
+        # Stage times are summed across worker threads, so in a concurrent
+        # bulk run they can exceed total_ms.
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+                "stages": {
+                    stage: {"ms": round(seconds * 1000, 1), "calls": calls}
+                    for stage, (seconds, calls) in sorted(self.stages.items())
+                },
+                "tokens": {provider: dict(counts) for provider, counts in self.tokens.items()},
+                "prompt_tokens": dict(self.prompt_tokens),
+            }
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format.
+
+    Each worker process keeps its own registry, so scrape every worker (or
+    sum across them) when running under gunicorn with several workers.
+    """
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        self.prefix = prefix
+        self._families = {}
+        self._values = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str):
+        self._families[name] = ("counter", help_text, None)
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self._families[name] = ("histogram", help_text, tuple(buckets))
+
+    def add_collector(self, key: str, collect):
+        # collect() returns [(name, type, help, [(labels_dict, value)])] at
+        # scrape time, for stats that already live elsewhere. Registering the
+        # same key again replaces the earlier collector.
+        self._collectors[key] = collect
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = self._families[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(buckets), 0.0, 0]
+            for position, bound in enumerate(buckets):
+                if value <= bound:
+                    state[0][position] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> str:
+        with self._lock:
+            values = {key: (list(value[0]), value[1], value[2]) if isinstance(value, list) else value
+                      for key, value in self._values.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in self._families.items():
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for (metric, labels), value in sorted(values.items()):
+                if metric != name:
+                    continue
+                if kind == "counter":
+                    lines.append(f"{full_name}{_label_text(labels)} {_number(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + (float("inf"),), counts + [count - sum(counts)]):
+                    cumulative += bucket_count
+                    lines.append(f"{full_name}_bucket{_label_text(labels + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{full_name}_sum{_label_text(labels)} {_number(total)}")
+                lines.append(f"{full_name}_count{_label_text(labels)} {count}")
+
+        for collect in list(self._collectors.values()):
+            for name, kind, help_text, samples in collect():
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{full_name}{_label_text(sorted(labels.items()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.histogram("stage_seconds", "Time spent in each processing stage.")
+registry.histogram("provider_request_seconds", "Latency of individual provider API calls.")
+registry.histogram("provider_first_token_seconds", "Time from opening a streamed completion to its first token.")
+registry.counter("provider_tokens_total", "Tokens reported in provider responses.")
+registry.counter("prompt_tokens_saved_total", "Estimated prompt tokens removed by compaction before sending.")
+
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def current_timings():
+    return _request_timings.get()
+
+
+def in_context(function):
+    """Binds function to a copy of the caller's context, so timings recorded
+    on a worker thread are attributed to the request that started it."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(function, *args, **kwargs)
+
+    return run
+
+
+@contextmanager
+def stage(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe("stage_seconds", elapsed, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+
+
+def timed_iter(iterable, name: str):
+    """Yields from iterable, timing each step as stage name."""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def provider_call(provider: str):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        registry.observe("provider_request_seconds", time.perf_counter() - started, provider=provider, outcome=outcome)
+
+
+def record_usage(provider: str, response):
+    # chat.completions reports prompt/completion tokens, responses reports
+    # input/output tokens; Perplexity follows the chat shape.
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None) or 0
+    output_tokens = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None) or 0
+    registry.inc("provider_tokens_total", input_tokens, provider=provider, direction="input")
+    registry.inc("provider_tokens_total", output_tokens, provider=provider, direction="output")
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add_tokens(provider, input_tokens, output_tokens)
+
+
+def record_prompt_tokens(original_tokens: int, sent_tokens: int):
+    # Estimated size of a prompt's documents before and after compaction.
+    registry.inc("prompt_tokens_saved_total", max(0, original_tokens - sent_tokens))
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add_prompt_tokens(original_tokens, sent_tokens)
+
+
+def render_response():
+    # Imported lazily so this module stays usable outside Flask.
+    from flask import Response
+
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+def dispatcher_collector(dispatcher):
+    def collect():
+        stats = dispatcher.stats()
+        events = []
+        circuits = []
+        for provider, counters in stats.items():
+            for event, value in counters.items():
+                if event == "circuit":
+                    circuits.append(({"provider": provider}, 0 if value == "closed" else 1))
+                else:
+                    events.append(({"provider": provider, "event": event}, value))
+        return [
+            ("provider_dispatch_events_total", "counter", "Provider dispatcher events (requests, retries, 429s, ...).", events),
+            ("provider_circuit_open", "gauge", "1 while a provider's circuit breaker is open or half-open.", circuits),
+        ]
+    return collect
+
+
+def cache_collector(name: str, cache):
+    def collect():
+        stats = cache.stats()
+        return [
+            (f"{name}_lookups_total", "counter", f"{name} lookups by result.", [
+                ({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"]),
+            ]),
+            (f"{name}_entries", "gauge", f"Entries currently stored in {name}.", [({}, stats["entries"])]),
+        ]
+    return collect
@@ -0,0 +1,137 @@
+import hashlib
+import re
+from array import array
+
+WORD_PATTERN = re.compile(r"\w+")
+HASH_MASK = (1 << 62) - 1
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+BANDS = 16
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Hashed word n-grams of text, ignoring case, punctuation and layout.
+
+    Working on words rather than characters makes a PDF and a DOCX of the
+    same resume (different line breaks and bullets) come out identical. The
+    hashes are stable across processes, so shingle sets can be stored (see
+    pack_shingles) and compared later.
+    """
+    words = WORD_PATTERN.findall((text or "").lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[position:position + size]) for position in range(len(words) - size + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big") & HASH_MASK
+        for gram in grams
+    }
+
+
+def pack_shingles(shingle_set: set) -> bytes:
+    return array("q", sorted(shingle_set)).tobytes()
+
+
+def unpack_shingles(data: bytes) -> set:
+    values = array("q")
+    values.frombytes(data)
+    return set(values)
+
+
+def jaccard(first: set, second: set) -> float:
+    if not first and not second:
+        return 1.0
+    overlap = len(first & second)
+    return overlap / (len(first) + len(second) - overlap)
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index that clusters near-identical texts.
+
+    add() compares a text only with the earlier representatives that share at
+    least one LSH band with it, so a run stays roughly linear in the number of
+    texts. Candidates are confirmed with the exact Jaccard similarity of their
+    shingle sets, which keeps LSH false positives out of the clusters; the
+    first text of each cluster is its representative.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_permutations: int = NUM_PERMUTATIONS,
+                 bands: int = BANDS, shingle_size: int = SHINGLE_SIZE):
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be a multiple of bands")
+        self.threshold = threshold
+        self.num_permutations = num_permutations
+        self.bands = bands
+        self.rows = num_permutations // bands
+        self.shingle_size = shingle_size
+        self._buckets = [{} for _ in range(bands)]
+        self._shingles = {}
+
+    def signature(self, shingle_set: set) -> list:
+        # One permutation hashing: the low part of a shingle hash picks a bin
+        # and each bin keeps the smallest remaining part, so the whole
+        # signature costs a single pass over the shingles.
+        size = self.num_permutations
+        bins = [None] * size
+        for value in shingle_set:
+            position, rest = value % size, value // size
+            if bins[position] is None or rest < bins[position]:
+                bins[position] = rest
+        if None not in bins:
+            return bins
+
+        # Empty bins (short texts) borrow the next filled bin to the right,
+        # tagged with the distance, so similar texts still agree on them.
+        signature = list(bins)
+        nearest, distance = None, 0
+        for position in reversed(range(2 * size)):
+            value = bins[position % size]
+            if value is not None:
+                nearest, distance = value, 0
+                continue
+            distance += 1
+            if position < size and nearest is not None:
+                signature[position] = (nearest, distance)
+        return signature
+
+    def add(self, key, text: str):
+        """Returns the key of the representative that text duplicates, or
+        None when key becomes the representative of a new cluster."""
+        return self.add_shingles(key, shingles(text, self.shingle_size))
+
+    def add_shingles(self, key, shingle_set: set):
+        # add() for a text whose shingles were computed (or stored) earlier.
+        if not shingle_set:
+            return None
+
+        signature = self.signature(shingle_set)
+        bands = [tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+        best_key, best_similarity, checked = None, self.threshold, set()
+        for buckets, band in zip(self._buckets, bands):
+            for candidate in buckets.get(band, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                similarity = jaccard(shingle_set, self._shingles[candidate])
+                if similarity >= best_similarity and (best_key is None or similarity > best_similarity):
+                    best_key, best_similarity = candidate, similarity
+        if best_key is not None:
+            return best_key
+
+        self._shingles[key] = shingle_set
+        for buckets, band in zip(self._buckets, bands):
+            buckets.setdefault(band, []).append(key)
+        return None
+
+
+def find_near_duplicates(texts, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Position of the representative for every text (its own position for
+    representatives)."""
+    index = NearDuplicateIndex(threshold)
+    representatives = []
+    for position, text in enumerate(texts):
+        representative = index.add(position, text)
+        representatives.append(position if representative is None else representative)
+    return representatives
@@ -0,0 +1,255 @@
+import zlib
+
+# Helvetica advance widths (1/1000 em) for printable ASCII, from the standard
+# AFM metrics. Anything else falls back to DEFAULT_WIDTH.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+CHAR_WIDTHS = {chr(32 + offset): width for offset, width in enumerate(_HELVETICA_WIDTHS)}
+DEFAULT_WIDTH = 556
+# Helvetica-Bold runs up to ~10% wider; headings are wrapped with this margin.
+BOLD_WIDTH_FACTOR = 1.1
+
+PAGES_ID = 1
+FONT_ID = 2
+BOLD_FONT_ID = 3
+CATALOG_ID = 4
+INFO_ID = 5
+FIRST_FREE_ID = 6
+
+
+def text_width(text: str, font_size: float) -> float:
+    return sum(CHAR_WIDTHS.get(char, DEFAULT_WIDTH) for char in text) * font_size / 1000.0
+
+
+def _break_word(word: str, max_width: float, font_size: float) -> list:
+    pieces = []
+    current = ""
+    for char in word:
+        if current and text_width(current + char, font_size) > max_width:
+            pieces.append(current)
+            current = char
+        else:
+            current += char
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def wrap_text(text: str, max_width: float, font_size: float) -> list:
+    """Greedy word wrap to max_width points; words too long for a line are split."""
+    lines = []
+    space = CHAR_WIDTHS[" "] * font_size / 1000.0
+    for raw_line in (text or "").replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        words = raw_line.expandtabs(4).split(" ")
+        current = []
+        current_width = 0.0
+        for word in words:
+            width = text_width(word, font_size)
+            if width > max_width:
+                pieces = _break_word(word, max_width, font_size)
+                word = pieces.pop()
+                for piece in pieces:
+                    if current:
+                        lines.append(" ".join(current))
+                    lines.append(piece)
+                    current, current_width = [], 0.0
+                width = text_width(word, font_size)
+            extra = width + (space if current else 0.0)
+            if current and current_width + extra > max_width:
+                lines.append(" ".join(current))
+                current, current_width = [word], width
+            else:
+                current.append(word)
+                current_width += extra
+        lines.append(" ".join(current))
+    return lines
+
+
+def _escape(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class PdfReport:
+    """Writes a text PDF page by page straight to a binary output.
+
+    Each page's content stream is Flate-compressed and written as soon as the
+    page fills up, so only one page is ever held in memory. Byte offsets are
+    counted here rather than with tell(), which lets output be a socket-like
+    sink. close() writes the page tree, xref table and trailer.
+    """
+
+    def __init__(self, output, title: str = "", page_width: float = 612, page_height: float = 792,
+                 margin: float = 40, font_size: float = 10, line_spacing: float = 1.35):
+        self.output = output
+        self.title = title
+        self.page_width = page_width
+        self.page_height = page_height
+        self.margin = margin
+        self.font_size = font_size
+        self.line_spacing = line_spacing
+        self.text_width = page_width - 2 * margin
+
+        self._position = 0
+        self._offsets = {}
+        self._next_id = FIRST_FREE_ID
+        self._page_ids = []
+        self._operations = []
+        self._y = None
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(FONT_ID, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._write_object(
+            BOLD_FONT_ID, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"
+        )
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids) + (0 if self._y is None else 1)
+
+    def _write(self, data: bytes):
+        self.output.write(data)
+        self._position += len(data)
+
+    def _write_object(self, object_id: int, body: bytes):
+        self._offsets[object_id] = self._position
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _flush_page(self):
+        if self._y is None:
+            return
+
+        page_number = len(self._page_ids) + 1
+        footer = b"BT /F1 8 Tf 1 0 0 1 %.2f %.2f Tm (Page %d) Tj ET" % (
+            self.page_width - self.margin - 40, self.margin / 2, page_number,
+        )
+        stream = zlib.compress(b"\n".join(self._operations + [footer]), 6)
+
+        content_id = self._allocate()
+        self._write_object(
+            content_id,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        )
+        page_id = self._allocate()
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (
+                PAGES_ID, str(self.page_width).encode(), str(self.page_height).encode(), FONT_ID, BOLD_FONT_ID,
+                content_id,
+            ),
+        )
+        self._page_ids.append(page_id)
+        self._operations = []
+        self._y = None
+
+    def _line(self, text: str, font: str, size: float):
+        height = size * self.line_spacing
+        if self._y is None:
+            self._y = self.page_height - self.margin - size
+        elif self._y - height < self.margin:
+            self._flush_page()
+            self._y = self.page_height - self.margin - size
+        else:
+            self._y -= height
+        if text:
+            self._operations.append(
+                b"BT /%s %.1f Tf 1 0 0 1 %.2f %.2f Tm (%s) Tj ET" % (
+                    font.encode(), size, self.margin, self._y, _escape(text),
+                )
+            )
+
+    def heading(self, text: str, level: int = 1):
+        size = self.font_size + (6 if level <= 1 else 2)
+        if self._y is not None:
+            self._line("", "F1", self.font_size * 0.6)
+        for line in wrap_text(text, self.text_width / BOLD_WIDTH_FACTOR, size):
+            self._line(line, "F2", size)
+
+    def paragraph(self, text: str):
+        for line in wrap_text(text, self.text_width, self.font_size):
+            self._line(line, "F1", self.font_size)
+
+    def spacer(self):
+        self._line("", "F1", self.font_size)
+
+    def page_break(self):
+        self._flush_page()
+
+    def close(self):
+        self._flush_page()
+        if not self._page_ids:
+            self._line("", "F1", self.font_size)
+            self._flush_page()
+
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._write_object(PAGES_ID, b"<< /Type /Pages /Count %d /Kids [%s] >>" % (len(self._page_ids), kids))
+        self._write_object(CATALOG_ID, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES_ID)
+        self._write_object(INFO_ID, b"<< /Title (%s) /Producer (AI Resume Scanner) >>" % _escape(self.title))
+
+        xref_start = self._position
+        size = self._next_id
+        entries = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for object_id in range(1, size):
+            entries.append(b"%010d 00000 n \n" % self._offsets[object_id])
+        self._write(b"".join(entries))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+                size, CATALOG_ID, INFO_ID, xref_start,
+            )
+        )
+
+
+class _ChunkSink:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data: bytes):
+        self.chunks.append(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_pdf(blocks, title: str = "", **options):
+    """Yields a PDF built from (kind, text) blocks as each page is finished.
+
+    kind is "heading", "subheading", "paragraph", "spacer" or "page_break".
+    Blocks are consumed lazily, so a report for thousands of candidates is
+    streamed with constant memory.
+    """
+    sink = _ChunkSink()
+    report = PdfReport(sink, title=title, **options)
+    for kind, text in blocks:
+        if kind == "heading":
+            report.heading(text, level=1)
+        elif kind == "subheading":
+            report.heading(text, level=2)
+        elif kind == "paragraph":
+            report.paragraph(text)
+        elif kind == "spacer":
+            report.spacer()
+        elif kind == "page_break":
+            report.page_break()
+        else:
+            raise ValueError(f"Unknown PDF block: {kind}")
+        if sink.chunks:
+            yield sink.drain()
+    report.close()
+    yield sink.drain()
+
+
+def build_pdf(blocks, title: str = "", **options) -> bytes:
+    return b"".join(iter_pdf(blocks, title=title, **options))
@@ -1,17 +1,17 @@
 from pathlib import Path
 from flask import Flask, redirect
 
+from static_assets import AssetCache
+
 BASE_DIR = Path(__file__).resolve().parent
 app = Flask(__name__)
+pages = AssetCache(BASE_DIR)
+pages.preload("portal_index.html")
 
 
 @app.route("/", methods=["GET"])
 def home():
-    html_path = BASE_DIR / "portal_index.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as file:
-            return file.read()
-    return "<h1>Role Portal</h1><p>portal_index.html not found.</p>", 404
+    return pages.response("portal_index.html", "<h1>Role Portal</h1><p>portal_index.html not found.</p>")
 
 
 @app.route("/go/employer", methods=["GET"])
@@ -0,0 +1,102 @@
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been being below between both but by
+can could did do does doing down during each etc few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not of off on once only or other our
+out over own per same she should so some such than that the their them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with within
+would you your yours role job work team candidate candidates experience years year responsibilities
+requirements required preferred skills ability strong good using use including
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [
+        token for token in TOKEN_PATTERN.findall((text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _weights(counts: Counter, idf: dict) -> dict:
+    vector = {term: (1.0 + math.log(count)) * idf[term] for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def score_matrix(job_descriptions, resume_texts) -> list:
+    """TF-IDF cosine similarity (0-100) of every JD against every resume.
+
+    Returns one row per job description. IDF is fitted on the batch itself, so
+    no model or API key is needed and the result is deterministic. Every
+    resume is tokenized once however many JDs there are; with NumPy the
+    dot products run as one matrix product.
+    """
+    jd_counts = [Counter(tokenize(text)) for text in job_descriptions]
+    vocabulary = set()
+    for counts in jd_counts:
+        vocabulary.update(counts)
+
+    # Only JD terms can contribute to a dot product, so resumes are reduced
+    # to that vocabulary before weighting (but normalized on all terms).
+    resume_counts = [Counter(tokenize(text)) for text in resume_texts]
+    documents = len(resume_counts) + len(jd_counts)
+    document_frequency = Counter()
+    for counts in resume_counts + jd_counts:
+        document_frequency.update(counts.keys())
+    idf = {term: math.log((1 + documents) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+
+    jd_vectors = [_weights(counts, idf) for counts in jd_counts]
+    resume_vectors = []
+    for counts in resume_counts:
+        vector = _weights(counts, idf)
+        resume_vectors.append({term: vector[term] for term in vocabulary if term in vector})
+
+    if NUMPY_AVAILABLE and jd_vectors and resume_vectors:
+        return _matrix_product(jd_vectors, resume_vectors, vocabulary)
+
+    matrix = []
+    for jd_vector in jd_vectors:
+        row = []
+        for resume_vector in resume_vectors:
+            similarity = sum(weight * jd_vector[term] for term, weight in resume_vector.items() if term in jd_vector)
+            row.append(round(100.0 * similarity, 1))
+        matrix.append(row)
+    return matrix
+
+
+def _matrix_product(jd_vectors: list, resume_vectors: list, vocabulary: set) -> list:
+    columns = {term: column for column, term in enumerate(sorted(vocabulary))}
+    jds = numpy.zeros((len(jd_vectors), len(columns)))
+    for row, vector in enumerate(jd_vectors):
+        for term, weight in vector.items():
+            jds[row, columns[term]] = weight
+    resumes = numpy.zeros((len(resume_vectors), len(columns)))
+    for row, vector in enumerate(resume_vectors):
+        for term, weight in vector.items():
+            resumes[row, columns[term]] = weight
+    return numpy.round(100.0 * (jds @ resumes.T), 1).tolist()
+
+
+def score_resumes(job_description: str, resume_texts) -> list:
+    return score_matrix([job_description], resume_texts)[0]
+
+
+def shortlist(scores, top_n=None, min_score=None) -> set:
+    """Indices of the resumes worth sending to the LLM."""
+    ranked = sorted(range(len(scores)), key=lambda position: (-scores[position], position))
+    if min_score is not None:
+        ranked = [position for position in ranked if scores[position] >= min_score]
+    if top_n is not None:
+        ranked = ranked[:max(0, top_n)]
+    return set(ranked)
@@ -0,0 +1,211 @@
+import os
+import re
+from collections import Counter
+
+from prescreen import tokenize
+
+HORIZONTAL_SPACE = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u202f\u3000]+")
+CONTROL_CHARS = re.compile(r"[\x00-\x08\x0e-\x1f\x7f\ufffd]")
+# Only explicit "Page 2", "Page 2 of 3" or "Pg. 2/3" markers: bare numbers
+# and number pairs are often years or ratings.
+PAGE_NUMBER = re.compile(r"^(?:-\s*)?(?:page|pg\.?)\s*\d+\s*(?:(?:/|of)\s*\d+)?(?:\s*-)?$", re.IGNORECASE)
+PAGE_LINE = re.compile(r"\bpage\s*\d+", re.IGNORECASE)
+DIGITS = re.compile(r"\d+")
+SENTENCE_END = re.compile(r"(?<=[.;!?])\s+")
+LONG_LINE_CHARS = 400
+TRIM_MARKER = "[...]"
+MIN_PARTIAL_LINE_CHARS = 80
+
+# Heading text (lowercased, without a trailing colon) -> section kind.
+SECTION_ALIASES = {
+    "summary": "summary", "professional summary": "summary", "profile": "summary", "objective": "summary",
+    "career objective": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment": "experience", "employment history": "experience", "work history": "experience",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills", "core competencies": "skills",
+    "technologies": "skills", "tech stack": "skills",
+    "projects": "projects", "key projects": "projects", "personal projects": "projects",
+    "education": "education", "academic background": "education", "qualifications": "requirements",
+    "certifications": "certifications", "certificates": "certifications", "licenses": "certifications",
+    "achievements": "achievements", "awards": "achievements", "accomplishments": "achievements",
+    "publications": "publications", "languages": "languages", "volunteering": "volunteer",
+    "volunteer experience": "volunteer", "interests": "interests", "hobbies": "interests",
+    "references": "references",
+    "responsibilities": "responsibilities", "what you'll do": "responsibilities", "duties": "responsibilities",
+    "the role": "responsibilities", "requirements": "requirements", "must have": "requirements",
+    "what we're looking for": "requirements", "who you are": "requirements", "nice to have": "preferred",
+    "preferred qualifications": "preferred", "bonus points": "preferred", "about us": "about",
+    "about the company": "about", "who we are": "about", "benefits": "benefits", "perks": "benefits",
+    "what we offer": "benefits", "equal opportunity": "eeo", "equal opportunity employer": "eeo",
+}
+# How much a section is worth keeping when the text is over budget. "header"
+# is whatever precedes the first heading (name, title, contact line).
+SECTION_WEIGHTS = {
+    "header": 3.0, "experience": 3.0, "skills": 3.0, "requirements": 3.0, "summary": 2.5,
+    "responsibilities": 2.5, "projects": 2.0, "preferred": 2.0, "certifications": 1.5, "education": 1.5,
+    "achievements": 1.5, "other": 1.0, "publications": 1.0, "languages": 1.0, "volunteer": 0.8,
+    "about": 0.6, "interests": 0.3, "benefits": 0.3, "references": 0.1, "eeo": 0.1,
+}
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET") or 3000)
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET") or 1500)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // 4 + 1
+
+
+class CompactedText:
+    def __init__(self, text: str, original_tokens: int, tokens: int):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.tokens = tokens
+
+    @property
+    def saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def as_dict(self) -> dict:
+        return {"original": self.original_tokens, "sent": self.tokens, "saved": self.saved}
+
+
+def _section_kind(line: str):
+    label = line.strip(" -*\u2022:#").lower()
+    if label in SECTION_ALIASES:
+        return SECTION_ALIASES[label]
+    letters = [char for char in label if char.isalpha()]
+    if letters and len(line) <= 40 and len(label.split()) <= 4 and line.strip(" :").isupper():
+        return "other"
+    return None
+
+
+def _split_long_line(line: str):
+    # Extractors sometimes return a whole page as one line; sentences give
+    # the selection below something finer to work with.
+    if len(line) <= LONG_LINE_CHARS:
+        return [line]
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(line):
+        if current and len(current) + len(sentence) > LONG_LINE_CHARS:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+        while len(current) > LONG_LINE_CHARS * 2:
+            pieces.append(current[:LONG_LINE_CHARS])
+            current = current[LONG_LINE_CHARS:]
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _is_garbage(line: str) -> bool:
+    # OCR noise and broken font encodings: mostly symbols, hardly any words.
+    if len(line) < 8:
+        return False
+    readable = sum(1 for char in line if char.isalnum() or char.isspace())
+    return readable / len(line) < 0.5
+
+
+def clean_lines(text: str) -> list:
+    """Normalized lines with page markers, running headers/footers, garbage
+    and repeated lines removed. Blank lines are collapsed to one."""
+    lines = []
+    for raw in (text or "").splitlines():
+        line = HORIZONTAL_SPACE.sub(" ", CONTROL_CHARS.sub("", raw)).strip()
+        lines.extend(_split_long_line(line))
+
+    # A short line that recurs with only its numbers changed ("Jane Doe -
+    # Page 2 of 4") is a running header or footer.
+    page_keys = Counter(
+        DIGITS.sub("#", line.lower()) for line in lines
+        if line and len(line) <= 80 and PAGE_LINE.search(line)
+    )
+
+    cleaned, seen = [], set()
+    for line in lines:
+        if not line:
+            if cleaned and cleaned[-1]:
+                cleaned.append("")
+            continue
+        if PAGE_NUMBER.match(line) or _is_garbage(line):
+            continue
+        if PAGE_LINE.search(line) and page_keys[DIGITS.sub("#", line.lower())] > 1:
+            continue
+        if line in seen and _section_kind(line) is None:
+            continue
+        seen.add(line)
+        cleaned.append(line)
+    while cleaned and not cleaned[-1]:
+        cleaned.pop()
+    return cleaned
+
+
+def _sections(lines: list) -> list:
+    sections = [["header", []]]
+    for line in lines:
+        kind = _section_kind(line) if line else None
+        if kind is not None:
+            sections.append([kind, []])
+        sections[-1][1].append(line)
+    return [section for section in sections if any(section[1])]
+
+
+def _cost(lines) -> int:
+    # Characters the lines take up once joined with newlines.
+    return sum(len(line) + 1 for line in lines)
+
+
+def compact_text(text: str, max_tokens: int = 0, job_description: str = "") -> CompactedText:
+    """Cleans text and, when it is still over max_tokens, keeps its highest
+    signal sections.
+
+    Sections are ranked by a per-kind weight boosted by how many of the job
+    description's terms they contain. Whole sections are kept best first;
+    a section that does not fit keeps its leading lines (the most recent
+    roles, for reverse-chronological resumes) and is marked with [...].
+    The kept sections stay in their original order. Text that is within
+    max_tokens once cleaned is only cleaned; max_tokens <= 0 only cleans.
+    """
+    original_tokens = estimate_tokens(text)
+    lines = clean_lines(text)
+    compacted = "\n".join(lines)
+    if max_tokens <= 0 or estimate_tokens(compacted) <= max_tokens:
+        return CompactedText(compacted, original_tokens, estimate_tokens(compacted))
+
+    jd_terms = set(tokenize(job_description))
+    sections = _sections(lines)
+    scores = []
+    for position, (kind, section_lines) in enumerate(sections):
+        terms = set(tokenize(" ".join(section_lines)))
+        relevance = len(terms & jd_terms) / len(terms) if terms and jd_terms else 0.0
+        scores.append((-SECTION_WEIGHTS.get(kind, 1.0) * (1.0 + 4.0 * relevance), position))
+
+    # Budgeting in characters keeps it exact with estimate_tokens().
+    remaining = max_tokens * 4 - 3
+    marker_cost = _cost([TRIM_MARKER])
+    kept = {}
+    for _, position in sorted(scores):
+        section_lines = sections[position][1]
+        if _cost(section_lines) <= remaining:
+            kept[position] = section_lines
+            remaining -= _cost(section_lines)
+            continue
+
+        # The heading alone is not worth keeping, so a partial section needs
+        # room for at least some of its body.
+        partial = []
+        for line in section_lines:
+            room = remaining - marker_cost - _cost(partial)
+            if len(line) + 1 <= room:
+                partial.append(line)
+            elif room > MIN_PARTIAL_LINE_CHARS:
+                partial.append(line[:room - 1])
+                break
+            else:
+                break
+        if any(_section_kind(line) is None for line in partial if line):
+            kept[position] = partial + [TRIM_MARKER]
+            remaining -= _cost(kept[position])
+
+    compacted = "\n".join(line for position in sorted(kept) for line in kept[position])
+    return CompactedText(compacted, original_tokens, estimate_tokens(compacted))
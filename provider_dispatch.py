@@ -0,0 +1,366 @@
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from queue import Empty, Queue
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, AuthenticationError
+
+
+class EmptyResponseError(Exception):
+    pass
+
+
+class ProviderUnavailableError(Exception):
+    pass
+
+
+class HedgeCancelledError(Exception):
+    pass
+
+
+LATENCY_SAMPLES = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Refills rate_per_minute units per minute up to one minute of burst."""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.available = rate_per_minute
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        # Blocks until amount units are free and returns the seconds waited.
+        if self.rate_per_second <= 0:
+            return 0.0
+
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate_per_second)
+                self.updated_at = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return waited
+                delay = (amount - self.available) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures; one probe is let through after reset_seconds."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> bool:
+        # Returns True when this failure (re)opens the breaker.
+        with self._lock:
+            self.failures += 1
+            was_probing = self.probing
+            self.probing = False
+            if was_probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class ProviderDispatcher:
+    """Sends one logical request down the provider fallback chain.
+
+    Each provider gets request and token rate limits, jittered exponential
+    backoff on 429/5xx/connection errors, and a circuit breaker that skips it
+    while it is unhealthy.
+
+    With hedging on, a request the first provider has not answered within
+    its recent p90 latency (hedge_quantile) is also sent down the rest of the
+    chain, and whichever valid response arrives first wins.
+    """
+
+    COUNTERS = (
+        "requests", "successes", "retries", "rate_limited", "server_errors", "connection_errors",
+        "auth_failures", "other_errors", "circuit_opens", "short_circuits", "throttle_wait_seconds",
+        "hedges", "hedge_wins", "hedge_wasted_requests", "hedge_extra_tokens",
+    )
+
+    def __init__(self, limits=None, max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 20.0,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0, hedging: bool = False,
+                 hedge_delay: float = 8.0, hedge_quantile: float = 0.9):
+        # limits: {provider: (requests_per_minute, tokens_per_minute)}, 0 = unlimited.
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        # hedge_delay is used until MIN_LATENCY_SAMPLES successes have been
+        # seen, or always when hedge_quantile is 0.
+        self.hedging = hedging
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    def _state(self, provider: str) -> dict:
+        with self._lock:
+            state = self._providers.get(provider)
+            if state is None:
+                requests_per_minute, tokens_per_minute = self.limits.get(provider, (0, 0))
+                state = {
+                    "requests_bucket": TokenBucket(requests_per_minute),
+                    "tokens_bucket": TokenBucket(tokens_per_minute),
+                    "breaker": CircuitBreaker(self.failure_threshold, self.reset_seconds),
+                    "counters": dict.fromkeys(self.COUNTERS, 0),
+                    "latencies": deque(maxlen=LATENCY_SAMPLES),
+                }
+                self._providers[provider] = state
+            return state
+
+    def _count(self, state: dict, counter: str, amount=1):
+        with self._lock:
+            state["counters"][counter] += amount
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        retry_after = None
+        response = getattr(exc, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        if isinstance(exc, (APIConnectionError, APITimeoutError)):
+            return True
+        if isinstance(exc, APIStatusError):
+            return exc.status_code == 429 or exc.status_code >= 500
+        return False
+
+    def hedge_delay_for(self, provider: str) -> float:
+        state = self._state(provider)
+        with self._lock:
+            samples = sorted(state["latencies"])
+        if self.hedge_quantile <= 0 or len(samples) < MIN_LATENCY_SAMPLES:
+            return self.hedge_delay
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_quantile))]
+
+    def call(self, clients, request_fn, estimated_tokens: int = 0, discard=None):
+        """Returns (provider, request_fn(provider, client)) from the first healthy provider.
+
+        discard(result) is called for a hedged request's losing result, e.g.
+        to close a stream nobody will read.
+        """
+        clients = list(clients)
+        if self.hedging and len(clients) > 1:
+            return self._hedged_call(clients, request_fn, estimated_tokens, discard)
+        return self._call_chain(clients, request_fn, estimated_tokens)
+
+    def _hedged_call(self, clients, request_fn, estimated_tokens: int, discard):
+        outcomes = Queue()
+        cancelled = threading.Event()
+        # chain name -> providers of the requests it actually sent
+        sent = {"primary": [], "hedge": []}
+        chains = {"primary": clients[:1], "hedge": clients[1:]}
+
+        def run(name):
+            try:
+                result = self._call_chain(chains[name], request_fn, estimated_tokens, cancelled, sent[name])
+                outcomes.put((name, result, None))
+            except Exception as exc:
+                outcomes.put((name, None, exc))
+
+        def launch(name):
+            # Each thread runs in its own copy of the caller's context so
+            # per-request metrics still land on the request.
+            threading.Thread(target=contextvars.copy_context().run, args=(run, name), daemon=True).start()
+
+        launch("primary")
+        try:
+            _, result, error = outcomes.get(timeout=self.hedge_delay_for(clients[0][0]))
+        except Empty:
+            self._count(self._state(clients[1][0]), "hedges")
+            launch("hedge")
+        else:
+            if error is None:
+                return result
+            # The primary failed outright, so this is a plain fallback.
+            return self._call_chain(chains["hedge"], request_fn, estimated_tokens)
+
+        errors = {}
+        for _ in range(2):
+            name, result, error = outcomes.get()
+            if error is not None:
+                errors[name] = error
+                continue
+            cancelled.set()
+            self._count(self._state(result[0]), "hedge_wins")
+            loser = "hedge" if name == "primary" else "primary"
+            if loser in errors:
+                self._count_hedge_waste(loser, errors[loser], sent[loser], estimated_tokens)
+            else:
+                threading.Thread(
+                    target=self._settle_loser, args=(outcomes, sent[loser], discard, estimated_tokens), daemon=True
+                ).start()
+            return result
+        errors = list(errors.values())
+        raise next((exc for exc in errors if not isinstance(exc, AuthenticationError)), errors[-1])
+
+    def _settle_loser(self, outcomes, sent: list, discard, estimated_tokens: int):
+        name, result, error = outcomes.get()
+        if result is not None and discard is not None:
+            discard(result[1])
+        self._count_hedge_waste(name, error, sent, estimated_tokens)
+
+    def _count_hedge_waste(self, name: str, error, sent: list, estimated_tokens: int):
+        # Every request the losing chain sent is paid for, whether it was
+        # answered late, failed or was cancelled between retries. A primary
+        # that failed on its own would have been paid for without hedging.
+        if name == "primary" and error is not None and not isinstance(error, HedgeCancelledError):
+            return
+        for provider in sent:
+            state = self._state(provider)
+            self._count(state, "hedge_wasted_requests")
+            self._count(state, "hedge_extra_tokens", estimated_tokens)
+
+    def _call_chain(self, clients, request_fn, estimated_tokens: int = 0, cancelled=None, sent=None):
+        last_error = None
+        last_auth_error = None
+        attempted = 0
+
+        for provider, client in clients:
+            state = self._state(provider)
+            breaker = state["breaker"]
+            if not breaker.allow():
+                self._count(state, "short_circuits")
+                continue
+            attempted += 1
+
+            for attempt in range(self.max_retries + 1):
+                if cancelled is not None and cancelled.is_set():
+                    raise HedgeCancelledError(f"{provider} request was cancelled by a faster hedge.")
+                waited = state["requests_bucket"].acquire(1)
+                waited += state["tokens_bucket"].acquire(estimated_tokens)
+                if waited:
+                    self._count(state, "throttle_wait_seconds", round(waited, 3))
+                self._count(state, "requests")
+
+                started = time.monotonic()
+                if sent is not None:
+                    sent.append(provider)
+                try:
+                    result = request_fn(provider, client)
+                except AuthenticationError as exc:
+                    self._count(state, "auth_failures")
+                    breaker.record_success()
+                    last_auth_error = exc
+                    break
+                except Exception as exc:
+                    last_error = exc
+                    if not self._is_retryable(exc):
+                        self._count(state, "other_errors")
+                        breaker.record_success()
+                        break
+
+                    if isinstance(exc, APIStatusError):
+                        self._count(state, "rate_limited" if exc.status_code == 429 else "server_errors")
+                    else:
+                        self._count(state, "connection_errors")
+
+                    if attempt >= self.max_retries:
+                        if breaker.record_failure():
+                            self._count(state, "circuit_opens")
+                        break
+                    self._count(state, "retries")
+                    if cancelled is not None:
+                        cancelled.wait(self._backoff(attempt, exc))
+                    else:
+                        time.sleep(self._backoff(attempt, exc))
+                    continue
+
+                breaker.record_success()
+                self._count(state, "successes")
+                with self._lock:
+                    state["latencies"].append(time.monotonic() - started)
+                return provider, result
+
+        # Auth errors only surface when no provider failed for another reason.
+        if last_error is not None:
+            raise last_error
+        if last_auth_error is not None:
+            raise last_auth_error
+        if clients and not attempted:
+            raise ProviderUnavailableError("All AI providers are temporarily unavailable. Please retry shortly.")
+        raise RuntimeError("No AI provider returned a response.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = {
+                provider: dict(state["counters"], circuit=state["breaker"].state)
+                for provider, state in self._providers.items()
+            }
+        return snapshot
+
+
+def dispatcher_from_env() -> ProviderDispatcher:
+    return ProviderDispatcher(
+        limits={
+            "perplexity": (_env_number("PPLX_RPM", 0), _env_number("PPLX_TPM", 0)),
+            "openai": (_env_number("OPENAI_RPM", 0), _env_number("OPENAI_TPM", 0)),
+        },
+        max_retries=int(_env_number("PROVIDER_MAX_RETRIES", 3)),
+        backoff_base=_env_number("PROVIDER_BACKOFF_BASE", 0.5),
+        backoff_cap=_env_number("PROVIDER_BACKOFF_CAP", 20),
+        failure_threshold=int(_env_number("CIRCUIT_FAILURE_THRESHOLD", 5)),
+        reset_seconds=_env_number("CIRCUIT_RESET_SECONDS", 30),
+        hedging=(os.getenv("PROVIDER_HEDGING") or "").strip().lower() in ("1", "true", "yes", "on"),
+        hedge_delay=_env_number("PROVIDER_HEDGE_DELAY", 8),
+        hedge_quantile=_env_number("PROVIDER_HEDGE_QUANTILE", 0.9),
+    )
@@ -1,35 +1,31 @@
 from pathlib import Path
 from flask import Flask
 
+from static_assets import AssetCache
+
 BASE_DIR = Path(__file__).resolve().parent
 app = Flask(__name__)
+pages = AssetCache(BASE_DIR)
+pages.preload("portal_index.html", "employer_prototype.html", "job_seeker_prototype.html")
 
 
 @app.route("/", methods=["GET"])
 def home():
-    html_path = BASE_DIR / "portal_index.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as file:
-            return file.read()
-    return "<h1>Role Portal</h1><p>portal_index.html not found.</p>", 404
+    return pages.response("portal_index.html", "<h1>Role Portal</h1><p>portal_index.html not found.</p>")
 
 
 @app.route("/go/employer", methods=["GET"])
 def go_employer():
-    html_path = BASE_DIR / "employer_prototype.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as file:
-            return file.read()
-    return "<h1>Employer Prototype</h1><p>employer_prototype.html not found.</p>", 404
+    return pages.response(
+        "employer_prototype.html", "<h1>Employer Prototype</h1><p>employer_prototype.html not found.</p>"
+    )
 
 
 @app.route("/go/job-seeker", methods=["GET"])
 def go_job_seeker():
-    html_path = BASE_DIR / "job_seeker_prototype.html"
-    if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as file:
-            return file.read()
-    return "<h1>Job Seeker Prototype</h1><p>job_seeker_prototype.html not found.</p>", 404
+    return pages.response(
+        "job_seeker_prototype.html", "<h1>Job Seeker Prototype</h1><p>job_seeker_prototype.html not found.</p>"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+import heapq
+import itertools
+
+
+def rank_key(index: int, row: dict) -> tuple:
+    # Screened-out rows sort after analyzed ones; ties fall back to the local
+    # score and then upload order, matching the ranking of a serial run.
+    return (
+        row.get("status") == "screened_out",
+        -row.get("match_score", 0),
+        -row.get("local_score", 0),
+        index,
+    )
+
+
+class TopK:
+    """The k best rows seen so far, by rank_key.
+
+    Rows are kept in a heap with the worst one on top, so memory stays at k
+    rows and a row that misses the cut costs one comparison, however many
+    rows a run produces.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, index: int, row: dict):
+        """Adds a row and returns its 1-based rank among the current top k,
+        or None when it does not make the cut."""
+        key = rank_key(index, row)
+        # heapq is a min-heap: negating the key puts the worst row on top.
+        entry = (tuple(-part for part in key), -next(self._sequence), row)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k and entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return None
+        return 1 + sum(1 for other in self._heap if other[0] > entry[0])
+
+    def rows(self) -> list:
+        return [row for _, _, row in sorted(self._heap, reverse=True)]
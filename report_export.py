@@ -0,0 +1,91 @@
+import codecs
+import csv
+import os
+import tempfile
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.styles import Font
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+CSV_ROWS_PER_CHUNK = 256
+FILE_CHUNK_SIZE = 64 * 1024
+# Excel rejects cells longer than this.
+XLSX_CELL_LIMIT = 32767
+
+
+class _LineBuffer:
+    # csv.writer only needs write(); returning the line lets each row be yielded.
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Yields a UTF-8 (with BOM, for Excel) CSV document a few rows at a time.
+
+    Rows are pulled lazily from the iterable, so memory use does not grow
+    with the number of rows and the first chunk is sent straight away.
+    """
+    writer = csv.writer(_LineBuffer())
+    yield codecs.BOM_UTF8
+
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= CSV_ROWS_PER_CHUNK:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def _xlsx_value(value):
+    # Text extracted from PDFs can carry control characters that openpyxl
+    # refuses to write, which would cut a streamed download short.
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)[:XLSX_CELL_LIMIT]
+    return value
+
+
+def iter_xlsx(sheet_title: str, rows, bold_rows=()):
+    """Yields an .xlsx workbook built with openpyxl's write-only mode.
+
+    Write-only sheets spill rows to a temporary file instead of keeping a
+    cell tree in memory. The finished workbook is also written to a temp
+    file and streamed back in fixed-size chunks, then deleted.
+    """
+    if not EXCEL_AVAILABLE:
+        raise RuntimeError("Excel export not available. Install openpyxl: pip install openpyxl")
+
+    bold_rows = set(bold_rows)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    bold = Font(bold=True)
+
+    for number, row in enumerate(rows):
+        if number in bold_rows:
+            cells = []
+            for value in row:
+                cell = WriteOnlyCell(sheet, value=_xlsx_value(value))
+                cell.font = bold
+                cells.append(cell)
+            sheet.append(cells)
+        else:
+            sheet.append([_xlsx_value(value) for value in row])
+
+    handle, path = tempfile.mkstemp(prefix="export-", suffix=".xlsx")
+    os.close(handle)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as stream:
+            while True:
+                chunk = stream.read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.unlink(path)
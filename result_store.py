@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    scan_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+
+class ResultStore:
+    """Scan results shared by every worker process through one SQLite file.
+
+    Payloads are stored as zlib-compressed JSON. Entries expire ttl_seconds
+    after they were written, and the least recently read ones are dropped
+    beyond max_entries.
+    """
+
+    def __init__(self, path, max_entries: int = 1000, ttl_seconds: float = 72 * 3600):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def save(self, scan_id: str, kind: str, payload: dict) -> str:
+        now = time.time()
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO results (scan_id, kind, payload, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (scan_id, kind, blob, now, now),
+        )
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % 20 == 0
+        if should_evict:
+            self.evict()
+        return scan_id
+
+    def load(self, scan_id: str, kind: str = None):
+        if not scan_id:
+            return None
+
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT kind, payload, created_at FROM results WHERE scan_id = ?", (scan_id,)
+        ).fetchone()
+        if row is None or (kind is not None and row[0] != kind):
+            return None
+        if time.time() - row[2] > self.ttl_seconds:
+            conn.execute("DELETE FROM results WHERE scan_id = ?", (scan_id,))
+            return None
+
+        conn.execute("UPDATE results SET last_access = ? WHERE scan_id = ?", (time.time(), scan_id))
+        return json.loads(zlib.decompress(row[1]).decode("utf-8"))
+
+    def evict(self) -> int:
+        conn = self._connect()
+        removed = conn.execute(
+            "DELETE FROM results WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM results WHERE scan_id IN (SELECT scan_id FROM results ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return removed
+
+
+def result_store_from_env(default_path) -> ResultStore:
+    return ResultStore(
+        os.getenv("RESULT_STORE_PATH") or default_path,
+        max_entries=int(os.getenv("RESULT_STORE_MAX_ENTRIES") or 1000),
+        ttl_seconds=float(os.getenv("RESULT_STORE_TTL_HOURS") or 72) * 3600,
+    )
@@ -4,15 +4,26 @@ Simple local HTTP server for the AI Hiring Portal
 Accessible from all devices on the local network
 Run this script to serve the website
 """
+import argparse
+import email.utils
+import gzip
 import http.server
-import socketserver
+import io
 import os
 import socket
+import threading
 import webbrowser
 from pathlib import Path
+from queue import Queue
 
 PORT = 8000
-HANDLER = http.server.SimpleHTTPRequestHandler
+WORKERS = 16
+# Idle keep-alive connections are closed after this many seconds so they do
+# not hold on to a worker thread.
+KEEP_ALIVE_TIMEOUT = 15
+GZIP_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+GZIP_MIN_BYTES = 1024
+GZIP_MAX_BYTES = 8 * 1024 * 1024
 
 # Change to the directory containing this script
 os.chdir(Path(__file__).parent)
@@ -28,28 +39,184 @@ def get_local_ip():
     except:
         return "127.0.0.1"
 
-try:
-    local_ip = get_local_ip()
-    
-    # Listen on all network interfaces
-    with socketserver.TCPServer(("0.0.0.0", PORT), HANDLER) as httpd:
-        localhost_url = f"http://localhost:{PORT}"
-        network_url = f"http://{local_ip}:{PORT}"
-        
-        print(f"\n✓ Server started successfully!\n")
-        print(f"  Local device:  {localhost_url}")
-        print(f"  Other devices: {network_url}")
-        print(f"\n  To access from other devices, use: {network_url}")
-        print(f"  Press Ctrl+C to stop\n")
-        
+
+class CachingRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with keep-alive, ETag/Last-Modified and gzip.
+
+    Compressed bodies are cached in memory per file and rebuilt when the
+    file's mtime or size changes.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    _gzip_cache = {}
+    _gzip_lock = threading.Lock()
+
+    def _resolve(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split("?", 1)[0].endswith("/"):
+                return None
+            for index in ("index.html", "index.htm"):
+                candidate = os.path.join(path, index)
+                if os.path.isfile(candidate):
+                    return candidate
+            return None
+        return path if os.path.isfile(path) else None
+
+    def _accepts_gzip(self) -> bool:
+        for part in (self.headers.get("Accept-Encoding") or "").split(","):
+            coding, _, params = part.strip().partition(";")
+            if coding.strip().lower() in ("gzip", "*"):
+                return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+        return False
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag in (etag, "W/" + etag) for tag in tags)
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def _gzipped(self, path: str, stat) -> bytes:
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._gzip_lock:
+            cached = self._gzip_cache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        with open(path, "rb") as source:
+            body = gzip.compress(source.read(), compresslevel=6, mtime=0)
+        with self._gzip_lock:
+            self._gzip_cache[path] = (key, body)
+        return body
+
+    def send_head(self):
+        path = self._resolve()
+        if path is None:
+            # Directory redirects, listings and 404s keep the stock behavior.
+            return super().send_head()
+
         try:
-            webbrowser.open(localhost_url)
-        except:
-            pass
-        
-        httpd.serve_forever()
-except KeyboardInterrupt:
-    print("\n\n✓ Server stopped")
-except OSError as e:
-    print(f"✗ Error: {e}")
-    print(f"  Port {PORT} may already be in use.")
+            stat = os.stat(path)
+        except OSError:
+            return super().send_head()
+
+        content_type = self.guess_type(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        compressible = (
+            content_type.startswith(GZIP_TYPES)
+            and GZIP_MIN_BYTES <= stat.st_size <= GZIP_MAX_BYTES
+        )
+        use_gzip = compressible and self._accepts_gzip()
+        if use_gzip:
+            etag = etag[:-1] + '-gz"'
+
+        if self._not_modified(etag, stat.st_mtime):
+            self.send_response(304)
+            self._send_validators(etag, stat, compressible)
+            self.end_headers()
+            return None
+
+        if use_gzip:
+            body = self._gzipped(path, stat)
+            stream = io.BytesIO(body)
+            length = len(body)
+        else:
+            stream = open(path, "rb")
+            length = stat.st_size
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self._send_validators(etag, stat, compressible)
+        self.end_headers()
+        return stream
+
+    def _send_validators(self, etag: str, stat, compressible: bool):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(stat.st_mtime))
+        self.send_header("Cache-Control", "no-cache")
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """Handles each connection on a fixed pool of worker threads.
+
+    Workers are daemon threads so Ctrl+C does not wait for idle keep-alive
+    connections to time out.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers: int = WORKERS):
+        super().__init__(server_address, handler_class)
+        self.connections = Queue()
+        for number in range(workers):
+            threading.Thread(target=self._worker, name=f"http-{number}", daemon=True).start()
+
+    def process_request(self, request, client_address):
+        self.connections.put((request, client_address))
+
+    def _worker(self):
+        while True:
+            request, client_address = self.connections.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the AI Hiring Portal on the local network.")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port to listen on (default {PORT})")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"connections served at the same time (default {WORKERS})")
+    parser.add_argument("--no-browser", action="store_true", help="do not open a browser tab on start")
+    args = parser.parse_args()
+    port = args.port
+
+    try:
+        local_ip = get_local_ip()
+
+        # Listen on all network interfaces
+        with PooledHTTPServer(("0.0.0.0", port), CachingRequestHandler, workers=max(1, args.workers)) as httpd:
+            localhost_url = f"http://localhost:{port}"
+            network_url = f"http://{local_ip}:{port}"
+
+            print(f"\n✓ Server started successfully!\n")
+            print(f"  Local device:  {localhost_url}")
+            print(f"  Other devices: {network_url}")
+            print(f"\n  To access from other devices, use: {network_url}")
+            print(f"  Press Ctrl+C to stop\n")
+
+            if not args.no_browser:
+                try:
+                    webbrowser.open(localhost_url)
+                except:
+                    pass
+
+            httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\n✓ Server stopped")
+    except OSError as e:
+        print(f"✗ Error: {e}")
+        print(f"  Port {port} may already be in use. Try: python simple_server.py --port 9000")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import mimetypes
+import threading
+import time
+from pathlib import Path
+
+from flask import Response, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+class StaticAsset:
+    """One file's bytes plus its precompressed variants and validators."""
+
+    def __init__(self, path: Path, mtime: float, body: bytes):
+        self.path = path
+        self.mtime = mtime
+        self.body = body
+        self.encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            self.encoded["br"] = brotli.compress(body)
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self.last_modified = int(mtime)
+        self.content_type = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+        if self.content_type.startswith("text/"):
+            self.content_type += "; charset=utf-8"
+
+
+class AssetCache:
+    """Serves files from root out of memory, reloading one when its mtime changes.
+
+    Files are stat()ed at most once per check_interval seconds. Responses carry
+    an ETag and Last-Modified and use Cache-Control: no-cache, so browsers
+    revalidate each time and usually get an empty 304.
+    """
+
+    def __init__(self, root, check_interval: float = 1.0):
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self._assets = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def preload(self, *names):
+        for name in names:
+            self.get(name)
+
+    def get(self, name: str):
+        now = time.monotonic()
+        asset = self._assets.get(name)
+        if asset is not None and now - self._checked_at.get(name, 0) < self.check_interval:
+            return asset
+
+        path = self.root / name
+        with self._lock:
+            self._checked_at[name] = now
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                self._assets.pop(name, None)
+                return None
+            asset = self._assets.get(name)
+            if asset is None or asset.mtime != mtime:
+                asset = StaticAsset(path, mtime, path.read_bytes())
+                self._assets[name] = asset
+            return asset
+
+    @staticmethod
+    def _not_modified(asset: StaticAsset) -> bool:
+        if request.if_none_match:
+            tags = [asset.etag] + [f"{asset.etag}-{encoding}" for encoding in asset.encoded]
+            return any(request.if_none_match.contains_weak(tag) for tag in tags)
+        if request.if_modified_since is not None:
+            return request.if_modified_since.timestamp() >= asset.last_modified
+        return False
+
+    def response(self, name: str, fallback_html: str = "Not found"):
+        asset = self.get(name)
+        if asset is None:
+            return fallback_html, 404
+
+        headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        body = asset.body
+        etag = asset.etag
+        for encoding in ("br", "gzip"):
+            if encoding in asset.encoded and request.accept_encodings[encoding]:
+                body = asset.encoded[encoding]
+                headers["Content-Encoding"] = encoding
+                # Each encoding is a different representation, so it gets its own tag.
+                etag = f"{asset.etag}-{encoding}"
+                break
+
+        if self._not_modified(asset):
+            headers.pop("Content-Encoding", None)
+            response = Response(status=304, headers=headers)
+        else:
+            response = Response(body, content_type=asset.content_type, headers=headers)
+
+        response.set_etag(etag)
+        response.last_modified = asset.last_modified
+        return response
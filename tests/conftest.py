@@ -0,0 +1,43 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live at the repository root rather than in a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _isolate(root):
+    # Points every store the apps open at import time into root.
+    for variable, name in (
+        ("ANALYSIS_CACHE_PATH", "analysis_cache.sqlite3"),
+        ("EXTRACTION_CACHE_PATH", "extraction_cache.sqlite3"),
+        ("RESULT_STORE_PATH", "results.sqlite3"),
+        ("CANDIDATE_INDEX_PATH", "candidates.sqlite3"),
+        ("BULK_JOBS_DIR", "bulk_jobs"),
+        ("UPLOAD_SPOOL_DIR", "spool"),
+    ):
+        os.environ[variable] = str(root / name)
+
+
+@pytest.fixture(scope="session")
+def bulk_app(tmp_path_factory):
+    """company_bulk_app with every store in a temporary directory and no
+    provider clients; tests stub analyze_resume where they need analyses."""
+    _isolate(tmp_path_factory.mktemp("bulk_app"))
+    import company_bulk_app
+
+    company_bulk_app.clients = []
+    return company_bulk_app
+
+
+@pytest.fixture(scope="session")
+def scan_app(tmp_path_factory):
+    """app (the single-resume scanner) with isolated stores and no clients."""
+    _isolate(tmp_path_factory.mktemp("scan_app"))
+    import app
+
+    app.clients = []
+    app.client = None
+    return app
@@ -0,0 +1,61 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from archive_ingest import ArchiveError, is_archive, iter_archive_members
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def test_is_archive():
+    assert is_archive("Resumes.ZIP") and is_archive("batch.tar.gz")
+    assert not is_archive("resume.pdf") and not is_archive(None)
+
+
+def test_zip_members_skip_noise_and_report_skips():
+    archive = _zip([
+        ("team/alice.txt", b"Alice resume"),
+        ("__MACOSX/team/._alice.txt", b"fork"),
+        ("team/.DS_Store", b"meta"),
+        ("team/photo.png", b"png"),
+        ("team/big.pdf", b"x" * 2048),
+    ])
+    members = list(iter_archive_members(archive, "resumes.zip", max_member_bytes=1024))
+    assert members[0] == ("team/alice.txt", b"Alice resume", None)
+    assert [name for name, _, _ in members] == ["team/alice.txt", "team/photo.png", "team/big.pdf"]
+    assert members[1][1] is None and "unsupported file type" in members[1][2]
+    assert members[2][1] is None and "per-file limit" in members[2][2]
+
+
+def test_tar_members_are_streamed():
+    archive = _tar([("bob.txt", b"Bob resume"), ("notes.md", b"notes")])
+    members = list(iter_archive_members(archive, "resumes.tgz"))
+    assert members[0] == ("bob.txt", b"Bob resume", None)
+    assert members[1][0] == "notes.md" and members[1][2]
+
+
+def test_broken_archive_raises():
+    with pytest.raises(ArchiveError):
+        list(iter_archive_members(io.BytesIO(b"not a zip"), "resumes.zip"))
+    with pytest.raises(ArchiveError):
+        list(iter_archive_members(io.BytesIO(b""), "resumes.rar"))
@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+import pytest
+
+from provider_dispatch import EmptyResponseError
+
+
+def _chat_client(content):
+    response = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    completions = SimpleNamespace(create=lambda **kwargs: response)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def test_empty_completion_raises(bulk_app):
+    with pytest.raises(EmptyResponseError):
+        bulk_app._request_completion("perplexity", _chat_client("  "), "prompt")
+
+
+def test_completion_text_is_returned(bulk_app):
+    assert bulk_app._request_completion("perplexity", _chat_client(" {} \n"), "prompt") == "{}"
@@ -0,0 +1,78 @@
+import io
+import random
+import threading
+
+from bulk_jobs import BulkJobRunner
+
+WORDS = [f"skill{number}" for number in range(3000)]
+
+
+def _resume(seed: int) -> bytes:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(150)).encode("utf-8")
+
+
+def test_duplicates_are_found_across_claimed_batches(bulk_app, monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def analyze_resume(resume_text, job_description, use_cache=True):
+        with lock:
+            calls.append(resume_text)
+        return {"match_score": 50, "summary": "ok"}
+
+    monkeypatch.setattr(bulk_app, "analyze_resume", analyze_resume)
+
+    texts = {f"f{number:02d}.txt": _resume(number) for number in range(70)}
+    texts["f01.txt"] = texts["f00.txt"]
+    texts["f40.txt"] = texts["f33.txt"]
+    texts["f65.txt"] = texts["f02.txt"]
+    job_id = bulk_app.job_store.create_job(
+        "JD", [(name, io.BytesIO(body)) for name, body in texts.items()], {"dedupe_threshold": 0.8}
+    )
+
+    runner = BulkJobRunner(bulk_app.job_store, bulk_app._run_job_items, batch_size=32)
+    while runner.run_once():
+        pass
+
+    job = bulk_app.job_store.get_job(job_id)
+    assert job["status"] == "completed"
+    assert job["processed"] == 70
+    assert len(calls) == 67
+
+    clusters = bulk_app._duplicate_clusters(job["results"])
+    assert [(cluster["representative"], cluster["duplicates"]) for cluster in clusters] == [
+        ("f00.txt", ["f01.txt"]),
+        ("f02.txt", ["f65.txt"]),
+        ("f33.txt", ["f40.txt"]),
+    ]
+    assert len({cluster["cluster_id"] for cluster in clusters}) == 3
+
+
+def test_retried_claim_analyzes_its_representatives(bulk_app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        bulk_app, "analyze_resume",
+        lambda resume_text, job_description, use_cache=True: calls.append(resume_text) or {"match_score": 50},
+    )
+    texts = {f"r{number}.txt": _resume(100 + number) for number in range(3)}
+    texts["r3.txt"] = texts["r0.txt"]
+    job_id = bulk_app.job_store.create_job(
+        "JD", [(name, io.BytesIO(body)) for name, body in texts.items()], {"dedupe_threshold": 0.8}
+    )
+
+    # A worker stores the claim's fingerprints, then dies before recording.
+    job, items = bulk_app.job_store.claim_items(32)
+    handler = bulk_app._run_job_items(job, items)
+    next(handler)
+    handler.close()
+    bulk_app.job_store.release_stale(-1)
+
+    runner = BulkJobRunner(bulk_app.job_store, bulk_app._run_job_items, batch_size=32)
+    while runner.run_once():
+        pass
+
+    job = bulk_app.job_store.get_job(job_id)
+    assert job["status"] == "completed"
+    assert all(row["status"] == "processed" for row in job["results"])
+    assert [cluster["duplicates"] for cluster in bulk_app._duplicate_clusters(job["results"])] == [["r3.txt"]]
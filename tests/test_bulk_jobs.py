@@ -0,0 +1,82 @@
+import io
+import sqlite3
+
+from bulk_jobs import MAX_ATTEMPTS, BulkJobRunner, BulkJobStore
+
+
+def _store(tmp_path, count=3):
+    store = BulkJobStore(tmp_path)
+    uploads = [(f"r{idx}.txt", io.BytesIO(b"resume")) for idx in range(count)]
+    job_id = store.create_job("JD", uploads)
+    return store, job_id
+
+
+def test_handler_failure_fails_rest_of_batch_and_finishes_job(tmp_path):
+    store, job_id = _store(tmp_path)
+    completed = []
+
+    def handler(job, items):
+        yield items[0]["idx"], {"file_name": items[0]["file_name"], "match_score": 70}, None
+        raise sqlite3.OperationalError("database is locked")
+
+    runner = BulkJobRunner(store, handler, on_complete=completed.append)
+    assert runner.run_once()
+
+    job = store.get_job(job_id)
+    assert job["status"] == "completed"
+    assert (job["processed"], job["failed"], job["pending"]) == (1, 2, 0)
+    assert "database is locked" in job["failures"][0]["error"]
+    assert completed and completed[0]["job_id"] == job_id
+
+
+def test_stale_items_give_up_after_max_attempts(tmp_path):
+    store, job_id = _store(tmp_path, count=1)
+    for _ in range(MAX_ATTEMPTS):
+        _, items = store.claim_items(10, "host:1")
+        assert len(items) == 1
+        failed_jobs = store.release_stale(lease_seconds=-1)
+
+    assert failed_jobs == {job_id}
+    job = store.get_job(job_id)
+    assert (job["failed"], job["pending"]) == (1, 0)
+    assert store.claim_items(10, "host:1") == (None, [])
+
+
+def test_release_abandoned_only_frees_dead_processes_on_this_host(tmp_path):
+    store, job_id = _store(tmp_path, count=3)
+    store.claim_items(1, "here:100")
+    store.claim_items(1, "here:200")
+    store.claim_items(1, "elsewhere:100")
+
+    store.release_abandoned("here", is_alive=lambda pid: pid == 200)
+
+    job = store.get_job(job_id)
+    assert job["pending"] == 3
+    pending = store._connect().execute(
+        "SELECT COUNT(*) FROM job_items WHERE status = 'pending'"
+    ).fetchone()[0]
+    assert pending == 1
+
+
+def test_startup_release_failure_is_logged(tmp_path, monkeypatch, caplog):
+    store, _ = _store(tmp_path, count=1)
+
+    def release_abandoned(host, is_alive, max_attempts=MAX_ATTEMPTS):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "release_abandoned", release_abandoned)
+    BulkJobRunner(store, lambda job, items: iter(()))._release_abandoned()
+    assert "Could not release abandoned bulk job items" in caplog.text
+    assert "database is locked" in caplog.text
+
+def test_old_databases_gain_new_columns(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "jobs.sqlite3"))
+    conn.execute(
+        "CREATE TABLE job_items (job_id TEXT NOT NULL, idx INTEGER NOT NULL, file_name TEXT NOT NULL, path TEXT, "
+        "status TEXT NOT NULL, claimed_at REAL, match_score INTEGER, result TEXT, error TEXT, PRIMARY KEY (job_id, idx))"
+    )
+    conn.close()
+
+    store = BulkJobStore(tmp_path)
+    columns = {row["name"] for row in store._connect().execute("PRAGMA table_info(job_items)")}
+    assert {"claimed_by", "attempts"} <= columns
@@ -0,0 +1,31 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from openai import AuthenticationError
+
+
+def _auth_error():
+    response = SimpleNamespace(status_code=401, headers={}, request=None)
+    return AuthenticationError("bad key", response=response, body=None)
+
+
+def _post_matrix(bulk_app):
+    data = {
+        "job_descriptions": ["Python developer with Flask", "Java developer with Spring"],
+        "analyze": "1",
+        "resumes": [(io.BytesIO(b"Python Flask SQL developer"), "a.txt")],
+    }
+    return bulk_app.app.test_client().post("/bulk-matrix", data=data, content_type="multipart/form-data")
+
+
+@pytest.mark.parametrize("error, status", [(_auth_error(), 401), (RuntimeError("shortlist failed"), 500)])
+def test_matrix_errors_are_json(bulk_app, monkeypatch, error, status):
+    def fail(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(bulk_app, "clients", [("openai", object())])
+    monkeypatch.setattr(bulk_app, "_role_shortlist", fail)
+    response = _post_matrix(bulk_app)
+    assert response.status_code == status
+    assert response.get_json()["error"]
@@ -0,0 +1,58 @@
+import pytest
+
+from candidate_index import CandidateIndex
+
+RESUMES = [
+    ("alice.txt", "Python developer with Django and PostgreSQL experience"),
+    ("bob.txt", "Java engineer building Spring services on Kubernetes"),
+    ("carol.txt", "Python data engineer running Spark pipelines on Kubernetes"),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["fts5", "scan"])
+def index(request, tmp_path):
+    index = CandidateIndex(tmp_path / "candidates.sqlite3")
+    if request.param and not index.full_text:
+        pytest.skip("SQLite built without FTS5")
+    # The fallback scans the most recently seen candidates instead.
+    index.full_text = index.full_text and request.param
+    return index
+
+
+def _names(result):
+    return sorted(item["file_name"] for item in result["results"])
+
+
+def test_reupload_keeps_the_candidate_id(index):
+    first = index.add_many(RESUMES)
+    again = index.add_many([("alice_v2.txt", "  python developer with Django\n\nand PostgreSQL   experience ")])
+    assert again == first[:1]
+    assert index.count() == 3
+    [alice] = [item for item in index.search(query="django")["results"]]
+    assert alice["file_name"] == "alice_v2.txt"
+    assert alice["times_seen"] == 2
+
+
+def test_keywords_must_all_match(index):
+    index.add_many(RESUMES)
+    assert _names(index.search(query="python kubernetes")) == ["carol.txt"]
+    assert _names(index.search(query="python")) == ["alice.txt", "carol.txt"]
+
+
+def test_any_jd_term_matches(tmp_path):
+    index = CandidateIndex(tmp_path / "candidates.sqlite3")
+    if not index.full_text:
+        pytest.skip("SQLite built without FTS5")
+    index.add_many(RESUMES)
+    result = index.search(job_description="Spring or Django developer")
+    assert _names(result) == ["alice.txt", "bob.txt"]
+    assert result["matched"] == 2
+
+
+def test_delete_removes_the_candidate_from_search(index):
+    alice, bob, _ = index.add_many(RESUMES)
+    assert index.delete(alice)
+    assert not index.delete(alice)
+    assert index.texts([alice, bob]).keys() == {bob}
+    assert index.search(query="developer") == {"matched": 0, "results": []}
+    assert _names(index.search(query="kubernetes")) == ["bob.txt", "carol.txt"]
@@ -0,0 +1,46 @@
+import random
+
+from near_duplicates import NearDuplicateIndex, find_near_duplicates, pack_shingles, shingles, unpack_shingles
+
+WORDS = [f"word{number}" for number in range(2000)]
+
+
+def _text(seed: int, length: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def test_reformatted_copy_is_a_duplicate_and_distinct_texts_are_not():
+    original = _text(1)
+    reformatted = "\n- ".join(original.upper().split(" "))
+    texts = [original, _text(2), reformatted, _text(3)]
+    assert find_near_duplicates(texts) == [0, 1, 0, 3]
+
+
+def test_small_edit_stays_in_cluster():
+    words = _text(4).split()
+    edited = " ".join(words[:-2] + ["changed", "ending"])
+    assert find_near_duplicates([" ".join(words), edited]) == [0, 0]
+
+
+def test_shingles_are_stable_and_round_trip():
+    text = _text(5)
+    assert shingles(text) == shingles(text)
+    assert unpack_shingles(pack_shingles(shingles(text))) == shingles(text)
+
+
+def test_stored_shingles_rebuild_an_index():
+    first = NearDuplicateIndex()
+    assert first.add("a", _text(6)) is None
+    stored = pack_shingles(shingles(_text(6)))
+
+    second = NearDuplicateIndex()
+    assert second.add_shingles("a", unpack_shingles(stored)) is None
+    assert second.add("b", _text(6)) == "a"
+    assert second.add("c", _text(7)) is None
+
+
+def test_empty_text_is_never_clustered():
+    index = NearDuplicateIndex()
+    assert index.add("a", "") is None
+    assert index.add("b", "") is None
@@ -0,0 +1,34 @@
+from prompt_budget import TRIM_MARKER, clean_lines, compact_text, estimate_tokens
+
+
+def test_clean_lines_keeps_years_and_ratings():
+    text = "Jane Doe\nSoftware Engineer\n2019\n-\n2021\nAcme Corp\n3/5\nPage 2 of 3"
+    assert clean_lines(text) == ["Jane Doe", "Software Engineer", "2019", "-", "2021", "Acme Corp", "3/5"]
+
+
+def test_clean_lines_drops_running_headers_and_repeats():
+    text = "Jane Doe - Page 1 of 2\nPython developer\n\n\nJane Doe - Page 2 of 2\nPython developer\nPg. 2"
+    assert clean_lines(text) == ["Python developer"]
+
+
+def test_text_within_budget_is_cleaned_but_not_trimmed():
+    text = "Jane Doe - Page 1 of 2\nExperience\n2019 - 2021\n\n\n\fJane Doe - Page 2 of 2\nInterests\nChess\n"
+    compacted = compact_text(text, 100)
+    assert compacted.text == "Experience\n2019 - 2021\n\nInterests\nChess"
+    assert compacted.saved > 0
+    assert TRIM_MARKER not in compacted.text
+
+
+def test_over_budget_keeps_relevant_sections_within_budget():
+    text = "\n".join(
+        ["Jane Doe", "Experience"]
+        + [f"Built Kubernetes platform number {number} for payments" for number in range(40)]
+        + ["Interests"]
+        + [f"Hobby {number}: chess, hiking and photography" for number in range(40)]
+    )
+    compacted = compact_text(text, 200, "Kubernetes platform engineer")
+    assert estimate_tokens(compacted.text) <= 200
+    assert compacted.saved > 0
+    assert "Built Kubernetes platform number 0 for payments" in compacted.text
+    assert "Hobby 0" not in compacted.text
+    assert compacted.text.rstrip().endswith(TRIM_MARKER)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from provider_dispatch import EmptyResponseError, ProviderDispatcher
+
+
+def _dispatcher():
+    return ProviderDispatcher(max_retries=0, hedging=True, hedge_delay=0.05)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_fast_primary_is_never_hedged():
+    dispatcher = _dispatcher()
+    assert dispatcher.call([("a", 0), ("b", 0)], lambda provider, client: provider, 10) == ("a", "a")
+    assert dispatcher.stats()["a"]["hedges"] == 0
+    assert "b" not in dispatcher.stats()
+
+
+def test_slow_primary_loses_and_its_late_answer_is_counted_and_discarded():
+    dispatcher = _dispatcher()
+    discarded = []
+
+    def request(provider, delay):
+        time.sleep(delay)
+        return provider
+
+    result = dispatcher.call([("a", 0.3), ("b", 0)], request, 10, discard=discarded.append)
+    assert result == ("b", "b")
+    _wait_for(lambda: discarded)
+    stats = dispatcher.stats()
+    assert discarded == ["a"]
+    assert stats["b"]["hedges"] == 1 and stats["b"]["hedge_wins"] == 1
+    assert stats["a"]["hedge_wasted_requests"] == 1 and stats["a"]["hedge_extra_tokens"] == 10
+
+
+def test_failed_hedge_is_counted_as_waste():
+    dispatcher = _dispatcher()
+
+    def request(provider, delay):
+        time.sleep(delay)
+        if provider == "b":
+            raise ValueError("bad gateway payload")
+        return provider
+
+    assert dispatcher.call([("a", 0.2), ("b", 0)], request, 7) == ("a", "a")
+    stats = dispatcher.stats()
+    assert stats["a"]["hedge_wins"] == 1
+    assert stats["b"]["hedge_extra_tokens"] == 7
+
+
+def test_primary_failing_on_its_own_is_not_waste():
+    dispatcher = _dispatcher()
+
+    def request(provider, delay):
+        time.sleep(delay)
+        if provider == "a":
+            raise ValueError("broken")
+        return provider
+
+    assert dispatcher.call([("a", 0.1), ("b", 0.2)], request, 7) == ("b", "b")
+    assert dispatcher.stats()["a"]["hedge_extra_tokens"] == 0
+
+
+def test_empty_answer_does_not_beat_a_valid_one():
+    dispatcher = _dispatcher()
+    release = threading.Event()
+
+    def request(provider, client):
+        if provider == "b":
+            raise EmptyResponseError("b returned an empty response.")
+        release.wait(1)
+        return "analysis"
+
+    threading.Timer(0.2, release.set).start()
+    assert dispatcher.call([("a", None), ("b", None)], request, 5) == ("a", "analysis")
+
+
+def test_both_failing_raises():
+    dispatcher = _dispatcher()
+
+    def request(provider, client):
+        time.sleep(0.1)
+        raise ValueError(provider)
+
+    with pytest.raises(ValueError):
+        dispatcher.call([("a", None), ("b", None)], request, 5)
+
+
+def test_hedge_delay_follows_recent_latency():
+    dispatcher = ProviderDispatcher(hedge_delay=8, hedge_quantile=0.9)
+    assert dispatcher.hedge_delay_for("a") == 8
+    for _ in range(30):
+        dispatcher.call([("a", None)], lambda provider, client: provider)
+    assert dispatcher.hedge_delay_for("a") < 1
@@ -0,0 +1,38 @@
+import random
+
+from ranking import TopK, rank_key
+
+
+def _row(rng):
+    return {
+        "status": rng.choice(["processed", "processed", "screened_out"]),
+        "match_score": rng.randint(0, 5) * 20,
+        "local_score": rng.randint(0, 3) * 10,
+    }
+
+
+def test_top_k_matches_a_full_sort():
+    rng = random.Random(7)
+    rows = [_row(rng) for _ in range(300)]
+    top = TopK(10)
+    for index, row in enumerate(rows):
+        top.push(index, row)
+    expected = sorted(enumerate(rows), key=lambda pair: rank_key(*pair))[:10]
+    assert [id(row) for row in top.rows()] == [id(row) for _, row in expected]
+    assert len(top) == 10
+
+
+def test_push_reports_rank_or_none():
+    top = TopK(2)
+    assert top.push(0, {"status": "processed", "match_score": 50}) == 1
+    assert top.push(1, {"status": "processed", "match_score": 80}) == 1
+    # A tie goes behind the row uploaded first.
+    assert top.push(2, {"status": "processed", "match_score": 80}) == 2
+    assert top.push(3, {"status": "screened_out", "match_score": 99}) is None
+    assert [row["match_score"] for row in top.rows()] == [80, 80]
+
+
+def test_zero_k_keeps_nothing():
+    top = TopK(0)
+    assert top.push(0, {"status": "processed", "match_score": 90}) is None
+    assert top.rows() == []
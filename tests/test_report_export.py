@@ -0,0 +1,21 @@
+import io
+
+import pytest
+
+from report_export import EXCEL_AVAILABLE, XLSX_CELL_LIMIT, iter_csv, iter_xlsx
+
+
+def test_csv_has_bom_and_rows():
+    body = b"".join(iter_csv([["a", "b"], ["1", "2"]]))
+    assert body.startswith(b"\xef\xbb\xbf")
+    assert body.decode("utf-8-sig").splitlines() == ["a,b", "1,2"]
+
+
+@pytest.mark.skipif(not EXCEL_AVAILABLE, reason="openpyxl not installed")
+def test_xlsx_strips_control_characters_and_truncates():
+    from openpyxl import load_workbook
+
+    body = b"".join(iter_xlsx("S", [["Name", "Text"], ["bad\x0bvalue", "x" * (XLSX_CELL_LIMIT + 10)]], bold_rows=[0]))
+    sheet = load_workbook(io.BytesIO(body)).active
+    assert sheet["A2"].value == "badvalue"
+    assert len(sheet["B2"].value) == XLSX_CELL_LIMIT
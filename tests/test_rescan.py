@@ -0,0 +1,30 @@
+def _processed(file_name, candidate_id, match_score, **extra):
+    return dict(file_name=file_name, candidate_id=candidate_id, match_score=match_score,
+                summary=f"{file_name} summary", status="processed", **extra)
+
+
+def test_orphaned_duplicate_keeps_its_score(bulk_app):
+    # The representative was deleted from the candidate index, so its near
+    # duplicate has to stand on its own with the analysis it was copied.
+    previous = {
+        "job_description": "Python developer with Flask and SQL",
+        "results": [
+            _processed("rep.pdf", "c-rep", 80, cluster_id=0),
+            _processed("copy.pdf", "c-copy", 80, cluster_id=0, duplicate_of="rep.pdf"),
+            _processed("other.pdf", "c-other", 40),
+        ],
+    }
+    texts = {"c-copy": "Python developer Flask SQL", "c-other": "Java developer Spring"}
+    results, failed = [], []
+    options = {"local_only": True, "max_concurrency": 1, "bypass_cache": False, "batch_size": 1}
+    plan = bulk_app._rescan(previous, texts, "Python developer with Flask", options, 1, 5.0, results, failed)
+
+    rows = {row["file_name"]: row for _, row in results}
+    assert [entry["file_name"] for entry in failed] == ["rep.pdf"]
+    assert plan["reanalyzed"] == 0
+    orphan = rows["copy.pdf"]
+    assert orphan["status"] == "processed"
+    assert orphan["summary"] == "copy.pdf summary"
+    assert orphan["previous_match_score"] == 80
+    assert orphan["match_score"] > 0
+    assert "duplicate_of" not in orphan
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+
+class FakeStream:
+    def __init__(self, items):
+        self.items = items
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def close(self):
+        self.closed = True
+
+
+def _chat_chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+def test_closing_chat_chunks_closes_the_provider_stream(scan_app):
+    stream = FakeStream([_chat_chunk("Hello"), _chat_chunk(" world")])
+    chunks = scan_app._chat_stream_text("perplexity", stream)
+    assert next(chunks) == "Hello"
+    chunks.close()
+    assert stream.closed
+
+
+def test_closing_responses_chunks_closes_the_provider_stream(scan_app):
+    stream = FakeStream([SimpleNamespace(type="response.output_text.delta", delta="Hi")] * 2)
+    chunks = scan_app._responses_stream_text("openai", stream)
+    assert next(chunks) == "Hi"
+    chunks.close()
+    assert stream.closed
+
+
+def test_fully_read_stream_is_closed(scan_app):
+    stream = FakeStream([_chat_chunk("a"), _chat_chunk("b")])
+    assert list(scan_app._chat_stream_text("perplexity", stream)) == ["a", "b"]
+    assert stream.closed
@@ -0,0 +1,54 @@
+import random
+import sqlite3
+import threading
+
+WORDS = [f"skill{number}" for number in range(3000)]
+
+
+class _Part:
+    def __init__(self, directory, number):
+        rng = random.Random(number)
+        self.filename = f"r{number:02d}.txt"
+        self.truncated = False
+        self.path = directory / self.filename
+        self.path.write_text(" ".join(rng.choice(WORDS) for _ in range(120)))
+
+    def discard(self):
+        pass
+
+
+def _scan(bulk_app, tmp_path, count):
+    scan = bulk_app._SpooledScan("Python developer", bulk_app._scan_options({"max_concurrency": "1"}))
+    for number in range(count):
+        scan.put(_Part(tmp_path, number))
+    closer = threading.Thread(target=scan.close)
+    closer.start()
+    closer.join(timeout=30)
+    assert not closer.is_alive()
+    return scan
+
+
+def test_index_failure_still_analyzes(bulk_app, tmp_path, monkeypatch):
+    def add_many(items):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(bulk_app.candidate_index, "add_many", add_many)
+    monkeypatch.setattr(bulk_app, "analyze_resume", lambda *args, **kwargs: {"match_score": 40})
+    scan = _scan(bulk_app, tmp_path, 3)
+    assert scan.failed == []
+    assert sorted(row["file_name"] for _, row in scan.results) == ["r00.txt", "r01.txt", "r02.txt"]
+    assert all(row["candidate_id"] is None for _, row in scan.results)
+
+
+def test_recorder_failure_keeps_draining(bulk_app, tmp_path, monkeypatch):
+    def iter_analyses(*args, **kwargs):
+        raise RuntimeError("recorder broke")
+        yield
+
+    monkeypatch.setattr(bulk_app, "_iter_analyses", iter_analyses)
+    # More uploads than the texts queue holds, so the extractors would block
+    # on a recorder that stopped reading.
+    scan = _scan(bulk_app, tmp_path, 12)
+    assert scan.results == []
+    assert len(scan.failed) == 12
+    assert all("recorder broke" in entry["error"] for entry in scan.failed)
@@ -0,0 +1,128 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from threading import Lock
+
+from pypdf import PdfReader
+
+from analysis_cache import AnalysisCache
+
+try:
+    from docx import Document
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+EXTRACTOR_VERSION = "1"
+POOLED_KINDS = ("pdf", "docx")
+
+
+def file_kind(filename: str) -> str:
+    filename = (filename or "").lower()
+    for kind in ("pdf", "txt", "docx"):
+        if filename.endswith(f".{kind}"):
+            return kind
+    return ""
+
+
+def extract_text_from_bytes(filename: str, data: bytes) -> str:
+    kind = file_kind(filename)
+
+    if kind == "pdf":
+        reader = PdfReader(BytesIO(data))
+        text = []
+        for page in reader.pages:
+            text.append(page.extract_text() or "")
+        return "\n".join(text).strip()
+
+    if kind == "txt":
+        return data.decode("utf-8", errors="ignore").strip()
+
+    if kind == "docx" and DOCX_AVAILABLE:
+        doc = Document(BytesIO(data))
+        return "\n".join([p.text for p in doc.paragraphs]).strip()
+
+    return ""
+
+
+class TextExtractor:
+    """Parses uploads in a process pool and memoizes the text by content hash."""
+
+    def __init__(self, cache: AnalysisCache = None, max_workers: int = None):
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._pool_lock = Lock()
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _cache_key(self, filename: str, data: bytes) -> str:
+        return f"{EXTRACTOR_VERSION}:{file_kind(filename)}:{hashlib.sha256(data).hexdigest()}"
+
+    def extract(self, filename: str, data: bytes, use_pool: bool = False) -> str:
+        text, error = self.extract_many([(filename, data)], use_pool)[0]
+        if error is not None:
+            raise error
+        return text
+
+    def extract_many(self, items, use_pool: bool = None):
+        # items: sequence of (filename, data); returns [(text, error)] in the
+        # same order. Identical files are parsed once per batch. By default
+        # the pool is only used when there is more than one file to parse.
+        outcomes = [None] * len(items)
+        keys = [self._cache_key(filename, data) for filename, data in items]
+        to_parse = {}
+
+        for position, key in enumerate(keys):
+            if not file_kind(items[position][0]):
+                outcomes[position] = ("", None)
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                outcomes[position] = (cached, None)
+            else:
+                to_parse.setdefault(key, []).append(position)
+
+        pooled = [key for key, positions in to_parse.items() if file_kind(items[positions[0]][0]) in POOLED_KINDS]
+        if use_pool is None:
+            use_pool = len(pooled) > 1
+        use_pool = use_pool and self.max_workers > 1 and bool(pooled)
+        futures = {}
+        if use_pool:
+            executor = self._executor()
+            for key in pooled:
+                filename, data = items[to_parse[key][0]]
+                futures[key] = executor.submit(extract_text_from_bytes, filename, data)
+
+        for key, positions in to_parse.items():
+            filename, data = items[positions[0]]
+            try:
+                if key in futures:
+                    outcome = (futures[key].result(), None)
+                else:
+                    outcome = (extract_text_from_bytes(filename, data), None)
+            except Exception as exc:
+                outcome = ("", exc)
+            else:
+                if self.cache:
+                    self.cache.put(key, outcome[0])
+            for position in positions:
+                outcomes[position] = outcome
+
+        return outcomes
+
+
+def text_extractor_from_env(default_cache_path) -> TextExtractor:
+    cache_enabled = (os.getenv("EXTRACTION_CACHE_ENABLED") or "1").strip().lower() not in ("0", "false", "no")
+    cache = AnalysisCache(
+        os.getenv("EXTRACTION_CACHE_PATH") or default_cache_path,
+        max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES") or 50000),
+        enabled=cache_enabled,
+        table="extractions",
+    )
+    return TextExtractor(cache, max_workers=int(os.getenv("EXTRACTION_WORKERS") or 0) or None)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_FIELD_BYTES = 1024 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+class SpooledPart:
+    """One multipart part: a form field (value) or a file spooled to path."""
+
+    def __init__(self, name: str, filename=None, path=None, value=None, size: int = 0, truncated: bool = False):
+        self.name = name
+        self.filename = filename
+        self.path = path
+        self.value = value
+        self.size = size
+        self.truncated = truncated
+
+    @property
+    def is_file(self) -> bool:
+        return self.filename is not None
+
+    def discard(self):
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.path = None
+
+
+def iter_spooled_parts(stream, content_type: str, spool_dir=None, max_file_bytes: int = None):
+    """Parses a multipart body incrementally, writing each file part to disk.
+
+    Parts are yielded as soon as they are complete, so the caller can start on
+    the first file while the rest of the body is still arriving. Only one
+    read chunk is held in memory at a time; files larger than max_file_bytes
+    stop being written and are yielded with truncated=True. The caller owns
+    the spooled files and must discard() them.
+    """
+    mimetype, options = parse_options_header(content_type or "")
+    boundary = options.get("boundary")
+    if mimetype != "multipart/form-data" or not boundary:
+        raise UploadError("Expected a multipart/form-data upload.")
+
+    decoder = MultipartDecoder(boundary.encode("latin-1"), max_form_memory_size=MAX_FIELD_BYTES)
+    current = None
+    target = None
+    buffer = bytearray()
+
+    try:
+        finished = False
+        while not finished:
+            chunk = stream.read(READ_CHUNK_SIZE)
+            decoder.receive_data(chunk or None)
+
+            event = decoder.next_event()
+            while not isinstance(event, NeedData):
+                if isinstance(event, Epilogue):
+                    finished = True
+                    break
+
+                if isinstance(event, File):
+                    handle, path = tempfile.mkstemp(prefix="upload-", dir=spool_dir)
+                    target = os.fdopen(handle, "wb")
+                    current = SpooledPart(event.name, filename=event.filename or "", path=path)
+                elif isinstance(event, Field):
+                    current = SpooledPart(event.name)
+                    buffer = bytearray()
+                elif isinstance(event, Data) and current is not None:
+                    if current.is_file:
+                        if max_file_bytes is None or current.size + len(event.data) <= max_file_bytes:
+                            target.write(event.data)
+                        else:
+                            current.truncated = True
+                    else:
+                        buffer.extend(event.data)
+                    current.size += len(event.data)
+
+                    if not event.more_data:
+                        if current.is_file:
+                            target.close()
+                            target = None
+                        else:
+                            current.value = buffer.decode("utf-8", errors="replace")
+                        part, current = current, None
+                        yield part
+
+                event = decoder.next_event()
+
+            if not chunk and not finished:
+                raise UploadError("Upload ended before the multipart body was complete.")
+    finally:
+        if target is not None:
+            target.close()
+        if current is not None:
+            current.discard()